@@ -0,0 +1,67 @@
+"""Measure messages/s between processes with and without batching.
+
+A child process plays the connection task, putting read bursts of property
+update messages either one by one or with put_many. The main process plays
+the executor, getting them one by one or draining them with get_many.
+
+Usage: python benchmarks/bench_batching.py
+"""
+
+import time
+import queue
+import multiprocessing as mp
+
+from modi.util.queues import CommunicationQueue
+from modi.util.msgutil import parse_message
+
+NB_MESSAGES = 100000
+BURST_SIZES = (1, 8, 32)
+
+
+def produce_one_by_one(comm_q, burst):
+    for _ in range(NB_MESSAGES // len(burst)):
+        for message in burst:
+            comm_q.put(message)
+
+
+def produce_batches(comm_q, burst):
+    for _ in range(NB_MESSAGES // len(burst)):
+        comm_q.put_many(burst)
+
+
+def consume_one_by_one(comm_q, nb_messages):
+    received = 0
+    while received < nb_messages:
+        try:
+            comm_q.get_nowait()
+        except queue.Empty:
+            continue
+        received += 1
+
+
+def consume_batches(comm_q, nb_messages):
+    received = 0
+    while received < nb_messages:
+        received += len(comm_q.get_many(timeout=1))
+
+
+def bench(name, produce, consume, burst_size):
+    comm_q = CommunicationQueue()
+    burst = [parse_message(0x1F, 3000 + i, 2, (1, 2, 3, 4, 5, 6, 7, 8))
+             for i in range(burst_size)]
+    nb_messages = NB_MESSAGES // burst_size * burst_size
+    producer = mp.Process(target=produce, args=(comm_q, burst))
+    begin = time.perf_counter()
+    producer.start()
+    consume(comm_q, nb_messages)
+    took = time.perf_counter() - begin
+    producer.join()
+    print(f"burst {burst_size:>2} {name:>10}: "
+          f"{nb_messages / took:9.0f} msgs/s")
+
+
+if __name__ == "__main__":
+    for burst_size in BURST_SIZES:
+        bench("one by one", produce_one_by_one, consume_one_by_one,
+              burst_size)
+        bench("batched", produce_batches, consume_batches, burst_size)
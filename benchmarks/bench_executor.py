@@ -0,0 +1,114 @@
+"""Measure how the executor keeps up with streaming modules.
+
+A child process plays SerTask for gyro modules which stream their roll
+angle, putting the frames of every millisecond as a single read burst. The
+main process runs an ExeTask with the previous executor loop, which slept
+1ms and handled one message per iteration, and with the current loop,
+which blocks on the queue and drains every available message. The handled
+messages/s and the depth of the receive queue are reported, followed by the
+cpu used by each loop while no message arrives.
+
+Usage: python benchmarks/bench_executor.py
+"""
+
+import time
+import struct
+import multiprocessing as mp
+
+from modi.module.input_module.gyro import Gyro
+from modi.task.exe_task import ExeTask
+from modi.util.msgutil import parse_message
+from modi.util.queues import CommunicationQueue
+
+NB_MODULES = 16
+UPDATE_RATE = 500
+DURATION = 2
+
+
+def stream(recv_q, nb_produced):
+    bursts = [
+        [parse_message(0x1F, module_id, Gyro.PropertyType.ROLL,
+                       tuple(struct.pack("f", i)))
+         for module_id in range(1, NB_MODULES + 1)]
+        for i in range(UPDATE_RATE)
+    ]
+    interval = 1 / UPDATE_RATE
+    begin = time.perf_counter()
+    i = 0
+    while time.perf_counter() - begin < DURATION:
+        # Pace bursts to the update rate of the modules
+        while time.perf_counter() - begin < i * interval:
+            pass
+        recv_q.put_many(bursts[i % UPDATE_RATE])
+        i += 1
+        nb_produced.value = i * NB_MODULES
+
+
+def run_previous(exe_task):
+    time.sleep(0.001)
+    try:
+        exe_task.handle_message(exe_task._recv_q.get_nowait())
+        return 1
+    except Exception:
+        return 0
+
+
+def run_current(exe_task):
+    messages = exe_task._recv_q.get_many(timeout=0.1)
+    for message in messages:
+        exe_task.handle_message(message)
+    return len(messages)
+
+
+def bench(name, run):
+    recv_q = CommunicationQueue()
+    send_q = CommunicationQueue("thread")
+    modules = []
+    for module_id in range(1, NB_MODULES + 1):
+        gyro = Gyro(module_id, module_id, send_q)
+        gyro._fetch_property(Gyro.PropertyType.ROLL)
+        modules.append(gyro)
+    exe_task = ExeTask(modules, dict(), dict(), recv_q, send_q,
+                       None, NB_MODULES, None)
+
+    nb_produced = mp.Value("l", 0, lock=False)
+    producer = mp.Process(target=stream, args=(recv_q, nb_produced))
+    producer.start()
+    begin = time.perf_counter()
+    nb_handled, max_depth, cpu_begin = 0, 0, time.process_time()
+    while time.perf_counter() - begin < DURATION:
+        nb_handled += run(exe_task)
+        max_depth = max(max_depth, nb_produced.value - nb_handled)
+    took = time.perf_counter() - begin
+    cpu_usage = (time.process_time() - cpu_begin) / took * 100
+
+    # The producer exits once the messages left in the queue are flushed
+    while producer.is_alive():
+        recv_q.get_many(timeout=0.1)
+    producer.join()
+
+    print(f"{name:>8}: produced {nb_produced.value / DURATION:7.0f} msgs/s "
+          f"| handled {nb_handled / took:7.0f} msgs/s "
+          f"| queue depth max {max_depth:6d} "
+          f"final {nb_produced.value - nb_handled:6d} "
+          f"| cpu {cpu_usage:5.1f}%")
+
+
+def bench_idle(name, run):
+    recv_q = CommunicationQueue()
+    send_q = CommunicationQueue("thread")
+    exe_task = ExeTask([], dict(), dict(), recv_q, send_q, None, 0, None)
+    begin, cpu_begin = time.perf_counter(), time.process_time()
+    while time.perf_counter() - begin < DURATION:
+        run(exe_task)
+    cpu_usage = (time.process_time() - cpu_begin) \
+        / (time.perf_counter() - begin) * 100
+    print(f"{name:>8}: idle cpu {cpu_usage:5.1f}%")
+
+
+if __name__ == "__main__":
+    print(f"[{NB_MODULES} modules streaming at {UPDATE_RATE} Hz]")
+    bench("previous", run_previous)
+    bench("current", run_current)
+    bench_idle("previous", run_previous)
+    bench_idle("current", run_current)
@@ -0,0 +1,65 @@
+"""Measure json framing throughput on bursts of serial data.
+
+A burst of property update frames, like the ones streamed by gyro and mic
+modules, is cut into serial sized reads and fed to the string based framing
+that SerTask used before and to the FrameParser.
+
+Usage: python benchmarks/bench_frame_parser.py
+"""
+
+import time
+import random
+
+from modi.util.frame_parser import FrameParser
+from modi.util.msgutil import parse_message
+
+NB_FRAMES = 20000
+READ_SIZES = (64, 4096, 65536)
+
+
+def record_burst() -> bytes:
+    rand = random.Random(0)
+    frames = []
+    for _ in range(NB_FRAMES):
+        frames.append(parse_message(
+            0x1F, rand.randrange(1, 4096), rand.randrange(2, 8),
+            tuple(rand.randrange(1, 256) for _ in range(8))
+        ))
+    return "".join(frames).encode()
+
+
+def parse_string_buffer(chunks):
+    nb_frames, json_buffer = 0, ""
+    for chunk in chunks:
+        json_buffer += chunk.decode("utf-8")
+        while "{" in json_buffer and "}" in json_buffer:
+            split_index = json_buffer.find("}") + 1
+            _ = json_buffer[:split_index]
+            nb_frames += 1
+            json_buffer = json_buffer[split_index:]
+    return nb_frames
+
+
+def parse_frame_parser(chunks):
+    nb_frames, frame_parser = 0, FrameParser()
+    for chunk in chunks:
+        nb_frames += len(frame_parser.feed(chunk))
+    return nb_frames
+
+
+def bench(name, parse, chunks):
+    begin = time.perf_counter()
+    nb_frames = parse(chunks)
+    took = time.perf_counter() - begin
+    print(f"{name:>14}: {nb_frames} frames in {took * 1000:8.1f}ms "
+          f"({nb_frames / took:10.0f} frames/s)")
+
+
+if __name__ == "__main__":
+    burst = record_burst()
+    for read_size in READ_SIZES:
+        chunks = [burst[i:i + read_size]
+                  for i in range(0, len(burst), read_size)]
+        print(f"[{NB_FRAMES} frames, {read_size} bytes per read]")
+        bench("string buffer", parse_string_buffer, chunks)
+        bench("FrameParser", parse_frame_parser, chunks)
@@ -0,0 +1,72 @@
+"""Measure group commands sent to many modules of the same type.
+
+50 leds are set to the same colour, by setting each led in a loop and by
+a single group command, through a plain send queue and through the write
+coalescer used by MODI. The time taken by a command and the number of
+operations on the send queue are reported. Setters used to sleep 1ms,
+which is left out, so only the encoding and queueing is compared.
+
+Usage: python benchmarks/bench_group_command.py
+"""
+
+import time
+
+from modi.module.output_module.led import Led
+from modi.util.misc import module_list
+from modi.util.queues import CommunicationQueue
+from modi.util.write_coalescer import WriteCoalescer
+
+NB_MODULES = 50
+NB_COMMANDS = 1000
+
+
+class CountingQueue(CommunicationQueue):
+
+    def __init__(self):
+        super().__init__("thread")
+        self.nb_operations = 0
+
+    def put(self, message):
+        self.nb_operations += 1
+        super().put(message)
+
+    def put_many(self, messages):
+        self.nb_operations += 1
+        super().put_many(messages)
+
+
+def set_each(leds, color):
+    for led in leds:
+        led.rgb = color
+
+
+def set_group(leds, color):
+    leds.set(rgb=color)
+
+
+def bench(name, command, coalesce):
+    send_q = CountingQueue()
+    write_q = WriteCoalescer(send_q) if coalesce else send_q
+    leds = module_list(
+        [Led(module_id, module_id, write_q)
+         for module_id in range(1, NB_MODULES + 1)],
+        "led"
+    )
+    took = 0
+    for i in range(NB_COMMANDS):
+        begin = time.perf_counter()
+        command(leds, (i % 256, 0, 0))
+        if coalesce:
+            write_q.flush()
+        took += time.perf_counter() - begin
+        send_q.get_many(block=False)
+    print(f"{name:>16}: {took / NB_COMMANDS * 1e6:7.1f}us per command "
+          f"| {send_q.nb_operations / NB_COMMANDS:5.1f} queue operations")
+
+
+if __name__ == "__main__":
+    print(f"[{NB_MODULES} leds]")
+    bench("loop", set_each, False)
+    bench("group", set_group, False)
+    bench("loop coalesced", set_each, True)
+    bench("group coalesced", set_group, True)
@@ -0,0 +1,56 @@
+"""Measure the time taken by 'import modi'.
+
+modi is imported in fresh interpreters with -X importtime, and the median
+of the cumulative import time of modi is reported with the slowest modules
+it imports. The transports, the firmware updater and asyncio are imported
+only when used, so the benchmark fails when any of them is imported again,
+serving as a regression check. -X importtime needs Python 3.7 or later.
+
+Usage: python benchmarks/bench_import.py
+"""
+
+import os
+import sys
+import statistics
+import subprocess
+
+NB_RUNS = 10
+NB_SLOWEST = 10
+LAZY_MODULES = ("can", "requests", "asyncio", "serial.tools.list_ports",
+                "modi.async_modi", "modi.task.can_task",
+                "modi.task.conn_task")
+
+
+def import_times(statement):
+    env = dict(os.environ, MODI_VERSION_CHECK="0", MODI_OFFLINE="1")
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=env,
+        check=True,
+        universal_newlines=True,
+    ).stderr
+    times = dict()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+if __name__ == "__main__":
+    # Modules imported by the interpreter startup are not counted
+    startup_modules = import_times("pass")
+    runs = [import_times("import modi") for _ in range(NB_RUNS)]
+    print(f"import modi: {statistics.median(r['modi'] for r in runs):.1f}ms "
+          f"(median of {NB_RUNS} runs)")
+    last_run = {name: took for name, took in runs[-1].items()
+                if name not in startup_modules}
+    for name in sorted(last_run, key=last_run.get, reverse=True)[
+            :NB_SLOWEST]:
+        print(f"  {name:>40}: {last_run[name]:6.1f}ms")
+
+    imported = [name for name in LAZY_MODULES if name in last_run]
+    if imported:
+        sys.exit(f"Imported eagerly: {', '.join(imported)}")
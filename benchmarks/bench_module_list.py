@@ -0,0 +1,50 @@
+"""Measure the cost of accessing a module of a bundle.
+
+A bundle holds 50 modules of several types, and bundle.motors[0] is
+accessed in a loop. The module list used to be built for every access,
+filtering and sorting every module of the bundle, which is replayed for
+comparison with the module lists kept by the bundle.
+
+Usage: python benchmarks/bench_module_list.py
+"""
+
+import time
+
+from modi.modi import MODI
+from modi.module.input_module.gyro import Gyro
+from modi.module.output_module.led import Led
+from modi.module.output_module.motor import Motor
+
+NB_MODULES = 50
+NB_ACCESSES = 20000
+
+
+def previous_motor(bundle):
+    modules = [module for module in bundle._modules
+               if module.type == "motor"]
+    modules.sort()
+    return modules[0]
+
+
+def current_motor(bundle):
+    return bundle.motors[0]
+
+
+def bench(name, access, bundle):
+    begin = time.perf_counter()
+    for _ in range(NB_ACCESSES):
+        access(bundle)
+    took = (time.perf_counter() - begin) / NB_ACCESSES
+    print(f"{name:>8}: {took * 1e6:6.2f}us per access")
+
+
+if __name__ == "__main__":
+    bundle = MODI(test=True)
+    module_types = (Gyro, Led, Motor)
+    for module_id in range(1, NB_MODULES + 1):
+        module = module_types[module_id % 3](module_id, module_id, None)
+        module.position = (module_id % 7, module_id // 7)
+        bundle._modules.append(module)
+    print(f"[{NB_MODULES} modules]")
+    bench("previous", previous_motor, bundle)
+    bench("current", current_motor, bundle)
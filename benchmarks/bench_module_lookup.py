@@ -0,0 +1,81 @@
+"""Measure the executor dispatch cost with many modules.
+
+ExeTask handles property update and health messages of simulated gyro
+modules. The lookups the executor used to do for each message, a scan of
+the module list for property updates and a scan of every module for every
+module id for health messages, are timed alongside for comparison.
+
+Usage: python benchmarks/bench_module_lookup.py
+"""
+
+import time
+import struct
+
+from modi.module.input_module.gyro import Gyro
+from modi.task.exe_task import ExeTask
+from modi.util.msgutil import parse_message
+from modi.util.queues import CommunicationQueue
+
+NB_MODULES = (10, 100)
+NB_MESSAGES = 20000
+
+
+def scan_by_id(modules, module_ids, module_id):
+    for module in modules:
+        if module.id == module_id:
+            return module
+
+
+def scan_health(modules, module_ids, module_id):
+    curr_time_ms = int(time.time() * 1000)
+    for module_info in module_ids.values():
+        if curr_time_ms - module_info["timestamp"] > 1000:
+            for module in modules:
+                if module.uuid == module_info["uuid"]:
+                    module.set_connection_state(connection_state=False)
+
+
+def timed(function, nb_modules):
+    begin = time.perf_counter()
+    for i in range(NB_MESSAGES):
+        function(i % nb_modules + 1)
+    return (time.perf_counter() - begin) / NB_MESSAGES * 1e6
+
+
+def bench(nb_modules):
+    send_q = CommunicationQueue("thread")
+    modules, module_ids = [], dict()
+    for module_id in range(1, nb_modules + 1):
+        gyro = Gyro(module_id, module_id, send_q)
+        gyro._fetch_property(Gyro.PropertyType.ROLL)
+        modules.append(gyro)
+        module_ids[module_id] = {"timestamp": 0, "uuid": module_id}
+    exe_task = ExeTask(modules, module_ids, dict(), None, send_q,
+                       None, nb_modules, None)
+
+    property_messages = [None] + [
+        parse_message(0x1F, module_id, Gyro.PropertyType.ROLL,
+                      tuple(struct.pack("f", 1.5)))
+        for module_id in range(1, nb_modules + 1)
+    ]
+    health_messages = [None] + [
+        parse_message(0x00, module_id, 0, (0, 0, 0, 100))
+        for module_id in range(1, nb_modules + 1)
+    ]
+
+    print(f"[{nb_modules} modules]")
+    for name, function in (
+        ("property scan", lambda i: scan_by_id(modules, module_ids, i)),
+        ("health scan", lambda i: scan_health(modules, module_ids, i)),
+        ("property handled",
+         lambda i: exe_task.handle_message(property_messages[i])),
+        ("health handled",
+         lambda i: exe_task.handle_message(health_messages[i])),
+    ):
+        print(f"  {name:>16}: {timed(function, nb_modules):7.2f}us "
+              f"per message")
+
+
+if __name__ == "__main__":
+    for nb_modules in NB_MODULES:
+        bench(nb_modules)
@@ -0,0 +1,69 @@
+"""Compare running the connection in a process and in a thread.
+
+A pseudo terminal stands in for the network module. Startup is the time
+from creating the connection runner to its init flag being set, latency is
+the time between writing a frame to the port and getting the message from
+the receive queue.
+
+Usage: python benchmarks/bench_process_mode.py (POSIX only)
+"""
+
+import os
+import time
+
+import threading as th
+import multiprocessing as mp
+
+from serial.tools.list_ports_common import ListPortInfo
+
+from modi._conn_proc import ConnProc
+from modi._conn_thrd import ConnThrd
+from modi.task.conn_task import ConnTask
+from modi.util.queues import CommunicationQueue
+
+NB_FRAMES = 500
+FRAME = b'{"c":31,"s":3000,"d":2,"b":"AAAAAAAAAAA=","l":8}'
+
+
+def open_pty():
+    master, slave = os.openpty()
+    port = os.ttyname(slave)
+
+    # Let the connection task accept the pseudo terminal as a MODI port
+    ConnTask._list_modi_ports = staticmethod(lambda: [ListPortInfo(port)])
+    ConnTask.is_on_pi = staticmethod(lambda: False)
+    return master, port
+
+
+def bench(process_mode, conn_runner, init_flag, queue_backend):
+    master, port = open_pty()
+    recv_q = CommunicationQueue(queue_backend)
+    send_q = CommunicationQueue(queue_backend)
+
+    begin = time.perf_counter()
+    conn = conn_runner(recv_q, send_q, "serial", "", False, init_flag,
+                       port, "block")
+    conn.daemon = True
+    conn.start()
+    init_flag.wait()
+    startup = time.perf_counter() - begin
+
+    latencies = []
+    for _ in range(NB_FRAMES):
+        begin = time.perf_counter()
+        os.write(master, FRAME)
+        recv_q.get(timeout=5)
+        latencies.append(time.perf_counter() - begin)
+        time.sleep(0.002)
+    latencies.sort()
+    if conn_runner is ConnProc:
+        conn.terminate()
+
+    print(f"{process_mode:>7}: startup {startup * 1000:6.1f}ms | "
+          f"latency median {latencies[NB_FRAMES // 2] * 1e6:6.1f}us "
+          f"p99 {latencies[NB_FRAMES * 99 // 100] * 1e6:6.1f}us")
+
+
+if __name__ == "__main__":
+    bench("process", ConnProc, mp.Event(), "queue")
+    bench("thread", ConnThrd, th.Event(), "thread")
@@ -0,0 +1,66 @@
+"""Measure the cost of property access from user code.
+
+Reads of a cached gyro property are counted per second, followed by the
+iterations per second of a loop reading the 6 gyro axes and writing the 3
+led channels. Property access used to sleep 1ms on every read and write,
+which is replayed for comparison. Messages are put on a thread queue which
+is drained as the send task would, so only the module side is measured.
+
+Usage: python benchmarks/bench_property_access.py
+"""
+
+import time
+
+from modi.module.module import Module
+from modi.module.input_module.gyro import Gyro
+from modi.module.output_module.led import Led
+from modi.module.output_module.output_module import OutputModule
+from modi.util.queues import CommunicationQueue
+
+DURATION = 1
+
+
+def with_sleep(method):
+    def sleeping(*args, **kwargs):
+        value = method(*args, **kwargs)
+        time.sleep(0.001)
+        return value
+    return sleeping
+
+
+def bench(name):
+    send_q = CommunicationQueue("thread")
+    gyro, led = Gyro(1, 1, send_q), Led(2, 2, send_q)
+    for property_type in Gyro.PropertyType:
+        gyro._fetch_property(property_type)
+        gyro.update_property(property_type, 1.5)
+    for property_type in Led.PropertyType:
+        led._fetch_property(property_type)
+        led.update_property(property_type, 0)
+
+    nb_reads, begin = 0, time.perf_counter()
+    while time.perf_counter() - begin < DURATION:
+        _ = gyro.roll
+        nb_reads += 1
+    reads = nb_reads / (time.perf_counter() - begin)
+
+    nb_loops, begin = 0, time.perf_counter()
+    while time.perf_counter() - begin < DURATION:
+        _ = (gyro.roll, gyro.pitch, gyro.yaw, gyro.angular_vel_x,
+             gyro.angular_vel_y, gyro.angular_vel_z)
+        led.rgb = (nb_loops % 256, 0, 0)
+        send_q.get_many(block=False)
+        nb_loops += 1
+    loops = nb_loops / (time.perf_counter() - begin)
+    print(f"{name:>8}: {reads:9.0f} reads/s | {loops:7.0f} loops/s")
+
+
+if __name__ == "__main__":
+    get_property = Module._get_property
+    set_property = OutputModule._set_property
+    Module._get_property = with_sleep(get_property)
+    OutputModule._set_property = with_sleep(set_property)
+    bench("previous")
+    Module._get_property = get_property
+    OutputModule._set_property = set_property
+    bench("current")
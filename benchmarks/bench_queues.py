@@ -0,0 +1,81 @@
+"""Measure the throughput of CommunicationQueue.
+
+First compares the cost of classifying a message by a full json parse, as
+CommunicationQueue used to do, with the prefix scan of json messages and
+the first byte of binary messages. Then a child process puts messages at
+10k msgs/s while the main process gets them, reporting the sustained rate.
+
+Usage: python benchmarks/bench_queues.py
+"""
+
+import json
+import time
+import queue
+import multiprocessing as mp
+
+from modi.util.queues import CommunicationQueue
+from modi.util.msgutil import parse_message, message_to_json
+
+NB_MESSAGES = 10000
+TARGET_RATE = 10000
+PRIORITY_COMMANDS = (0x03, 0x04, 0x1F, 0x05, 0x09, 0x07)
+
+
+def classify_json_loads(message):
+    return json.loads(message)['c'] in PRIORITY_COMMANDS
+
+
+def bench_classify():
+    check_priority = CommunicationQueue._CommunicationQueue__check_priority
+    binary_message = parse_message(0x1F, 3000, 2, (1, 2, 3, 4, 5, 6, 7, 8))
+    json_message = message_to_json(binary_message)
+    for name, classify, message in (
+        ("json.loads", classify_json_loads, json_message),
+        ("prefix scan", check_priority, json_message),
+        ("binary", check_priority, binary_message),
+    ):
+        begin = time.perf_counter()
+        for _ in range(NB_MESSAGES * 10):
+            classify(message)
+        took = time.perf_counter() - begin
+        print(f"classify {name:>11}: "
+              f"{took / (NB_MESSAGES * 10) * 1e9:6.0f}ns per message")
+
+
+def produce(comm_q, message):
+    interval = 1 / TARGET_RATE
+    begin = time.perf_counter()
+    for i in range(NB_MESSAGES):
+        # Pace puts to the target rate
+        while time.perf_counter() - begin < i * interval:
+            pass
+        comm_q.put(message)
+
+
+def get(comm_q):
+    while True:
+        try:
+            return comm_q.get_nowait()
+        except queue.Empty:
+            pass
+
+
+def bench_transfer(name, message):
+    comm_q = CommunicationQueue()
+    producer = mp.Process(target=produce, args=(comm_q, message))
+    producer.start()
+    get(comm_q)
+    begin = time.perf_counter()
+    for _ in range(NB_MESSAGES - 1):
+        get(comm_q)
+    took = time.perf_counter() - begin
+    producer.join()
+    print(f"transfer {name:>6}: {(NB_MESSAGES - 1) / took:8.0f} msgs/s "
+          f"(target {TARGET_RATE} msgs/s)")
+
+
+if __name__ == "__main__":
+    bench_classify()
+    binary_message = parse_message(0x1F, 3000, 2, (1, 2, 3, 4, 5, 6, 7, 8))
+    bench_transfer("json", message_to_json(binary_message))
+    bench_transfer("binary", binary_message)
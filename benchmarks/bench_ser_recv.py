@@ -0,0 +1,70 @@
+"""Compare SerTask receive modes on a pseudo terminal.
+
+Reports the CPU used by an idle receiver and the latency between writing a
+frame to the port and the frame reaching the receive queue.
+
+Usage: python benchmarks/bench_ser_recv.py [poll|block] (POSIX only)
+"""
+
+import os
+import sys
+import time
+import queue
+import subprocess
+import threading as th
+
+import serial
+
+from modi.task.ser_task import SerTask
+from modi.util.queues import CommunicationQueue
+
+IDLE_SECONDS = 2
+NB_FRAMES = 500
+FRAME = b'{"c":31,"s":3000,"d":2,"b":"AAAAAAAAAAA=","l":8}'
+
+
+def open_pty():
+    master, slave = os.openpty()
+    ser = serial.Serial(os.ttyname(slave), baudrate=921600, timeout=1)
+    return master, ser
+
+
+def bench(recv_mode: str) -> None:
+    master, ser = open_pty()
+    recv_q = CommunicationQueue()
+    task = SerTask(recv_q, queue.Queue(), verbose=False, recv_mode=recv_mode)
+    task.set_serial(ser)
+
+    recv_thread = th.Thread(target=task.run_recv_data, args=(0.001,))
+    recv_thread.daemon = True
+    recv_thread.start()
+
+    # Idle CPU usage of the receiving thread
+    cpu_begin, wall_begin = time.process_time(), time.perf_counter()
+    time.sleep(IDLE_SECONDS)
+    cpu_usage = (time.process_time() - cpu_begin) \
+        / (time.perf_counter() - wall_begin) * 100
+
+    # Latency from writing a frame to receiving it from the queue
+    latencies = []
+    for _ in range(NB_FRAMES):
+        begin = time.perf_counter()
+        os.write(master, FRAME)
+        recv_q.get()
+        latencies.append(time.perf_counter() - begin)
+        time.sleep(0.002)
+    latencies.sort()
+
+    print(f"{recv_mode:>5}: idle cpu {cpu_usage:5.1f}% | "
+          f"latency median {latencies[NB_FRAMES // 2] * 1e6:7.1f}us "
+          f"p99 {latencies[NB_FRAMES * 99 // 100] * 1e6:7.1f}us")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        bench(sys.argv[1])
+    else:
+        # Each mode runs in a fresh process so that receiver threads of the
+        # other mode do not show up in the cpu usage
+        for mode in ("poll", "block"):
+            subprocess.run([sys.executable, __file__, mode])
@@ -0,0 +1,70 @@
+"""Compare the queue and shared memory backends of CommunicationQueue.
+
+Throughput is measured with a child process putting bursts of property
+update messages while the main process drains them. Latency is half of the
+round trip of a message echoed back by a child process.
+
+Usage: python benchmarks/bench_shared_memory.py
+"""
+
+import time
+import multiprocessing as mp
+
+from modi.util.queues import CommunicationQueue
+from modi.util.msgutil import parse_message
+
+NB_MESSAGES = 100000
+BURST_SIZES = (1, 8)
+NB_ROUND_TRIPS = 2000
+MESSAGE = parse_message(0x1F, 3000, 2, (1, 2, 3, 4, 5, 6, 7, 8))
+
+
+def produce(comm_q, burst_size):
+    burst = [MESSAGE] * burst_size
+    for _ in range(NB_MESSAGES // burst_size):
+        comm_q.put_many(burst)
+
+
+def echo(ping_q, pong_q):
+    for _ in range(NB_ROUND_TRIPS):
+        pong_q.put(ping_q.get())
+
+
+def bench_throughput(backend, burst_size):
+    comm_q = CommunicationQueue(backend)
+    nb_messages = NB_MESSAGES // burst_size * burst_size
+    producer = mp.Process(target=produce, args=(comm_q, burst_size))
+    begin = time.perf_counter()
+    producer.start()
+    received = 0
+    while received < nb_messages:
+        received += len(comm_q.get_many(timeout=5))
+    took = time.perf_counter() - begin
+    producer.join()
+    print(f"{backend:>13} burst {burst_size}: "
+          f"{nb_messages / took:9.0f} msgs/s")
+
+
+def bench_latency(backend):
+    ping_q = CommunicationQueue(backend)
+    pong_q = CommunicationQueue(backend)
+    echoer = mp.Process(target=echo, args=(ping_q, pong_q))
+    echoer.start()
+    latencies = []
+    for _ in range(NB_ROUND_TRIPS):
+        begin = time.perf_counter()
+        ping_q.put(MESSAGE)
+        pong_q.get(timeout=5)
+        latencies.append((time.perf_counter() - begin) / 2)
+    echoer.join()
+    latencies.sort()
+    print(f"{backend:>13} latency: "
+          f"median {latencies[NB_ROUND_TRIPS // 2] * 1e6:6.1f}us "
+          f"p99 {latencies[NB_ROUND_TRIPS * 99 // 100] * 1e6:6.1f}us")
+
+
+if __name__ == "__main__":
+    for backend in ("queue", "shared_memory"):
+        for burst_size in BURST_SIZES:
+            bench_throughput(backend, burst_size)
+        bench_latency(backend)
@@ -0,0 +1,110 @@
+"""Measure the time to first command of a simulated serial bundle.
+
+The serial task is replaced by a simulated bundle of modules connected in a
+row, which answers the uuid and topology requests of the executor after the
+latency of the serial link. MODI is started in thread mode with and without
+the number of modules, and the time taken by each phase of the startup is
+reported along with the time until the first command is sent.
+
+Usage: python benchmarks/bench_startup.py
+"""
+
+import time
+import threading as th
+
+from unittest import mock
+
+import modi
+
+from modi.util.msgutil import parse_message, unpack_message
+
+NB_MODULES = 10
+NB_RUNS = 5
+# Time to open the port and latency of the serial link in seconds
+OPEN_TIME = 0.02
+LATENCY = 0.002
+# Module info of a gyro, an env, a button, a dial, a led and a motor
+MODULE_INFOS = (0x2010, 0x2000, 0x2030, 0x2040, 0x4020, 0x4010)
+BROADCAST_ID = 0xFFF
+NO_ID = 0xFFFF
+
+
+class SimulatedSerTask:
+    """Serial task of a bundle of modules connected in a row"""
+
+    def __init__(self, recv_q, send_q, verbose, port, recv_mode):
+        self.__recv_q = recv_q
+        self.__send_q = send_q
+
+    def open_conn(self):
+        time.sleep(OPEN_TIME)
+
+    def run_recv_data(self, delay):
+        th.Event().wait()
+
+    def run_send_data(self, delay):
+        while True:
+            message = unpack_message(self.__send_q.get())
+            time.sleep(LATENCY)
+            if message["c"] == 0x08:
+                # Modules send their topology after their information
+                self.__recv_q.put_many(self.__module_info(module_id)
+                                       for module_id in module_ids())
+                self.__recv_q.put_many(self.__topology(module_id)
+                                       for module_id in module_ids())
+            elif message["c"] == 0x07:
+                targets = module_ids() if message["d"] == BROADCAST_ID \
+                    else [message["d"]]
+                self.__recv_q.put_many(self.__topology(module_id)
+                                       for module_id in targets)
+
+    @staticmethod
+    def __module_info(module_id):
+        info = MODULE_INFOS[module_id % len(MODULE_INFOS)]
+        return parse_message(0x05, module_id, 0, (
+            module_id, 0, 0, 0, info & 0xFF, info >> 8, 0x03, 0x22
+        ))
+
+    @staticmethod
+    def __topology(module_id):
+        right = module_id + 1 if module_id < NB_MODULES else NO_ID
+        left = module_id - 1 if module_id > 1 else NO_ID
+        return parse_message(0x07, module_id, 0, (
+            right & 0xFF, right >> 8, 0xFF, 0xFF,
+            left & 0xFF, left >> 8, 0xFF, 0xFF,
+        ))
+
+
+def module_ids():
+    return range(1, NB_MODULES + 1)
+
+
+def bench(nb_modules):
+    timings = dict()
+    first_command = 0
+    for _ in range(NB_RUNS):
+        begin = time.perf_counter()
+        bundle = modi.MODI(nb_modules, process_mode="thread")
+        bundle.modules[0].position
+        bundle.send(parse_message(0x03, 0, bundle.modules[0].id))
+        first_command += time.perf_counter() - begin
+        for phase, took in bundle.startup_timings.items():
+            timings[phase] = timings.get(phase, 0) + took
+    return {phase: took / NB_RUNS for phase, took in timings.items()}, \
+        first_command / NB_RUNS
+
+
+if __name__ == "__main__":
+    with mock.patch("modi.task.conn_task.ConnTask.is_on_pi",
+                    return_value=False), \
+            mock.patch("modi.task.ser_task.SerTask", SimulatedSerTask), \
+            mock.patch("modi.task.conn_task.ConnTask._list_modi_ports",
+                       return_value=[]):
+        results = [(nb_modules, bench(nb_modules))
+                   for nb_modules in (NB_MODULES, None)]
+    print(f"[{NB_MODULES} simulated modules, {NB_RUNS} runs]")
+    for nb_modules, (timings, first_command) in results:
+        print(f"MODI({nb_modules})")
+        for phase, took in timings.items():
+            print(f"  {phase:>16}: {took * 1000:7.1f}ms")
+        print(f"  {'first command':>16}: {first_command * 1000:7.1f}ms")
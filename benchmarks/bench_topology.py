@@ -0,0 +1,143 @@
+"""Measure the topology completeness check of a large bundle.
+
+The topology messages of a network module and of modules laid out in a grid
+arrive in a random order, and whether the topology is complete is checked
+after each of them, as MODI does while it starts up. The previous check,
+which rebuilt the topology map on every call, is timed alongside the
+incremental topology manager, followed by the cost of a check once the
+topology is complete. The manager is told a network module is connected,
+as the grid has one, and the time taken to look it up in the serial ports,
+which the manager does once otherwise, is reported separately. The time
+and memory taken to construct the topology map and to print it are
+reported last.
+
+Usage: python benchmarks/bench_topology.py
+"""
+
+import io
+import time
+import random
+import tracemalloc
+
+from contextlib import redirect_stdout
+
+from modi.module.input_module.gyro import Gyro
+from modi.task.conn_task import ConnTask
+from modi.util.topology_manager import TopologyManager, TopologyMap
+
+WIDTH, HEIGHT = 20, 10
+NB_CHECKS = 200
+NB_PRINTS = 20
+GYRO_UUID = 0x201000000000
+
+
+class MockExeThrd:
+
+    def request_topology(self, cmd=0x07, module_id=0xFFF):
+        pass
+
+
+def grid_topology():
+    """Topology messages of a network module at the bottom left corner of a
+    grid of gyro modules, which all face the same direction
+    """
+    def module_id(x, y):
+        if 0 <= x < WIDTH and 0 <= y < HEIGHT:
+            return 1 + y * WIDTH + x
+        return None
+
+    messages = []
+    for y in range(HEIGHT):
+        for x in range(WIDTH):
+            id_ = module_id(x, y)
+            uuid = None if id_ == 1 else GYRO_UUID + id_
+            messages.append((id_, {
+                'uuid': uuid, 'r': module_id(x + 1, y),
+                't': module_id(x, y + 1), 'l': module_id(x - 1, y),
+                'b': module_id(x, y - 1),
+            }))
+    return messages
+
+
+def rebuild_check(tp_data, modules):
+    try:
+        tp_map = TopologyMap(tp_data, len(tp_data), modules)
+        tp_map.construct_map()
+        tp_map.update_module_data(modules)
+    except KeyError:
+        return False
+    return len(modules) == len(tp_data) - 1 and \
+        sum(not module_data['uuid'] for module_data in tp_data.values()) <= 1
+
+
+def bench_rebuild(messages, modules):
+    tp_data = dict()
+    begin = time.perf_counter()
+    for module_id, module_data in messages:
+        tp_data[module_id] = dict(module_data)
+        is_complete = rebuild_check(tp_data, modules)
+    took = time.perf_counter() - begin
+    assert is_complete
+
+    begin = time.perf_counter()
+    for _ in range(NB_CHECKS):
+        rebuild_check(tp_data, modules)
+    return took, (time.perf_counter() - begin) / NB_CHECKS
+
+
+def bench_incremental(messages, modules):
+    exe_thrd = MockExeThrd()
+    topology_manager = TopologyManager(dict(), modules, True)
+    begin = time.perf_counter()
+    for module_id, module_data in messages:
+        topology_manager.update_topology(module_id, dict(module_data))
+        is_complete = topology_manager.is_topology_complete(exe_thrd)
+    took = time.perf_counter() - begin
+    assert is_complete
+
+    begin = time.perf_counter()
+    for _ in range(NB_CHECKS):
+        topology_manager.is_topology_complete(exe_thrd)
+    return took, (time.perf_counter() - begin) / NB_CHECKS
+
+
+def bench_network_lookup():
+    begin = time.perf_counter()
+    ConnTask.is_network_module_connected()
+    return time.perf_counter() - begin
+
+
+def bench_map(messages, modules):
+    tp_data = {module_id: module_data for module_id, module_data in messages}
+    tracemalloc.start()
+    tp_map = TopologyMap(tp_data, len(tp_data), modules)
+    tp_map.construct_map()
+    memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    begin = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for _ in range(NB_PRINTS):
+            tp_map.print_map(True)
+    return memory, (time.perf_counter() - begin) / NB_PRINTS
+
+
+if __name__ == "__main__":
+    messages = grid_topology()
+    random.seed(0)
+    random.shuffle(messages)
+    modules = [Gyro(module_id, module_data['uuid'], None)
+               for module_id, module_data in messages if module_id != 1]
+
+    print(f"[{len(messages)} modules in a {WIDTH}x{HEIGHT} grid]")
+    for name, bench in (("rebuild", bench_rebuild),
+                        ("incremental", bench_incremental)):
+        took, check_took = bench(messages, modules)
+        print(f"{name:>12}: {took * 1000:8.1f}ms for every message "
+              f"| {check_took * 1e6:8.1f}us per check once complete")
+    print(f"{'lookup':>12}: {bench_network_lookup() * 1000:8.1f}ms "
+          f"once per manager")
+
+    memory, print_took = bench_map(messages, modules)
+    print(f"{'map':>12}: {memory / 1024:8.1f}KiB to construct "
+          f"| {print_took * 1000:8.1f}ms per print")
@@ -0,0 +1,103 @@
+"""Measure the queue depth and the latency of the last write of a 1kHz
+setter loop.
+
+A led and a motor are set to new values every millisecond for a while,
+which makes 3000 messages/s, three times what the send task writes. A
+thread plays the send task, writing the messages paced by the token
+bucket of the connection tasks. Setters used to put every message to the
+send queue, which is replayed for comparison with the write coalescer. The
+largest number of messages waiting in the send queue is reported, with the
+time from the last assignment to the write of its value.
+
+Usage: python benchmarks/bench_write_coalescing.py
+"""
+
+import time
+import queue
+
+import threading as th
+
+from modi.module.output_module.led import Led
+from modi.module.output_module.motor import Motor
+from modi.task.conn_task import ConnTask
+from modi.util.queues import CommunicationQueue
+from modi.util.token_bucket import TokenBucket
+from modi.util.write_coalescer import WriteCoalescer
+
+SET_RATE = 1000
+DURATION = 2
+
+
+class CountingQueue(CommunicationQueue):
+
+    def __init__(self):
+        super().__init__("thread")
+        self.nb_put = 0
+
+    def put(self, message):
+        self.nb_put += 1
+        super().put(message)
+
+    def put_many(self, messages):
+        messages = list(messages)
+        self.nb_put += len(messages)
+        super().put_many(messages)
+
+
+def send(send_q, written, stop):
+    send_bucket = TokenBucket(ConnTask.SEND_RATE, ConnTask.SEND_BURST)
+    while not stop.is_set():
+        try:
+            message = send_q.get_nowait()
+        except queue.Empty:
+            time.sleep(0.001)
+            continue
+        send_bucket.consume()
+        written.append((message, time.perf_counter()))
+
+
+def bench(name, coalesce):
+    send_q = CountingQueue()
+    write_q = WriteCoalescer(send_q, ConnTask.SEND_RATE) if coalesce \
+        else send_q
+    led, motor = Led(1, 1, write_q), Motor(2, 2, write_q)
+    for module in (led, motor):
+        for property_type in module.PropertyType:
+            module._fetch_property(property_type)
+            module.update_property(property_type, 0)
+    written, stop = [], th.Event()
+    sender = th.Thread(target=send, args=(send_q, written, stop))
+    sender.start()
+
+    max_depth, begin, i = 0, time.perf_counter(), 0
+    while time.perf_counter() - begin < DURATION:
+        while time.perf_counter() - begin < i / SET_RATE:
+            pass
+        for module in (led, motor):
+            for property_type in module.PropertyType:
+                module.update_property(property_type, 0)
+        led.rgb = (i % 256, i // 256 % 256, 0)
+        motor.speed = (i % 100, -(i % 100))
+        max_depth = max(max_depth, send_q.nb_put - len(written))
+        i += 1
+    last_set_time = time.perf_counter()
+    last_message = led._OutputModule__parse_set_message(
+        1, Led.CommandType.SET_RGB, ((i - 1) % 256, (i - 1) // 256 % 256, 0),
+        Led.PropertyDataType.INT
+    )[0]
+
+    while not any(message == last_message for message, _ in written[-4:]):
+        time.sleep(0.001)
+    stop.set()
+    sender.join()
+    latency = [write_time for message, write_time in written
+               if message == last_message][-1] - last_set_time
+    print(f"{name:>10}: {i / DURATION:5.0f} sets/s "
+          f"| written {len(written):5d} messages "
+          f"| queue depth max {max_depth:5d} "
+          f"| last write latency {latency * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    bench("previous", False)
+    bench("coalesced", True)
@@ -1,23 +1,26 @@
 """Top-level package for pyMODI."""
 
+import sys
+
 from modi.modi import MODI
 from modi import about
 
 __all__ = ["MODI"]
 __version__ = about.__version__
 
+# Import asyncio and AsyncMODI only when they are used. Module __getattr__
+# needs Python 3.7, before it AsyncMODI is imported from modi.async_modi.
+if sys.version_info >= (3, 7):
+    __all__.append("AsyncMODI")
+
+    def __getattr__(name):
+        if name == "AsyncMODI":
+            from modi.async_modi import AsyncMODI
+            return AsyncMODI
+        raise AttributeError(f"module 'modi' has no attribute '{name}'")
+
 # Check PyMODI version
-import json
-import urllib.request as ur
-from urllib.error import URLError
+from modi.util.version_cache import check_latest_version
 
 print(f'Running PyMODI (v{__version__})')
-try:
-    url = "https://pypi.org/pypi/pymodi/json"
-    pypi_pymodi_data = json.load(ur.urlopen(url))
-    latest_pymodi_version = list(pypi_pymodi_data["releases"].keys())[-1]
-    if __version__ != latest_pymodi_version:
-        print(f"Newer PyMODI (v{latest_pymodi_version}) is available!")
-except URLError:
-    print("Cannot check the latest version of PyMODI, "
-          "please check your internet connection")
+check_latest_version(__version__)
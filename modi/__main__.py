@@ -3,7 +3,7 @@ import sys
 import time
 import modi
 
-from modi.util.msgutil import parse_message, decode_message
+from modi.util.msgutil import parse_message, decode_message, message_to_json
 from getopt import getopt, GetoptError
 
 
@@ -63,18 +63,20 @@ if __name__ == "__main__":
         took = (fin_time - init_time) * 100 // 1 / 100
         bundle.print_topology_map(True)
         print(f"Took {took} seconds to initialize")
+        for phase, phase_took in bundle.startup_timings.items():
+            print(f"    {phase:>10}: {phase_took * 1000:7.1f} ms")
         time.sleep(1)
         msg = parse_message(0x03, 0, bundle.modules[0].id, (1, None, 96, None))
-        print(f"sending request message... {msg}")
+        print(f"sending request message... {message_to_json(msg)}")
         init_time = time.time()
         bundle.send(msg)
         while True:
-            msg = bundle.recv()
+            msg = bundle.recv_raw()
             if msg and decode_message(msg)[0] == 0x1F:
                 break
         fin_time = time.time()
         took = round((fin_time - init_time) / 2, 2)
-        print(f"received message... {msg}")
+        print(f"received message... {message_to_json(msg)}")
         print(f"Took {took} seconds for message transfer")
         exit(0)
 
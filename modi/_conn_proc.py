@@ -2,37 +2,41 @@
 import threading as th
 import multiprocessing as mp
 
-from modi.task.conn_task import ConnTask
-from modi.task.ser_task import SerTask
-from modi.task.can_task import CanTask
-from modi.task.spp_task import SppTask
 
-
-class ConnProc(mp.Process):
+class ConnRunner:
+    """Runs the receiving and sending loops of a connection task. It is
+    shared by the connection process and the connection thread.
+    """
 
     def __init__(self, recv_q, send_q, conn_mode, module_uuid, verbose,
-                 init_flag, port=None):
+                 init_flag, port=None, recv_mode="poll"):
         super().__init__()
         params = [recv_q, send_q, verbose]
         if conn_mode.startswith("b"):
             params.append(module_uuid)
         if conn_mode.startswith('s'):
-            params.append(port)
+            params.extend([port, recv_mode])
         self.__task = self.__init_task(conn_mode)(*params)
-        self.__delay = 0.05 if isinstance(self.__task, SppTask) else 0.001
+        self.__delay = 0.05 if conn_mode.startswith("b") else 0.001
         self.__init_flag = init_flag
 
-    def __init_task(self, conn_mode: str) -> ConnTask:
-        """Initialize task with given connection mode
+    def __init_task(self, conn_mode: str) -> type:
+        """Initialize task with given connection mode. Tasks are imported
+        here, so that only the transport in use is imported
 
         :param conn_mode: Desired connection mode
         :type conn_mode: str
         :return: Corresponding connection task
-        :rtype: ConnTask
+        :rtype: type
         """
         if conn_mode.startswith("b"):
+            from modi.task.spp_task import SppTask
             return SppTask
-        return CanTask if self.__is_modi_pi() else SerTask
+        if self.__is_modi_pi():
+            from modi.task.can_task import CanTask
+            return CanTask
+        from modi.task.ser_task import SerTask
+        return SerTask
 
     @staticmethod
     def __is_modi_pi() -> bool:
@@ -41,6 +45,7 @@ class ConnProc(mp.Process):
         :return: true is on pi
         :rtype: bool
         """
+        from modi.task.conn_task import ConnTask
         return ConnTask.is_on_pi() and \
             not ConnTask.is_network_module_connected()
 
@@ -67,3 +72,7 @@ class ConnProc(mp.Process):
 
         recv_thread.join()
         send_thread.join()
+
+
+class ConnProc(ConnRunner, mp.Process):
+    """Runs the connection in a child process"""
@@ -0,0 +1,22 @@
+import os
+import traceback
+
+import threading as th
+
+from modi._conn_proc import ConnRunner
+
+
+class ConnThrd(ConnRunner, th.Thread):
+    """Runs the connection in a thread of the current process"""
+
+    def run(self) -> None:
+        """Run the connection, exiting the process when it fails as the
+        connection process would
+
+        :return: None
+        """
+        try:
+            super().run()
+        except Exception:
+            traceback.print_exc()
+            os._exit(1)
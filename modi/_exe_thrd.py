@@ -1,6 +1,7 @@
 import threading as th
 
 from modi.task.exe_task import ExeTask
+from modi.util.topology_manager import TopologyManager
 
 
 class ExeThrd(th.Thread):
@@ -24,6 +25,18 @@ class ExeThrd(th.Thread):
     def request_topology(self, cmd=0x07, module_id=0xFFF):
         self.__exe_task.request_topology(cmd, module_id)
 
+    @property
+    def topology_manager(self) -> TopologyManager:
+        """Topology of the modules, updated by the executor
+        """
+        return self.__exe_task.topology_manager
+
+    @property
+    def topology_updated(self) -> th.Event:
+        """Event set when the topology data or the module list is updated
+        """
+        return self.__exe_task.topology_updated
+
     def run(self) -> None:
         """ Run executor task
 
@@ -31,4 +44,4 @@ class ExeThrd(th.Thread):
         """
         self.__init_flag.set()
         while True:
-            self.__exe_task.run(delay=0.001)
+            self.__exe_task.run(timeout=0.1)
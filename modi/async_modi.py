@@ -0,0 +1,404 @@
+"""Asyncio MODI module."""
+
+import time
+import asyncio
+
+from enum import IntEnum
+from typing import AsyncIterator, Iterable, List, Tuple
+
+from modi.module.module import Module
+from modi.task.exe_task import ExeTask
+from modi.task.async_ser_task import AsyncSerTask
+from modi.util.firmware_updater import FirmwareUpdater
+from modi.util.misc import module_list
+from modi.util.msgutil import MESSAGE_STRUCT
+
+
+class AsyncModule:
+    """Awaitable view of a connected module. Attributes other than the
+    awaitable methods are those of the module itself. The methods of the
+    module which wait for updates, such as read_many, wait_for_update and
+    snapshot, are replaced by awaitable methods, so that they do not block
+    the event loop.
+
+    :param module: The module to view
+    :param conn_task: Connection task which writes the module messages
+    """
+
+    def __init__(self, module: Module, conn_task: AsyncSerTask):
+        self.__module = module
+        self.__conn_task = conn_task
+        self.__waiters = dict()
+        self.__subscribers = dict()
+
+    def __getattr__(self, name):
+        return getattr(self.__module, name)
+
+    def __gt__(self, other):
+        return self.__module > other.module
+
+    def __repr__(self):
+        return f"Async{type(self.__module).__name__}({self.__module.id})"
+
+    @property
+    def module(self) -> Module:
+        return self.__module
+
+    async def read(self, property_type: IntEnum, max_age: float = None,
+                   timeout: float = None) -> Tuple[float, float]:
+        """ Read a property with the time it was updated, waiting for its
+        first update from the module. When a maximum age is given, wait
+        until the module sends a value younger than it.
+        Example:
+        >>> roll, update_time = await gyro.read(Gyro.PropertyType.ROLL)
+
+        :param property_type: Type of the property to read
+        :type property_type: IntEnum
+        :param max_age: Maximum age of the value in seconds
+        :type max_age: float, optional
+        :param timeout: Maximum time to wait for the value in seconds
+        :type timeout: float, optional
+        :raises asyncio.TimeoutError: If the module does not send the value
+        :return: Value of the property and its update time, as given by
+            time.time()
+        :rtype: Tuple[float, float]
+        """
+        prop = self.__module._fetch_property(property_type)
+        min_update_time = 0 if max_age is None else time.time() - max_age
+
+        def is_young():
+            return prop.last_update_time and \
+                prop.last_update_time >= min_update_time
+
+        async def wait_young():
+            while not is_young():
+                await self.__next_update(property_type)
+
+        if not is_young():
+            await asyncio.wait_for(wait_young(), timeout)
+        return prop.value, prop.last_update_time
+
+    async def read_many(self, property_types: Iterable[IntEnum],
+                        timeout: float = None) -> Tuple[float, ...]:
+        """ Read several properties, waiting for the first update of those
+        which have never been updated
+
+        :param property_types: Types of the properties to read
+        :type property_types: Iterable[IntEnum]
+        :param timeout: Maximum time to wait for the first updates in seconds
+        :type timeout: float, optional
+        :raises asyncio.TimeoutError: If the module does not send the values
+        :return: Values of the properties, in the given order
+        :rtype: Tuple[float, ...]
+        """
+        property_types = tuple(property_types)
+        props = [self.__module._fetch_property(property_type)
+                 for property_type in property_types]
+        waiters = [self.__next_update(property_type)
+                   for property_type, prop in zip(property_types, props)
+                   if not prop.last_update_time]
+        if waiters:
+            await asyncio.wait_for(asyncio.gather(*waiters), timeout)
+        return tuple(prop.value for prop in props)
+
+    async def wait_for_update(self, property_type: IntEnum,
+                              timeout: float = None) -> Tuple[float, float]:
+        """ Wait for the module to send the next value of a property
+
+        :param property_type: Type of the property to wait for
+        :type property_type: IntEnum
+        :param timeout: Maximum time to wait in seconds
+        :type timeout: float, optional
+        :raises asyncio.TimeoutError: If the property is not updated in time
+        :return: New value of the property and its update time
+        :rtype: Tuple[float, float]
+        """
+        prop = self.__module._fetch_property(property_type)
+        await asyncio.wait_for(self.__next_update(property_type), timeout)
+        return prop.value, prop.last_update_time
+
+    async def snapshot(self, timeout: float = None) -> Tuple[float, ...]:
+        """ Read every property of the module at once, as a named tuple
+        whose fields are the property names in lower case
+
+        :param timeout: Maximum time to wait for the first updates in seconds
+        :type timeout: float, optional
+        :raises asyncio.TimeoutError: If the module does not send the values
+        :return: Values of the properties
+        :rtype: Tuple[float, ...]
+        """
+        values = await self.read_many(self.__module.PropertyType, timeout)
+        return self.__module._snapshot_type()(*values)
+
+    def __next_update(self, property_type: IntEnum) -> asyncio.Future:
+        """ Returns a future resolved by the next update of a property
+
+        :param property_type: Type of the property
+        :type property_type: IntEnum
+        :return: Future of the next value
+        :rtype: asyncio.Future
+        """
+        waiter = asyncio.get_event_loop().create_future()
+        self.__waiters.setdefault(property_type, []).append(waiter)
+        return waiter
+
+    async def updates(self, property_type: IntEnum) -> AsyncIterator[float]:
+        """ Iterate over the values of a property as the module sends them.
+        Example:
+        >>> async for roll in gyro.updates(Gyro.PropertyType.ROLL):
+        ...     print(roll)
+
+        :param property_type: Type of the property to iterate
+        :type property_type: IntEnum
+        :return: Values of the property
+        :rtype: AsyncIterator[float]
+        """
+        updates = asyncio.Queue()
+        subscribers = self.__subscribers.setdefault(property_type, [])
+        subscribers.append(updates)
+        try:
+            while True:
+                # Keep the property requested while it is iterated
+                self.__module._fetch_property(property_type)
+                yield await updates.get()
+        finally:
+            subscribers.remove(updates)
+
+    async def set_property(self, name: str, value) -> None:
+        """ Set a property of an output module, by the name of its setter
+        Example:
+        >>> await led.set_property("rgb", (0, 0, 255))
+
+        :param name: Name of the property, such as "rgb" or "speed"
+        :type name: str
+        :param value: Value to set
+        :return: None
+        """
+        setattr(self.__module, name, value)
+        await self.__conn_task.drain()
+
+    def _notify(self, property_number: int) -> None:
+        """ Wake up the readers of an updated property
+
+        :param property_number: Number of the updated property
+        :type property_number: int
+        :return: None
+        """
+        prop = self.__module._properties.get(property_number)
+        if prop is None:
+            return
+        for waiter in self.__waiters.pop(property_number, ()):
+            if not waiter.done():
+                waiter.set_result(prop.value)
+        for updates in self.__subscribers.get(property_number, ()):
+            updates.put_nowait(prop.value)
+
+
+class AsyncModuleList(module_list):
+    """List of the connected modules of an asyncio bundle. Waiting for a
+    module to connect would block the event loop, so it is refused.
+    """
+
+    def wait_for(self, item: int, timeout: float = None):
+        raise TypeError("Waiting for a module blocks the event loop, give "
+                        "the number of modules to AsyncMODI to await them "
+                        "when the bundle is opened")
+
+
+class AsyncMODI:
+    """
+    Example:
+    >>> import asyncio
+    >>> import modi
+    >>> async def main():
+    ...     async with modi.AsyncMODI(nb_modules=1) as bundle:
+    ...         gyro = bundle.gyros[0]
+    ...         roll, _ = await gyro.read(gyro.PropertyType.ROLL)
+    ...         print(roll)
+    >>> asyncio.run(main())
+
+    The serial port is read by the event loop, so a single event loop can
+    drive several bundles along with the rest of the application.
+
+    When the number of modules is given, opening the bundle also waits for
+    the topology, so that the module lists are sorted by the distance from
+    the network module. Otherwise, the modules are listed in the order they
+    connect, as their positions are unknown.
+    """
+
+    # Time between two checks of the topology in seconds
+    TOPOLOGY_CHECK_INTERVAL = 0.01
+
+    def __init__(self, nb_modules: int = None, verbose: bool = False,
+                 port: str = None):
+        self._modules = list()
+        self._module_ids = dict()
+        self._topology_data = dict()
+        self._async_modules = dict()
+
+        self.__nb_modules = nb_modules
+        self.__verbose = verbose
+        self.__port = port
+
+        self._conn_task = None
+        self._exe_task = None
+
+    async def open(self, timeout: float = None) -> 'AsyncMODI':
+        """ Open the connection, waiting for the modules to be initialized
+        and for their topology when the number of modules is given
+
+        :param timeout: Maximum time to wait for the modules in seconds
+        :type timeout: float, optional
+        :return: The bundle itself
+        :rtype: AsyncMODI
+        """
+        loop = asyncio.get_event_loop()
+        self._conn_task = AsyncSerTask(
+            loop, self._handle_messages, self.__verbose, self.__port
+        )
+        self._conn_task.open_conn()
+
+        module_init_event = asyncio.Event()
+        self._exe_task = ExeTask(
+            self._modules, self._module_ids, self._topology_data,
+            None, self._conn_task, module_init_event, self.__nb_modules,
+            FirmwareUpdater(self._conn_task),
+        )
+        if self.__nb_modules:
+            await asyncio.wait_for(self.__init_modules(module_init_event),
+                                   timeout)
+        return self
+
+    async def __init_modules(self, module_init_event: asyncio.Event) -> None:
+        """ Wait for the modules to be initialized, then for their topology
+        to update their positions
+
+        :param module_init_event: Event set once the modules are initialized
+        :type module_init_event: asyncio.Event
+        :return: None
+        """
+        await module_init_event.wait()
+        print("MODI modules are initialized!")
+        topology_manager = self._exe_task.topology_manager
+        while not topology_manager.is_topology_complete(self._exe_task):
+            await asyncio.sleep(self.TOPOLOGY_CHECK_INTERVAL)
+
+    async def close(self) -> None:
+        """ Close the connection
+
+        :return: None
+        """
+        self._conn_task.close_conn()
+
+    async def __aenter__(self) -> 'AsyncMODI':
+        return await self.open()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _handle_messages(self, messages: List[bytes]) -> None:
+        """ Execute the commands of received messages and wake up the readers
+        of the updated properties
+
+        :param messages: Binary messages received from the connection
+        :type messages: List[bytes]
+        :return: None
+        """
+        for message in messages:
+            self._exe_task.handle_message(message)
+            if message[0] != 0x1F or len(message) != MESSAGE_STRUCT.size:
+                continue
+            _, source, property_number, _, _ = MESSAGE_STRUCT.unpack(message)
+            async_module = self._async_modules.get(source)
+            if async_module:
+                async_module._notify(property_number)
+
+    def send(self, message) -> None:
+        """Sends a binary message, or a json serialized message as it is.
+        The message is written right away, waiting for the port for
+        AsyncSerTask.WRITE_TIMEOUT at most.
+
+        :param message: Message to send
+        :raises SerialTimeoutException: If the port does not take it in time
+        :return: None
+        """
+        self._conn_task.put(message)
+
+    @property
+    def modules(self) -> Tuple[AsyncModule, ...]:
+        """Tuple of connected modules except network module.
+        """
+        for module in self._modules:
+            if module.id not in self._async_modules:
+                self._async_modules[module.id] = AsyncModule(
+                    module, self._conn_task
+                )
+        return tuple(self._async_modules[module.id]
+                     for module in self._modules)
+
+    @property
+    def buttons(self) -> AsyncModuleList:
+        """Tuple of connected :class:`~modi.module.button.Button` modules.
+        """
+        return AsyncModuleList(self.modules, 'button', False)
+
+    @property
+    def dials(self) -> AsyncModuleList:
+        """Tuple of connected :class:`~modi.module.dial.Dial` modules.
+        """
+        return AsyncModuleList(self.modules, "dial", False)
+
+    @property
+    def displays(self) -> AsyncModuleList:
+        """Tuple of connected :class:`~modi.module.display.Display` modules.
+        """
+        return AsyncModuleList(self.modules, "display", False)
+
+    @property
+    def envs(self) -> AsyncModuleList:
+        """Tuple of connected :class:`~modi.module.env.Env` modules.
+        """
+        return AsyncModuleList(self.modules, "env", False)
+
+    @property
+    def gyros(self) -> AsyncModuleList:
+        """Tuple of connected :class:`~modi.module.gyro.Gyro` modules.
+        """
+        return AsyncModuleList(self.modules, "gyro", False)
+
+    @property
+    def irs(self) -> AsyncModuleList:
+        """Tuple of connected :class:`~modi.module.ir.Ir` modules.
+        """
+        return AsyncModuleList(self.modules, "ir", False)
+
+    @property
+    def leds(self) -> AsyncModuleList:
+        """Tuple of connected :class:`~modi.module.led.Led` modules.
+        """
+        return AsyncModuleList(self.modules, "led", False)
+
+    @property
+    def mics(self) -> AsyncModuleList:
+        """Tuple of connected :class:`~modi.module.mic.Mic` modules.
+        """
+        return AsyncModuleList(self.modules, "mic", False)
+
+    @property
+    def motors(self) -> AsyncModuleList:
+        """Tuple of connected :class:`~modi.module.motor.Motor` modules.
+        """
+        return AsyncModuleList(self.modules, "motor", False)
+
+    @property
+    def speakers(self) -> AsyncModuleList:
+        """Tuple of connected :class:`~modi.module.speaker.Speaker` modules.
+        """
+        return AsyncModuleList(self.modules, "speaker", False)
+
+    @property
+    def ultrasonics(self) -> AsyncModuleList:
+        """Tuple of connected :class:`~modi.module.ultrasonic.Ultrasonic`
+        modules.
+        """
+        return AsyncModuleList(self.modules, "ultrasonic", False)
@@ -8,16 +8,18 @@ import traceback
 import threading as th
 import multiprocessing as mp
 
-from typing import Tuple
+from typing import Dict, Tuple
 
 from modi._conn_proc import ConnProc
+from modi._conn_thrd import ConnThrd
 from modi._exe_thrd import ExeThrd
 
-from modi.util.topology_manager import TopologyManager
 from modi.util.firmware_updater import FirmwareUpdater
 from modi.util.stranger import check_complete
 from modi.util.misc import module_list
+from modi.util.msgutil import message_to_json
 from modi.util.queues import CommunicationQueue
+from modi.util.write_coalescer import WriteCoalescer
 
 
 class MODI:
@@ -25,6 +27,36 @@ class MODI:
     Example:
     >>> import modi
     >>> bundle = modi.MODI()
+
+    Serial connections poll the port every millisecond by default. Pass
+    ``recv_mode="block"`` to wake the receiver as soon as bytes arrive
+    instead, which keeps the connection process idle between frames.
+    >>> bundle = modi.MODI(recv_mode="block")
+
+    Messages between the connection process and the main process go through
+    multiprocessing queues by default. Pass ``queue_backend="shared_memory"``
+    to carry them over ring buffers in shared memory instead, which requires
+    Python 3.8 or later.
+    >>> bundle = modi.MODI(queue_backend="shared_memory")
+
+    The connection runs in a child process by default. Pass
+    ``process_mode="thread"`` to run it in threads of the current process
+    instead, which starts faster and passes messages without crossing a
+    process boundary. The queue backend does not apply in this mode.
+    >>> bundle = modi.MODI(process_mode="thread")
+
+    The latest firmware version is fetched in the background and cached in
+    the user cache directory for a day. Set the MODI_OFFLINE environment
+    variable to 1 to use the cache only, without accessing the network.
+    The check for a newer PyMODI release at import is done the same way, and
+    is skipped when the MODI_VERSION_CHECK environment variable is 0.
+
+    Values set to output modules are written behind: a value set while the
+    previous value of the property is still waiting replaces it, and a value
+    equal to the one just written is skipped. Call ``flush`` to write the
+    waiting values right away.
+    >>> bundle.leds[0].rgb = (0, 0, 255)
+    >>> bundle.flush()
     """
 
     # Keeps track of all the connection processes spawned
@@ -32,19 +64,43 @@ class MODI:
 
     def __init__(self, nb_modules: int = None, conn_mode: str = "serial",
                  module_uuid: str = "", test: bool = False,
-                 verbose: bool = False, port: str = None):
+                 verbose: bool = False, port: str = None,
+                 recv_mode: str = "poll", queue_backend: str = "queue",
+                 process_mode: str = "process"):
+        if recv_mode not in ("poll", "block"):
+            raise ValueError(f"Unsupported receive mode: {recv_mode}")
+        if queue_backend not in CommunicationQueue.BACKENDS:
+            raise ValueError(f"Unsupported queue backend: {queue_backend}")
+        if process_mode not in ("process", "thread"):
+            raise ValueError(f"Unsupported process mode: {process_mode}")
+        in_thread = process_mode == "thread"
+        if in_thread:
+            queue_backend = "thread"
+
         self._modules = list()
         self._module_ids = dict()
         self._topology_data = dict()
 
         self.__lazy = not nb_modules
+        self.__module_lists = dict()
+
+        self._recv_q = CommunicationQueue(queue_backend)
+        self._send_q = CommunicationQueue(queue_backend)
 
-        self._recv_q = CommunicationQueue()
-        self._send_q = CommunicationQueue()
+        if conn_mode.startswith("b"):
+            from modi.task.spp_task import SppTask
+            send_rate = SppTask.SEND_RATE
+        else:
+            from modi.task.conn_task import ConnTask
+            send_rate = ConnTask.SEND_RATE
+        self._write_q = WriteCoalescer(self._send_q, send_rate)
 
         self._conn_proc = None
         self._exe_thrd = None
 
+        # Time taken by each phase of the startup
+        self.__startup_timings = dict()
+
         # Init flag used to notify initialization of MODI modules
         module_init_flag = th.Event()
 
@@ -52,11 +108,13 @@ class MODI:
         if test:
             return
 
-        init_flag = mp.Event()
+        phase_time = time.perf_counter()
+        init_flag = th.Event() if in_thread else mp.Event()
 
-        self._conn_proc = ConnProc(
+        conn_runner = ConnThrd if in_thread else ConnProc
+        self._conn_proc = conn_runner(
             self._recv_q, self._send_q, conn_mode, module_uuid, verbose,
-            init_flag, port
+            init_flag, port, recv_mode
         )
         self._conn_proc.daemon = True
         try:
@@ -70,47 +128,82 @@ class MODI:
                 traceback.print_exc()
             exit(1)
 
-        MODI.__conn_procs.append(self._conn_proc.pid)
-
-        self._child_watch = th.Thread(target=self.watch_child_process)
-        self._child_watch.daemon = True
-        self._child_watch.start()
+        if not in_thread:
+            MODI.__conn_procs.append(self._conn_proc.pid)
 
-        if nb_modules:
-            init_flag.wait()
+            self._child_watch = th.Thread(target=self.watch_child_process)
+            self._child_watch.daemon = True
+            self._child_watch.start()
 
+        # The executor starts while the connection opens, the messages
+        # initializing the modules wait in the send queue until it is open
         self._firmware_updater = FirmwareUpdater(self._send_q)
-
-        init_flag = th.Event()
-
         self._exe_thrd = ExeThrd(
             self._modules,
             self._module_ids,
             self._topology_data,
             self._recv_q,
-            self._send_q,
+            self._write_q,
             module_init_flag,
             nb_modules,
             self._firmware_updater,
-            init_flag
+            th.Event()
         )
         self._exe_thrd.daemon = True
         self._exe_thrd.start()
-        if nb_modules:
-            init_flag.wait()
+        self._topology_manager = self._exe_thrd.topology_manager
+        phase_time = self.__record_phase("start", phase_time)
+
+        init_flag.wait()
+        phase_time = self.__record_phase("connection", phase_time)
 
-        self._topology_manager = TopologyManager(self._topology_data,
-                                                 self._modules)
         if nb_modules:
             module_init_flag.wait()
             if not module_init_flag.is_set():
                 raise Exception("Modules are not initialized properly!")
                 exit(1)
+            phase_time = self.__record_phase("modules", phase_time)
             print("MODI modules are initialized!")
             check_complete(self)
 
-        while not self._topology_manager.is_topology_complete(self._exe_thrd):
-            time.sleep(0.1)
+        # The topology is checked again whenever the executor updates it, or
+        # after a while to request the topology of the modules still missing
+        topology_updated = self._exe_thrd.topology_updated
+        while True:
+            topology_updated.clear()
+            if self._topology_manager.is_topology_complete(self._exe_thrd):
+                break
+            topology_updated.wait(0.1)
+        self.__record_phase("topology", phase_time)
+
+    def __record_phase(self, phase: str, phase_time: float) -> float:
+        """Record the time taken by a phase of the startup
+
+        :param phase: Name of the phase
+        :type phase: str
+        :param phase_time: Time the phase began, from time.perf_counter
+        :type phase_time: float
+        :return: Time the phase ended, from time.perf_counter
+        :rtype: float
+        """
+        end_time = time.perf_counter()
+        self.__startup_timings[phase] = end_time - phase_time
+        return end_time
+
+    @property
+    def startup_timings(self) -> Dict[str, float]:
+        """Time taken by each phase of the startup in seconds, in the order
+        of the phases:
+        "start" spawns the connection and starts the executor,
+        "connection" waits for the connection to open,
+        "modules" waits for the given number of modules to be initialized,
+        "topology" waits for the topology of the modules to be complete.
+        Example:
+        >>> bundle = modi.MODI()
+        >>> for phase, took in bundle.startup_timings.items():
+        ...     print(phase, took)
+        """
+        return dict(self.__startup_timings)
 
     def update_module_firmware(self) -> None:
         """Updates firmware of connected modules"""
@@ -132,10 +225,41 @@ class MODI:
                 continue
         os.kill(os.getpid(), signal.SIGTERM)
 
-    def send(self, message):
+    def send(self, message) -> None:
+        """Sends a binary message, or a json serialized message as it is.
+        With the shared memory queue backend, json serialized messages are
+        converted to binary messages and must be valid MODI messages.
+
+        :param message: Message to send
+        :return: None
+        """
         self._send_q.put(message)
 
+    def flush(self) -> None:
+        """Writes the values set to output modules which are still waiting
+
+        :return: None
+        """
+        self._write_q.flush()
+
     def recv(self):
+        """Returns a received message serialized in json, None if there is
+        no message
+
+        :return: Json serialized message received
+        """
+        message = self.recv_raw()
+        if message is None:
+            return None
+        return message_to_json(message)
+
+    def recv_raw(self):
+        """Returns a received binary message, None if there is no message.
+        It saves the json serialization of recv when the message is decoded
+        with msgutil.
+
+        :return: Binary message received
+        """
         if self._recv_q.empty():
             return None
         return self._recv_q.get()
@@ -148,6 +272,37 @@ class MODI:
         """
         self._topology_manager.print_topology_map(print_id)
 
+    def get_topology(self) -> Dict[int, Dict]:
+        """Returns the topology of the connected modules by module id, with
+        the type, the position relative to the network module and the ids of
+        the neighbours of each module.
+        Example:
+        >>> bundle = modi.MODI()
+        >>> for module_id, module in bundle.get_topology().items():
+        ...     print(module_id, module["type"], module["position"])
+
+        :return: Topology of the modules by module id
+        :rtype: Dict[int, Dict]
+        """
+        return self._topology_manager.get_topology()
+
+    def __module_list(self, module_type: str) -> module_list:
+        """Returns the list of connected modules of a type, which is kept
+        between calls and updated as modules connect and move
+
+        :param module_type: Type of the modules
+        :type module_type: str
+        :return: Sorted list of the modules
+        :rtype: module_list
+        """
+        modules = self.__module_lists.get(module_type)
+        if modules is None or modules.src is not self._modules:
+            modules = module_list(self._modules, module_type, self.__lazy)
+            self.__module_lists[module_type] = modules
+        else:
+            modules.refresh()
+        return modules
+
     @property
     def modules(self) -> Tuple:
         """Tuple of connected modules except network module.
@@ -161,64 +316,64 @@ class MODI:
     def buttons(self) -> module_list:
         """Tuple of connected :class:`~modi.module.button.Button` modules.
         """
-        return module_list(self._modules, 'button', self.__lazy)
+        return self.__module_list("button")
 
     @property
     def dials(self) -> module_list:
         """Tuple of connected :class:`~modi.module.dial.Dial` modules.
         """
-        return module_list(self._modules, "dial", self.__lazy)
+        return self.__module_list("dial")
 
     @property
     def displays(self) -> module_list:
         """Tuple of connected :class:`~modi.module.display.Display` modules.
         """
-        return module_list(self._modules, "display", self.__lazy)
+        return self.__module_list("display")
 
     @property
     def envs(self) -> module_list:
         """Tuple of connected :class:`~modi.module.env.Env` modules.
         """
-        return module_list(self._modules, "env", self.__lazy)
+        return self.__module_list("env")
 
     @property
     def gyros(self) -> module_list:
         """Tuple of connected :class:`~modi.module.gyro.Gyro` modules.
         """
-        return module_list(self._modules, "gyro", self.__lazy)
+        return self.__module_list("gyro")
 
     @property
     def irs(self) -> module_list:
         """Tuple of connected :class:`~modi.module.ir.Ir` modules.
         """
-        return module_list(self._modules, "ir", self.__lazy)
+        return self.__module_list("ir")
 
     @property
     def leds(self) -> module_list:
         """Tuple of connected :class:`~modi.module.led.Led` modules.
         """
-        return module_list(self._modules, "led", self.__lazy)
+        return self.__module_list("led")
 
     @property
     def mics(self) -> module_list:
         """Tuple of connected :class:`~modi.module.mic.Mic` modules.
         """
-        return module_list(self._modules, "mic", self.__lazy)
+        return self.__module_list("mic")
 
     @property
     def motors(self) -> module_list:
         """Tuple of connected :class:`~modi.module.motor.Motor` modules.
         """
-        return module_list(self._modules, "motor", self.__lazy)
+        return self.__module_list("motor")
 
     @property
     def speakers(self) -> module_list:
         """Tuple of connected :class:`~modi.module.speaker.Speaker` modules.
         """
-        return module_list(self._modules, "speaker", self.__lazy)
+        return self.__module_list("speaker")
 
     @property
     def ultrasonics(self) -> module_list:
         """Tuple of connected :class:`~modi.module.ultrasonic.Ultrasonic` modules.
         """
-        return module_list(self._modules, "ultrasonic", self.__lazy)
+        return self.__module_list("ultrasonic")
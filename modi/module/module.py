@@ -1,10 +1,16 @@
 """Module module."""
 
-import json
 import time
-import base64
+import itertools
+import traceback
 
+import threading as th
+
+from collections import namedtuple
 from enum import IntEnum
+from typing import Callable, Iterable, Tuple
+
+from modi.util.msgutil import pack_message
 
 
 class Module:
@@ -19,6 +25,29 @@ class Module:
             self.value = 0
             self.last_update_time = 0
             self.last_request_time = 0
+            self.nb_updates = 0
+            self.period_ms = Module.DEFAULT_PERIOD_MS
+            self.is_subscribed = False
+            self.callbacks = list()
+
+    # Period in ms at which a requested property is sent by the module
+    DEFAULT_PERIOD_MS = 95
+
+    # Number of periods without update after which a subscribed property is
+    # requested again, in case the module has been reset
+    STALE_PERIODS = 5
+
+    # Named tuple types returned by snapshot, by module class
+    __snapshot_types = dict()
+
+    # Changed whenever a module moves, so that the sorted lists of modules
+    # know when to sort again
+    __layout_versions = itertools.count(1)
+    layout_version = 0
+
+    # Notified whenever a module is added to a bundle, which wakes up the
+    # lists of modules waiting for it
+    registration = th.Condition()
 
     class State(IntEnum):
         RUN = 0
@@ -38,10 +67,11 @@ class Module:
 
         self._type = str()
         self._properties = dict()
+        self._update_cond = th.Condition(th.Lock())
 
         self._is_connected = True
 
-        self.position = (0, 0)
+        self.__position = (0, 0)
         self.__version = None
         self.is_up_to_date = None
 
@@ -54,6 +84,16 @@ class Module:
         else:
             return self.distance > other.distance
 
+    @property
+    def position(self) -> Tuple[int, int]:
+        return self.__position
+
+    @position.setter
+    def position(self, position: Tuple[int, int]) -> None:
+        if position != self.__position:
+            self.__position = position
+            Module.layout_version = next(Module.__layout_versions)
+
     @property
     def version(self):
         version_string = ""
@@ -95,6 +135,17 @@ class Module:
         :param property_type: Type of the requested property
         :type property_type: IntEnum
         """
+        return self.__requested_property(property_type).value
+
+    def _fetch_property(self, property_type: IntEnum) -> 'Module.Property':
+        """ Register the property and request its value if it is not
+        updated for a second
+
+        :param property_type: Type of the requested property
+        :type property_type: IntEnum
+        :return: The registered property
+        :rtype: Module.Property
+        """
 
         # Register property if not exists
         if property_type not in self._properties.keys():
@@ -106,16 +157,296 @@ class Module:
             self._properties[property_type].last_request_time = time.time()
 
         # Request property value if not updated for 0.5 sec
-        duration = time.time() - \
-            self._properties[property_type].last_update_time
+        prop = self._properties[property_type]
+        duration = time.time() - prop.last_update_time
         if duration > 1:
             modi_serialtemp = self.request_property(
-                self._id, property_type
+                self._id, property_type, prop.period_ms
             )
             self._msg_send_q.put(modi_serialtemp)
-            self._properties[property_type].last_request_time = time.time()
-        time.sleep(0.001)
-        return self._properties[property_type].value
+            prop.last_request_time = time.time()
+        return prop
+
+    def read_many(self, property_types: Iterable[IntEnum],
+                  timeout: float = None) -> Tuple[float, ...]:
+        """ Read several properties at once. The properties which are not
+        registered or not updated for a second are requested in a single
+        burst, and the values are read together, so that no update is
+        applied in between.
+        Example:
+        >>> roll, pitch, yaw = gyro.read_many((
+        ...     Gyro.PropertyType.ROLL, Gyro.PropertyType.PITCH,
+        ...     Gyro.PropertyType.YAW,
+        ... ))
+
+        :param property_types: Types of the properties to read
+        :type property_types: Iterable[IntEnum]
+        :param timeout: Maximum time to wait for the requested properties in
+            seconds, the current values are returned at once when None
+        :type timeout: float, optional
+        :raises TimeoutError: If a requested property is not updated in time
+        :return: Values of the properties, in the given order
+        :rtype: Tuple[float, ...]
+        """
+        property_types = tuple(property_types)
+        request_time = time.time()
+        requests, stale_properties = [], []
+        for property_type in property_types:
+            prop = self._properties.get(property_type)
+            if prop is None:
+                prop = self._properties[property_type] = self.Property()
+            elif prop.is_subscribed:
+                if self.__is_subscription_stale(prop, request_time):
+                    stale_properties.append(prop)
+                    requests.append(self.request_property(
+                        self._id, property_type, prop.period_ms
+                    ))
+                    prop.last_request_time = request_time
+                elif not prop.last_update_time:
+                    # Its first update is on the way
+                    stale_properties.append(prop)
+                continue
+            elif request_time - prop.last_update_time <= 1:
+                continue
+            stale_properties.append(prop)
+            requests.append(self.request_property(
+                self._id, property_type, prop.period_ms
+            ))
+            prop.last_request_time = request_time
+        if requests:
+            self._put_many(requests)
+
+        def is_updated():
+            return all(prop.last_update_time >= request_time
+                       for prop in stale_properties)
+
+        with self._update_cond:
+            if timeout is not None:
+                self.__wait_for(is_updated, timeout)
+            properties = self._properties
+            return tuple([properties[property_type].value
+                          for property_type in property_types])
+
+    def read(self, property_type: IntEnum, max_age: float = None,
+             timeout: float = None) -> Tuple[float, float]:
+        """ Read a property with the time it was updated. When a maximum age
+        is given, wait until the module sends a value younger than it.
+        Example:
+        >>> roll, update_time = gyro.read(Gyro.PropertyType.ROLL, 0.1, 1)
+
+        :param property_type: Type of the property to read
+        :type property_type: IntEnum
+        :param max_age: Maximum age of the value in seconds
+        :type max_age: float, optional
+        :param timeout: Maximum time to wait for a young value in seconds
+        :type timeout: float, optional
+        :raises TimeoutError: If no young value is sent in time
+        :return: Value of the property and its update time, as given by
+            time.time(), which is 0 when it has never been updated
+        :rtype: Tuple[float, float]
+        """
+        prop = self.__requested_property(property_type)
+        with self._update_cond:
+            if max_age is not None:
+                min_update_time = time.time() - max_age
+                self.__wait_for(
+                    lambda: prop.last_update_time >= min_update_time, timeout
+                )
+            return prop.value, prop.last_update_time
+
+    def wait_for_update(self, property_type: IntEnum,
+                        timeout: float = None) -> Tuple[float, float]:
+        """ Wait for the module to send the next value of a property
+        Example:
+        >>> while True:
+        ...     roll, _ = gyro.wait_for_update(Gyro.PropertyType.ROLL)
+
+        :param property_type: Type of the property to wait for
+        :type property_type: IntEnum
+        :param timeout: Maximum time to wait in seconds
+        :type timeout: float, optional
+        :raises TimeoutError: If the property is not updated in time
+        :return: New value of the property and its update time
+        :rtype: Tuple[float, float]
+        """
+        prop = self.__requested_property(property_type)
+        with self._update_cond:
+            nb_updates = prop.nb_updates
+            self.__wait_for(lambda: prop.nb_updates != nb_updates, timeout)
+            return prop.value, prop.last_update_time
+
+    def __requested_property(self, property_type: IntEnum) \
+            -> 'Module.Property':
+        """ Return the property, requesting it unless it is subscribed, as
+        subscribed properties are streamed by the module. A subscribed
+        property which is not sent anymore is requested again.
+
+        :param property_type: Type of the property
+        :type property_type: IntEnum
+        :return: The registered property
+        :rtype: Module.Property
+        """
+        prop = self._properties.get(property_type)
+        if prop and prop.is_subscribed:
+            request_time = time.time()
+            if self.__is_subscription_stale(prop, request_time):
+                self._msg_send_q.put(self.request_property(
+                    self._id, property_type, prop.period_ms
+                ))
+                prop.last_request_time = request_time
+            return prop
+        return self._fetch_property(property_type)
+
+    def __is_subscription_stale(self, prop: 'Module.Property',
+                                current_time: float) -> bool:
+        """ Returns whether a subscribed property has been neither updated
+        nor requested for STALE_PERIODS periods
+
+        :param prop: The subscribed property
+        :type prop: Module.Property
+        :param current_time: Current time, as given by time.time()
+        :type current_time: float
+        :return: True if the property should be requested again
+        :rtype: bool
+        """
+        stale_time = self.STALE_PERIODS * prop.period_ms / 1000
+        return current_time - prop.last_update_time > stale_time and \
+            current_time - prop.last_request_time > stale_time
+
+    def __wait_for(self, predicate: Callable[[], bool],
+                   timeout: float = None) -> None:
+        """ Wait for properties to be updated, holding the update condition
+
+        :param predicate: Function returning whether the wait is over
+        :type predicate: Callable[[], bool]
+        :param timeout: Maximum time to wait in seconds
+        :type timeout: float, optional
+        :raises TimeoutError: If the predicate is still false after timeout
+        :return: None
+        """
+        if not self._update_cond.wait_for(predicate, timeout):
+            raise TimeoutError(f"{self._type} ({self._id}) did not send "
+                               f"the requested properties in time")
+
+    def snapshot(self, timeout: float = None) -> Tuple[float, ...]:
+        """ Read every property of the module at once, as a named tuple
+        whose fields are the property names in lower case. Values are those
+        sent by the module, before the conversion of the property getters.
+        Example:
+        >>> gyro.snapshot().roll
+
+        :param timeout: Maximum time to wait for the requested properties in
+            seconds, the current values are returned at once when None
+        :type timeout: float, optional
+        :raises TimeoutError: If a requested property is not updated in time
+        :return: Values of the properties
+        :rtype: Tuple[float, ...]
+        """
+        return self._snapshot_type()(
+            *self.read_many(self.PropertyType, timeout)
+        )
+
+    def _snapshot_type(self) -> type:
+        """ Returns the named tuple type of the snapshots of the module,
+        which is created once per module class
+
+        :return: Named tuple type
+        :rtype: type
+        """
+        module_class = type(self)
+        snapshot_type = Module.__snapshot_types.get(module_class)
+        if snapshot_type is None:
+            snapshot_type = namedtuple(
+                f"{module_class.__name__}Snapshot",
+                [property_type.name.lower()
+                 for property_type in self.PropertyType]
+            )
+            Module.__snapshot_types[module_class] = snapshot_type
+        return snapshot_type
+
+    def _put_many(self, messages: Iterable[bytes]) -> None:
+        """ Put messages to the send queue at once, when it supports it
+
+        :param messages: Messages to send
+        :type messages: Iterable[bytes]
+        :return: None
+        """
+        put_many = getattr(self._msg_send_q, "put_many", None)
+        if put_many:
+            put_many(messages)
+        else:
+            for message in messages:
+                self._msg_send_q.put(message)
+
+    def subscribe(self, property_type: IntEnum,
+                  period_ms: int = DEFAULT_PERIOD_MS,
+                  callback: Callable[[float], None] = None) -> None:
+        """ Request the module to send a property every period. The property
+        is then read from memory without requesting it, and the callback is
+        called with every value sent by the module.
+        Example:
+        >>> gyro.subscribe(Gyro.PropertyType.ROLL, 20, print)
+
+        Callbacks are called by the thread handling the received messages,
+        so they should return quickly.
+
+        :param property_type: Type of the property to subscribe
+        :type property_type: IntEnum
+        :param period_ms: Period of the updates in ms
+        :type period_ms: int
+        :param callback: Function called with each new value
+        :type callback: Callable[[float], None], optional
+        :return: None
+        """
+        request_property_msg = self.request_property(
+            self._id, property_type, period_ms
+        )
+        prop = self._properties.setdefault(property_type, self.Property())
+        prop.period_ms = period_ms
+        prop.is_subscribed = True
+        if callback:
+            prop.callbacks.append(callback)
+        self._msg_send_q.put(request_property_msg)
+        prop.last_request_time = time.time()
+
+    def resubscribe(self) -> None:
+        """ Request every subscribed property again, as a module stops
+        sending them when it is reset or reconnected
+
+        :return: None
+        """
+        request_time = time.time()
+        requests = []
+        for property_type, prop in self._properties.items():
+            if prop.is_subscribed:
+                requests.append(self.request_property(
+                    self._id, property_type, prop.period_ms
+                ))
+                prop.last_request_time = request_time
+        if requests:
+            self._put_many(requests)
+
+    def unsubscribe(self, property_type: IntEnum,
+                    callback: Callable[[float], None] = None) -> None:
+        """ Remove a callback of a property, or every callback when none is
+        given. The module keeps sending the property, which is requested
+        again on read when it is not updated.
+
+        :param property_type: Type of the subscribed property
+        :type property_type: IntEnum
+        :param callback: Callback to remove
+        :type callback: Callable[[float], None], optional
+        :return: None
+        """
+        prop = self._properties.get(property_type)
+        if prop is None:
+            return
+        if callback:
+            if callback in prop.callbacks:
+                prop.callbacks.remove(callback)
+        else:
+            prop.callbacks.clear()
+            prop.is_subscribed = False
 
     def update_property(self, property_type: IntEnum,
                         property_value: float) -> None:
@@ -126,33 +457,41 @@ class Module:
         :param property_value: Value to update the property
         :type property_value: float
         """
-        if property_type in self._properties.keys():
-            self._properties[property_type].value = property_value
-            self._properties[property_type].last_update_time = time.time()
+        prop = self._properties.get(property_type)
+        if prop is None:
+            return
+        with self._update_cond:
+            prop.value = property_value
+            prop.last_update_time = time.time()
+            prop.nb_updates += 1
+            self._update_cond.notify_all()
+        # Callbacks run in the executor thread, which must survive them
+        for callback in tuple(prop.callbacks):
+            try:
+                callback(property_value)
+            except Exception:
+                print(f"\nCallback of {self.__class__.__name__} ({self.id}) "
+                      f"failed!!!")
+                traceback.print_exc()
 
     @staticmethod
-    def request_property(destination_id: int,
-                         property_type: IntEnum) -> str:
+    def request_property(destination_id: int, property_type: IntEnum,
+                         period_ms: int = DEFAULT_PERIOD_MS) -> bytes:
         """ Generate message for request property
 
         :param destination_id: Id of the destination module
         :type destination_id: int
         :param property_type: Type of the requested property
         :type property_type: int
-        :return: json serialized message for request property
-        :rtype: str
+        :param period_ms: Period in ms at which the property is sent
+        :type period_ms: int
+        :return: binary message for request property
+        :rtype: bytes
         """
-        message = dict()
-
-        message["c"] = 0x03
-        message["s"] = 0
-        message["d"] = destination_id
-
+        if not 0 < period_ms <= 0xFFFF:
+            raise ValueError(f"Invalid period: {period_ms}ms")
         property_bytes = bytearray(4)
         property_bytes[0] = property_type
-        property_bytes[2] = 95
-
-        message["b"] = base64.b64encode(bytes(property_bytes)).decode("utf-8")
-        message["l"] = 4
+        property_bytes[2:4] = period_ms.to_bytes(2, "little")
 
-        return json.dumps(message, separators=(",", ":"))
+        return pack_message(0x03, 0, destination_id, property_bytes)
@@ -1,6 +1,7 @@
 """Display module."""
 
 from enum import IntEnum
+from typing import Tuple
 
 from modi.module.output_module.output_module import OutputModule
 
@@ -16,6 +17,12 @@ class Display(OutputModule):
         self._type = "display"
         self._text = ""
 
+    def _coalesce_key(self, destination_id: int, property_type: IntEnum,
+                      property_values: Tuple) -> Tuple:
+        # Text and variables are drawn over what the display shows, so every
+        # command is written in order
+        return None
+
     @property
     def text(self):
         return self._text
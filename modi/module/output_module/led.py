@@ -33,12 +33,14 @@ class Led(OutputModule):
         :type color: Tuple[int, int, int]
         :return: None
         """
-        _, _, _ = self.rgb
         self._set_property(
             self._id,
             self.CommandType.SET_RGB,
             color,
         )
+        self._commanded[self.PropertyType.RED] = color[0]
+        self._commanded[self.PropertyType.GREEN] = color[1]
+        self._commanded[self.PropertyType.BLUE] = color[2]
 
     def turn_on(self) -> None:
         """Turn on led at maximum brightness.
@@ -73,7 +75,11 @@ class Led(OutputModule):
         :type red: int
         :return: None
         """
-        self.rgb = red, self.green, self.blue
+        self.rgb = (
+            red,
+            self._commanded_property(self.PropertyType.GREEN),
+            self._commanded_property(self.PropertyType.BLUE),
+        )
 
     @property
     def green(self) -> float:
@@ -93,7 +99,11 @@ class Led(OutputModule):
         :type green: int
         :return: None
         """
-        self.rgb = self.red, green, self.blue
+        self.rgb = (
+            self._commanded_property(self.PropertyType.RED),
+            green,
+            self._commanded_property(self.PropertyType.BLUE),
+        )
 
     @property
     def blue(self) -> float:
@@ -113,4 +123,8 @@ class Led(OutputModule):
         :type blue: int
         :return: None
         """
-        self.rgb = self.red, self.green, blue
+        self.rgb = (
+            self._commanded_property(self.PropertyType.RED),
+            self._commanded_property(self.PropertyType.GREEN),
+            blue,
+        )
@@ -21,6 +21,16 @@ class Motor(OutputModule):
         DEGREE = 18
         CHANNEL = 19
 
+    # Property controlled by each channel and control mode
+    CONTROLLED_PROPERTIES = {
+        (0, 0): PropertyType.FIRST_TORQUE,
+        (1, 0): PropertyType.SECOND_TORQUE,
+        (0, 1): PropertyType.FIRST_SPEED,
+        (1, 1): PropertyType.SECOND_SPEED,
+        (0, 2): PropertyType.FIRST_DEGREE,
+        (1, 2): PropertyType.SECOND_DEGREE,
+    }
+
     def __init__(self, id_, uuid, msg_send_q):
         super().__init__(id_, uuid, msg_send_q)
         self._type = "motor"
@@ -49,6 +59,20 @@ class Motor(OutputModule):
                 control_value
             ),
         )
+        property_type = self.CONTROLLED_PROPERTIES.get(
+            (motor_channel, control_mode)
+        )
+        if property_type and control_value is not None:
+            self._commanded[property_type] = control_value
+
+    def _coalesce_key(self, destination_id: int, property_type: IntEnum,
+                      property_values: Tuple) -> Tuple:
+        # Both channels are controlled by the same command
+        if property_type == self.ControlType.CHANNEL:
+            return destination_id, property_type, property_values[0]
+        return super()._coalesce_key(
+            destination_id, property_type, property_values
+        )
 
     @property
     def first_degree(self) -> float:
@@ -68,7 +92,6 @@ class Motor(OutputModule):
         :type degree_value: int
         :return: None
         """
-        _ = self.first_degree
         self.set_motor_channel(0, 2, degree_value)
 
     @property
@@ -89,7 +112,6 @@ class Motor(OutputModule):
         :type degree_value
         :return: None
         """
-        _ = self.second_degree
         self.set_motor_channel(1, 2, degree_value)
 
     @property
@@ -109,7 +131,6 @@ class Motor(OutputModule):
         :param speed_value: Angular speed to set the first motor.
         :return: None
         """
-        _ = self.first_speed
         self.set_motor_channel(0, 1, speed_value)
 
     @property
@@ -129,7 +150,6 @@ class Motor(OutputModule):
         :param speed_value: Angular speed to set the second motor.
         :return: None
         """
-        _ = self.second_speed
         self.set_motor_channel(1, 1, speed_value)
 
     @property
@@ -150,7 +170,6 @@ class Motor(OutputModule):
         :type torque_value: int
         :return: None
         """
-        _ = self.first_torque
         self.set_motor_channel(0, 0, torque_value)
 
     @property
@@ -171,7 +190,6 @@ class Motor(OutputModule):
         :type torque_value: int
         :return: None
         """
-        _ = self.second_torque
         self.set_motor_channel(1, 0, torque_value)
 
     @property
@@ -195,7 +213,6 @@ class Motor(OutputModule):
         :type torque_value: Tuple[int, int]
         :return: None
         """
-        _, _ = self.torque
         self.set_motor_channel(0, 0, torque_value[0])
         self.set_motor_channel(1, 0, torque_value[1])
 
@@ -219,7 +236,6 @@ class Motor(OutputModule):
         :type speed_value: Tuple[int, int]
         :return: None
         """
-        _, _ = self.speed
         self.set_motor_channel(0, 1, speed_value[0])
         self.set_motor_channel(1, 1, speed_value[1])
 
@@ -244,6 +260,5 @@ class Motor(OutputModule):
         :type degree_value: Tuple[int, int]
         :return: None
         """
-        _, _ = self.degree
         self.set_motor_channel(0, 2, degree_value[0])
         self.set_motor_channel(1, 2, degree_value[1])
@@ -1,15 +1,59 @@
-import time
-
 from enum import IntEnum
-from typing import Tuple, List
+from typing import Callable, Hashable, Tuple, List
 from modi.module.module import Module
-from modi.util.msgutil import parse_message, parse_data
+from modi.util.msgutil import parse_message, parse_data, set_destination
+
+
+class SetBatch:
+    """Values set to the modules of a group command, which are sent at
+    once. The messages of a value are encoded for the first module it is set
+    to, and copied to the destination of the other modules.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.__encoded = dict()
+
+    def add(self, key: Hashable, destination_id: int, signature: Hashable,
+            encode: Callable[[], List[bytes]]) -> None:
+        """Add the value of a module
+
+        :param key: Key of the value, to coalesce it
+        :type key: Hashable
+        :param destination_id: Id of the destination module
+        :type destination_id: int
+        :param signature: Property, values and data type of the value
+        :type signature: Hashable
+        :param encode: Function encoding the messages of the value
+        :type encode: Callable[[], List[bytes]]
+        :return: None
+        """
+        try:
+            encoded = self.__encoded.get(signature)
+        except TypeError:
+            encoded, signature = None, None
+        if encoded is None:
+            messages = encode()
+            if signature is not None:
+                self.__encoded[signature] = destination_id, messages
+        elif encoded[0] == destination_id:
+            messages = encoded[1]
+        else:
+            messages = [set_destination(message, destination_id)
+                        for message in encoded[1]]
+        self.values.append((key, messages))
 
 
 class OutputModule(Module):
     def __init__(self, id_, uuid, msg_send_q):
         super().__init__(id_, uuid, msg_send_q)
 
+        # Values last set to the module, by property type
+        self._commanded = dict()
+
+        # Values set in a group command, which are sent by the group at once
+        self._batch = None
+
     class PropertyDataType(IntEnum):
         INT = 0
         FLOAT = 1
@@ -73,15 +117,64 @@ class OutputModule(Module):
         :type property_data_type: IntEnum
         :return: None
         """
+        key = self._coalesce_key(
+            destination_id, property_type, property_values
+        )
+        if self._batch is not None:
+            self._batch.add(
+                key, destination_id,
+                (property_type, property_data_type, property_values),
+                lambda: self.__parse_set_message(
+                    destination_id, property_type, property_values,
+                    property_data_type
+                ),
+            )
+            return
+
         messages = self.__parse_set_message(
             destination_id,
             property_type,
             property_values,
             property_data_type)
 
-        for message in messages:
-            self._msg_send_q.put(message)
-        time.sleep(0.001)
+        # Coalesce the value with the ones written before it, when the send
+        # queue supports it
+        put_latest = getattr(self._msg_send_q, "put_latest", None)
+        if put_latest:
+            put_latest(key, messages)
+        else:
+            self._put_many(messages)
+
+    def _coalesce_key(self, destination_id: int, property_type: IntEnum,
+                      property_values: Tuple) -> Tuple:
+        """Key of the value written by a set_property command. A value
+        replaces the pending value of the same key, and commands without key
+        are all written.
+
+        :param destination_id: Id of the destination module
+        :type destination_id: int
+        :param property_type: Property Type
+        :type property_type: IntEnum
+        :param property_values: Property Values
+        :type property_values: Tuple
+        :return: Key of the value, None if it must not be coalesced
+        :rtype: Tuple
+        """
+        return destination_id, property_type
+
+    def _commanded_property(self, property_type: IntEnum) -> float:
+        """Value last set to a property, or the value last sent by the
+        module when it has not been set, without requesting it
+
+        :param property_type: Type of the property
+        :type property_type: IntEnum
+        :return: Value of the property
+        :rtype: float
+        """
+        if property_type in self._commanded:
+            return self._commanded[property_type]
+        prop = self._properties.get(property_type)
+        return prop.value if prop else 0
 
     @staticmethod
     def _validate_property(nb_values: int, value_range: Tuple = None):
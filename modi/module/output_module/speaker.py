@@ -119,13 +119,14 @@ class Speaker(OutputModule):
         :type tune_value: Tuple[int, int]
         :return: None
         """
-        _, _ = self.tune
         self._set_property(
             self._id,
             self.CommandType.SET_TUNE,
             tune_value,
             self.PropertyDataType.FLOAT,
         )
+        self._commanded[self.PropertyType.FREQUENCY] = tune_value[0]
+        self._commanded[self.PropertyType.VOLUME] = tune_value[1]
 
     @property
     def frequency(self) -> float:
@@ -140,7 +141,10 @@ class Speaker(OutputModule):
         :type frequency_value: float, optional
         :return: None
         """
-        self.tune = frequency_value, self.volume
+        self.tune = (
+            frequency_value,
+            self._commanded_property(self.PropertyType.VOLUME),
+        )
 
     @property
     def volume(self) -> float:
@@ -160,7 +164,10 @@ class Speaker(OutputModule):
         :type volume_value: float
         :return: None
         """
-        self.tune = self.frequency, volume_value
+        self.tune = (
+            self._commanded_property(self.PropertyType.FREQUENCY),
+            volume_value,
+        )
 
     def turn_off(self) -> None:
         """Turn off the sound
@@ -0,0 +1,187 @@
+import asyncio
+
+import serial
+
+from typing import Callable, Iterable, List, Union
+
+from serial.serialutil import SerialException
+
+from modi.task.conn_task import ConnTask
+from modi.util.frame_parser import FrameParser
+from modi.util.msgutil import json_to_message, message_to_json
+
+
+class AsyncSerTask:
+    """Serial connection driven by an asyncio event loop. The port is read
+    when the event loop reports it readable, and every binary message parsed
+    from a read is given to the message handler at once. Messages put to the
+    task are written to the port right away, so the task can be given to
+    modules in place of a send queue.
+    On event loops which can not watch the port, such as the proactor event
+    loop of Windows, the port is read in the default executor instead.
+    A write which can not be buffered by the port within WRITE_TIMEOUT
+    raises SerialTimeoutException instead of blocking the event loop.
+    """
+
+    # Maximum time in seconds a write may block the event loop
+    WRITE_TIMEOUT = 0.1
+
+    def __init__(self, loop: asyncio.AbstractEventLoop,
+                 handle_messages: Callable[[List[bytes]], None],
+                 verbose: bool = False, port: str = None):
+        self.__loop = loop
+        self.__handle_messages = handle_messages
+        self.__verbose = verbose
+        self.__port = port
+        self.__ser = None
+        self.__reader = None
+        self.__frame_parser = FrameParser()
+
+    @property
+    def get_serial(self) -> serial.Serial:
+        """Getter method for the serial
+
+        :return: __ser
+        """
+        return self.__ser
+
+    def set_serial(self, ser: serial.Serial) -> None:
+        """Manually sets the __ser
+
+        :param ser: Serial to set the __ser
+        :return: None
+        """
+        self.__ser = ser
+
+    def open_conn(self) -> None:
+        """ Open serial port and start reading it in the event loop
+
+        :return: None
+        """
+        if self.__ser is None:
+            self.__ser = serial.Serial(
+                self.__find_port(), baudrate=921600, timeout=0,
+                write_timeout=self.WRITE_TIMEOUT, exclusive=True
+            )
+        try:
+            self.__loop.add_reader(self.__ser.fileno(), self._recv_data)
+        except (NotImplementedError, AttributeError):
+            self.__ser.timeout = 0.1
+            self.__reader = self.__loop.create_task(self.__read_in_executor())
+
+    def __find_port(self) -> str:
+        """ Find the port of a MODI network module
+
+        :return: Name of the port
+        :rtype: str
+        """
+        modi_ports = [info.device for info in ConnTask._list_modi_ports()]
+        if not modi_ports:
+            raise SerialException("No MODI network module is connected.")
+        if not self.__port:
+            return modi_ports[0]
+        if self.__port not in modi_ports:
+            raise SerialException(f"{self.__port} is not connected "
+                                  f"to a MODI network module.")
+        return self.__port
+
+    def close_conn(self) -> None:
+        """ Stop reading and close serial port
+
+        :return: None
+        """
+        if self.__reader:
+            self.__reader.cancel()
+        else:
+            try:
+                self.__loop.remove_reader(self.__ser.fileno())
+            except (NotImplementedError, AttributeError):
+                pass
+        self.__ser.close()
+
+    def _recv_data(self) -> None:
+        """ Read the bytes waiting in the serial buffer and handle the
+        messages they complete
+
+        :return: None
+        """
+        serial_data = self.__ser.read(self.__ser.in_waiting or 1)
+        if serial_data:
+            self.__parse_serial(serial_data)
+
+    async def __read_in_executor(self) -> None:
+        """ Read the port in the default executor, for event loops which
+        can not watch it
+
+        :return: None
+        """
+        while True:
+            serial_data = await self.__loop.run_in_executor(
+                None, self.__read_blocking
+            )
+            if serial_data:
+                self.__parse_serial(serial_data)
+
+    def __read_blocking(self) -> bytes:
+        serial_data = self.__ser.read(1)
+        if serial_data and self.__ser.in_waiting:
+            serial_data += self.__ser.read(self.__ser.in_waiting)
+        return serial_data
+
+    def __parse_serial(self, serial_data: bytes) -> None:
+        """Parse json messages from the received bytes and handle them in
+        binary form, as a single batch
+
+        :param serial_data: Bytes received from the serial port
+        :type serial_data: bytes
+        :return: None
+        """
+        messages = []
+        for json_msg in self.__frame_parser.feed(serial_data):
+            if self.__verbose:
+                print(f'recv: {json_msg}')
+            try:
+                messages.append(json_to_message(json_msg))
+            except ValueError:
+                print('current json message:', json_msg)
+        if messages:
+            self.__handle_messages(messages)
+
+    def put(self, message: Union[bytes, str]) -> None:
+        """ Write a binary message, or a json serialized message as it is
+
+        :param message: Message to write
+        :type message: Union[bytes, str]
+        :raises SerialTimeoutException: If the port does not take it in time
+        :return: None
+        """
+        if isinstance(message, bytes):
+            message = message_to_json(message)
+        self.__ser.write(message.encode())
+        if self.__verbose:
+            print(f'send: {message}')
+
+    def put_many(self, messages: Iterable[Union[bytes, str]]) -> None:
+        """ Write messages with a single write
+
+        :param messages: Messages to write
+        :type messages: Iterable[Union[bytes, str]]
+        :raises SerialTimeoutException: If the port does not take them in time
+        :return: None
+        """
+        messages = [message_to_json(message)
+                    if isinstance(message, bytes) else message
+                    for message in messages]
+        if messages:
+            self.__ser.write("".join(messages).encode())
+            if self.__verbose:
+                for message in messages:
+                    print(f'send: {message}')
+
+    async def drain(self) -> None:
+        """ Wait for the written messages to leave the output buffer
+
+        :return: None
+        """
+        if self.__ser.out_waiting:
+            await self.__loop.run_in_executor(None, self.__ser.flush)
@@ -1,21 +1,23 @@
 import os
 import can
 import time
-import json
 import queue
-import base64
 
-from typing import Dict, Tuple
+from typing import Dict, Tuple, Union
 
 from modi.task.conn_task import ConnTask
+from modi.util.msgutil import pack_message, unpack_message
 
 
 class CanTask(ConnTask):
 
-    def __init__(self, can_recv_q, can_send_q, verbose, port=None):
+    def __init__(self, can_recv_q, can_send_q, verbose, port=None,
+                 recv_mode="poll"):
         print("Run Can Task.")
+        super().__init__(can_recv_q, can_send_q)
         self._can_recv_q = can_recv_q
         self._can_send_q = can_send_q
+        self.__recv_mode = recv_mode
 
         self.__can0 = None
         self.__verbose = verbose
@@ -39,10 +41,10 @@ class CanTask(ConnTask):
         :return: None
         """
         can_msg = self._recv_data()
-        json_msg = self.__parse_can_msg(can_msg)
-        self._can_recv_q.put(json_msg)
+        message = self.__parse_can_msg(can_msg)
+        self._can_recv_q.put(message)
         if self.__verbose:
-            print(f'recv: {json_msg}')
+            print(f'recv: {unpack_message(message)}')
 
     def __can_send(self) -> None:
         """Write data through CAN
@@ -50,13 +52,14 @@ class CanTask(ConnTask):
         :return: None
         """
         try:
-            message_to_send = self._can_send_q.get_nowait().encode()
+            message_to_send = self._can_send_q.get_nowait()
         except queue.Empty:
             pass
         else:
+            self._send_bucket.consume()
             self._send_data(message_to_send)
             if self.__verbose:
-                print(f'send: {message_to_send.decode("utf8")}')
+                print(f'send: {unpack_message(message_to_send)}')
 
     #
     # Can Methods
@@ -97,17 +100,15 @@ class CanTask(ConnTask):
             raise ValueError("Can message not received!")
         return can_msg
 
-    def _send_data(self, str_msg: str) -> None:
-        """ Given parsed binary string message in json format,
-            convert and send the message as CAN format
+    def _send_data(self, message: Union[bytes, str]) -> None:
+        """ Given binary message, convert and send the message as CAN format
 
-        :param str_msg: json serialized string message
-        :type str_msg: str
+        :param message: binary message, or json serialized message
+        :type message: Union[bytes, str]
         :return: None
         """
 
-        json_msg = json.loads(str_msg)
-        can_msg = self.__compose_can_msg(json_msg)
+        can_msg = self.__compose_can_msg(unpack_message(message))
         try:
             self.__can0.send(can_msg)
         except can.CanError:
@@ -116,36 +117,44 @@ class CanTask(ConnTask):
     def run_recv_data(self, delay: float) -> None:
         """Read the data and wait a given time
 
+        CAN reads already block until a message arrives, so the delay is
+        skipped in blocking receive mode.
+
         :param delay: time value to wait in seconds
         :type delay: float
         :return: None
         """
         while True:
             self.__can_recv()
-            time.sleep(delay)
+            if self.__recv_mode != "block":
+                time.sleep(delay)
 
     def run_send_data(self, delay: float) -> None:
         """Write the data and wait a given time
 
+        Queued messages are written one after another, paced by the send
+        token bucket, and the delay is applied only when the queue is empty.
+
         :param delay: time value to wait in seconds
         :type delay: float
         :return: None
         """
         while True:
             self.__can_send()
-            time.sleep(delay)
+            if self._can_send_q.empty():
+                time.sleep(delay)
 
     #
     # Can helper methods
     #
     @staticmethod
-    def __parse_can_msg(can_msg: can.Message) -> str:
-        """Parse a can message to json format
+    def __parse_can_msg(can_msg: can.Message) -> bytes:
+        """Parse a can message to binary message
 
         :param can_msg: CAN message received
         :type can_msg: can.Message
-        :return: json serialized string message
-        :rtype: str
+        :return: binary message
+        :rtype: bytes
         """
         can_id = can_msg.arbitration_id
         can_dlc = can_msg.dlc
@@ -153,12 +162,7 @@ class CanTask(ConnTask):
 
         can_id_in_bin_str = format(can_id, "029b")
         c, s, d = CanTask.__parse_can_id(can_id_in_bin_str)
-
-        json_msg = dict()
-        json_msg["c"], json_msg["s"], json_msg["d"] = c, s, d
-        json_msg["b"] = base64.b64encode(can_data).decode("utf-8")
-        json_msg["l"] = can_dlc
-        return json.dumps(json_msg, separators=(",", ":"))
+        return pack_message(c, s, d, can_data, can_dlc)
 
     @staticmethod
     def __parse_can_id(can_id: str) -> Tuple[int, int, int]:
@@ -179,27 +183,23 @@ class CanTask(ConnTask):
         return ins, sid, did
 
     @staticmethod
-    def __compose_can_msg(json_msg: Dict[str, str]) -> can.Message:
+    def __compose_can_msg(message: Dict[str, int]) -> can.Message:
         """Returns CAN message from a dictionary format message
 
-        :param json_msg: Dictionary format json message
-        :type json_msg: Dictionary
+        :param message: Dictionary format message
+        :type message: Dictionary
         :return: Composed Can message
         :rtype: can.Message
         """
-        ins = format(json_msg["c"], '05b')
-        sid = format(json_msg["s"], '012b')
-        did = format(json_msg["d"], '012b')
+        ins = format(message["c"], '05b')
+        sid = format(message["s"], '012b')
+        did = format(message["d"], '012b')
         can_id = int(ins + sid + did, 2)
 
-        data = json_msg["b"]
-        data_decoded = base64.b64decode(data)
-        data_decoded_in_bytes = bytearray(data_decoded)
-
         can_msg = can.Message(
             arbitration_id=can_id,
-            data=data_decoded_in_bytes,
-            dlc=json_msg["l"],
-            extended_id=True,
+            data=bytearray(message["b"][:message["l"]]),
+            dlc=message["l"],
+            is_extended_id=True,
         )
         return can_msg
@@ -9,12 +9,20 @@ from abc import ABC
 from abc import abstractmethod
 from typing import List
 
+from modi.util.token_bucket import TokenBucket
+
 
 class ConnTask(ABC):
 
+    # Messages written per second on average, and at once, which the
+    # network module forwards to the modules without dropping them
+    SEND_RATE = 1000
+    SEND_BURST = 16
+
     def __init__(self, recv_q, send_q):
         self._recv_q = recv_q
         self._send_q = send_q
+        self._send_bucket = TokenBucket(self.SEND_RATE, self.SEND_BURST)
 
     @staticmethod
     def _list_modi_ports() -> List[ListPortInfo]:
@@ -1,15 +1,10 @@
 import time
-import json
-import queue
-import base64
 import struct
 
-import urllib.request as ur
-
-from urllib.error import URLError
+import threading as th
 
 from enum import IntEnum
-from typing import Callable, Dict
+from typing import Callable, Dict, Optional
 
 from modi.module.input_module.button import Button
 from modi.module.input_module.dial import Dial
@@ -26,17 +21,23 @@ from modi.module.output_module.speaker import Speaker
 
 from modi.module.module import Module
 from modi.util.msgutil import unpack_data as up
+from modi.util.msgutil import pack_message, unpack_message
+from modi.util.topology_manager import TopologyManager
+from modi.util.version_cache import skeleton_version, version_to_number
 
 
 class ExeTask:
     """
     :param queue send_q: Inter-process queue for writing serial
     message.
-    :param queue recv_q: Inter-process queue for parsing json message.
+    :param queue recv_q: Inter-process queue for parsing binary message.
     :param dict() module_ids: dict() of module_id : ['timestamp', 'uuid'].
     :param list() modules: list() of module instance.
     """
 
+    # Most recent skeleton version, fetched at most once per process
+    skeleton_version = skeleton_version
+
     # variables shared across all class instances
     __module_categories = ["network", "input", "output"]
     __module_types = {
@@ -61,24 +62,49 @@ class ExeTask:
         # Check if a user has been notified when firmware is outdated
         self.firmware_update_message_flag = False
 
+        # Indexes of the modules by id and by uuid
+        self.__modules_by_id = dict()
+        self.__modules_by_uuid = dict()
+        self.__nb_indexed_modules = 0
+
+        # Topology of the modules, updated by the topology messages
+        self.topology_manager = TopologyManager(topology_data, modules)
+        # Set when the topology data or the module list is updated
+        self.topology_updated = th.Event()
+
+        # Time of the last check for disconnected modules
+        self.__health_check_time_ms = 0
+
+        # Modules connected before the latest skeleton version is known
+        self.__version_lock = th.Lock()
+        self.__latest_version = None
+        self.__unchecked_modules = []
+
         self.__init_modules()
         print('Start initializing connected MODI modules')
 
-    def run(self, delay: float):
-        """ Run in ExecutorThread
+    def run(self, timeout: float = 0.1):
+        """ Run in ExecutorThread, waiting for messages until the timeout
+        expires and handling every message received as a single batch
 
-        :param delay: time value to wait in seconds
-        :type delay: float
+        :param timeout: Maximum time to wait for messages in seconds
+        :type timeout: float
         """
-        time.sleep(delay)
+        for raw_message in self._recv_q.get_many(timeout=timeout):
+            self.handle_message(raw_message)
 
+    def handle_message(self, raw_message: bytes) -> None:
+        """ Unpack a received message and execute its command. Clients that
+        receive messages by themselves, such as AsyncMODI, call it directly
+
+        :param raw_message: Binary message received from the connection
+        :type raw_message: bytes
+        :return: None
+        """
         try:
-            raw_message = self._recv_q.get_nowait()
-            message = json.loads(raw_message)
-        except queue.Empty:
-            pass
-        except json.decoder.JSONDecodeError:
-            print('current json message:', raw_message)
+            message = unpack_message(raw_message)
+        except (ValueError, struct.error):
+            print('current message:', raw_message)
         else:
             self.__command_handler(message["c"])(message)
 
@@ -102,8 +128,7 @@ class ExeTask:
         }.get(command, lambda _: None)
 
     def __update_firmware_state(self, message):
-        byte_data = message["b"]
-        message_decoded = bytearray(base64.b64decode(byte_data))
+        message_decoded = message["b"]
 
         stream_state = message_decoded[4]
 
@@ -129,11 +154,10 @@ class ExeTask:
 
         # Setup prerequisites
         src_id = message["s"]
-        byte_data = message["b"]
         broadcast_id = 2 ** 16 - 1
         topology_by_id = {}
 
-        message_decoded = bytearray(base64.b64decode(byte_data))
+        message_decoded = message["b"]
         # print('topology_msg_dec:', message_decoded)
 
         # UUID
@@ -157,13 +181,8 @@ class ExeTask:
         topology_by_id['b'] = bottom_id if bottom_id != broadcast_id else None
 
         # Save topology data for current module
-        if not self._topology_data.get(src_id):
-            self._topology_data[src_id] = topology_by_id
-        else:
-            # If the topology data already exists, update it
-            for key in self._topology_data[src_id]:
-                if not self._topology_data[src_id][key]:
-                    self._topology_data[src_id][key] = topology_by_id[key]
+        self.topology_manager.update_topology(src_id, topology_by_id)
+        self.topology_updated.set()
 
     def __get_uuid_by_id(self, id_: int) -> int:
         """Find id of a module which has corresponding uuid
@@ -173,10 +192,48 @@ class ExeTask:
         :return: UUID
         :rtype: int
         """
-        for module in self._modules:
-            if module.id == id_:
-                return module.uuid
-        return None
+        module = self.__get_module_by_id(id_)
+        return module.uuid if module else None
+
+    def __index_modules(self) -> None:
+        """Index the modules appended to the module list since the last call
+
+        :return: None
+        """
+        nb_modules = len(self._modules)
+        if nb_modules == self.__nb_indexed_modules:
+            return
+        if nb_modules < self.__nb_indexed_modules:
+            # The module list has been replaced, index it again
+            self.__modules_by_id.clear()
+            self.__modules_by_uuid.clear()
+            self.__nb_indexed_modules = 0
+        for module in self._modules[self.__nb_indexed_modules:]:
+            self.__modules_by_id.setdefault(module.id, module)
+            self.__modules_by_uuid.setdefault(module.uuid, module)
+        self.__nb_indexed_modules = nb_modules
+
+    def __get_module_by_id(self, id_: int) -> Module:
+        """Find the module which has the given id
+
+        :param id_: ID of the module
+        :type id_: int
+        :return: The module, None if no module has the id
+        :rtype: Module
+        """
+        self.__index_modules()
+        return self.__modules_by_id.get(id_)
+
+    def __get_module_by_uuid(self, uuid: int) -> Module:
+        """Find the module which has the given uuid
+
+        :param uuid: UUID of the module
+        :type uuid: int
+        :return: The module, None if no module has the uuid
+        :rtype: Module
+        """
+        self.__index_modules()
+        return self.__modules_by_uuid.get(uuid)
 
     def __update_health(self, message: Dict[str, int]) -> None:
         """ Update information by health message
@@ -188,7 +245,7 @@ class ExeTask:
         # Record current time and uuid, timestamp, battery information
         module_id = message["s"]
         curr_time_ms = int(time.time() * 1000)
-        message_decoded = bytearray(base64.b64decode(message["b"]))
+        message_decoded = message["b"]
 
         self._module_ids[module_id] = self._module_ids.get(module_id, dict())
         self._module_ids[module_id]["timestamp"] = curr_time_ms
@@ -206,12 +263,16 @@ class ExeTask:
                 module_id, is_network_module=True)
             self._send_q.put(message_to_write)
 
-        # Disconnect modules with no health message for more than 2 seconds
+        # Disconnect modules with no health message for more than a second,
+        # checking every module at most every quarter of a second
+        if curr_time_ms - self.__health_check_time_ms < 250:
+            return
+        self.__health_check_time_ms = curr_time_ms
         for module_id, module_info in list(self._module_ids.items()):
             if curr_time_ms - module_info["timestamp"] > 1000:
-                for module in self._modules:
-                    if module.uuid == module_info["uuid"]:
-                        module.set_connection_state(connection_state=False)
+                module = self.__get_module_by_uuid(module_info["uuid"])
+                if module:
+                    module.set_connection_state(connection_state=False)
 
     def __update_warning(self, message: Dict[str, int]) -> None:
         """Update the warning message
@@ -221,7 +282,7 @@ class ExeTask:
         """
         # print('Warning message:', message)
 
-        warning_data = bytearray(base64.b64decode(message["b"]))
+        warning_data = message["b"]
         warning_type = warning_data[6]
 
         # If warning shows current module works fine, return immediately
@@ -273,32 +334,15 @@ class ExeTask:
         )
 
         # Extract uuid from message "b"
-        message_decoded = bytearray(base64.b64decode(message["b"]))
+        message_decoded = message["b"][:message["l"]]
         module_uuid_bytes = message_decoded[:4]
         module_info_bytes = message_decoded[-4:]
 
         module_info = (module_info_bytes[1] << 8) + module_info_bytes[0]
         module_version_info = module_info_bytes[3] << 8 | module_info_bytes[2]
 
-        # Retrieve most recent skeleton version from the server
-        version_path = (
-            "https://download.luxrobo.com/modi-skeleton-mobile/version.txt"
-        )
-        version_info = None
-        try:
-            for line in ur.urlopen(version_path, timeout=1):
-                version_info = line.decode('utf-8').lstrip('v')
-            version_digits = [int(digit) for digit in version_info.split('.')]
-            """ Version number is formed by concatenating all three version bits
-                e.g. v2.2.4 -> 010 00010 00000100 -> 0100 0010 0000 0100
-            """
-            latest_version = (
-                version_digits[0] << 13
-                | version_digits[1] << 8
-                | version_digits[2]
-            )
-        except URLError:
-            latest_version = module_version_info
+        # Most recent skeleton version, None until it is fetched
+        latest_version = self.__get_latest_version()
 
         module_category_idx = module_info >> 13
         module_type_idx = (module_info >> 4) & 0x1FF
@@ -317,32 +361,25 @@ class ExeTask:
 
         module_uuid = up(message['b'], (6, 2))[0]
 
-        if module_category != 'network' and \
-                not self.firmware_update_message_flag and \
-                module_version_info < latest_version:
-
-            print("Your MODI module(s) is not up-to-date.")
-            print("You can update your MODI modules by calling "
-                  "'update_module_firmware()'")
-            self.firmware_update_message_flag = True
+        if module_category != 'network' and latest_version is not None:
+            self.__notify_outdated(module_version_info, latest_version)
 
         self._module_ids[module_id]["uuid"] = module_uuid
 
         # Handle re-connected modules
-        for module in self._modules:
-            if module.uuid == module_uuid and not module.is_connected:
-                module.set_connection_state(connection_state=True)
-                # When reconnected, turn-off module pnp state
-                pnp_off_message = self.__set_module_state(
-                    0xFFF, Module.State.RUN, Module.State.PNP_OFF
-                )
-                self._send_q.put(pnp_off_message)
+        module = self.__get_module_by_uuid(module_uuid)
+        if module and not module.is_connected:
+            module.set_connection_state(connection_state=True)
+            # When reconnected, turn-off module pnp state
+            pnp_off_message = self.__set_module_state(
+                0xFFF, Module.State.RUN, Module.State.PNP_OFF
+            )
+            self._send_q.put(pnp_off_message)
+            # The module stopped sending the subscribed properties
+            module.resubscribe()
 
         # Handle newly-connected modules
-        if not next(
-            (module for module in self._modules if module.uuid == module_uuid),
-            None
-        ):
+        if not module:
             if module_category != "network":
                 module_template = self.__init_module(module_type)
                 module_instance = module_template(
@@ -353,15 +390,85 @@ class ExeTask:
                     module_pnp_state=Module.State.PNP_OFF
                 )
                 module_instance.version = module_version_info
-                module_instance.is_up_to_date = \
-                    (module_version_info == latest_version)
-                self._modules.append(module_instance)
+                self.__check_module_version(
+                    module_instance, module_version_info
+                )
+                with Module.registration:
+                    self._modules.append(module_instance)
+                    Module.registration.notify_all()
+                self.topology_manager.update_uuid(module_id, module_uuid)
+                self.topology_updated.set()
                 print(f"{type(module_instance).__name__} ({module_id}) "
                       f"has been connected!")
 
                 if self.__is_all_connected():
                     self._init_event.set()
 
+    def __get_latest_version(self) -> Optional[int]:
+        """ Get the most recent skeleton version without waiting for it
+
+        :return: Version number, None if it is not fetched yet
+        :rtype: Optional[int]
+        """
+        if self.__latest_version is None:
+            version = self.skeleton_version.get(self.__update_latest_version)
+            if version is not None:
+                self.__update_latest_version(version)
+        return self.__latest_version
+
+    def __update_latest_version(self, version: str) -> None:
+        """ Record the most recent skeleton version and check the versions of
+        the modules connected before it was known
+
+        :param version: Most recent skeleton version
+        :type version: str
+        :return: None
+        """
+        with self.__version_lock:
+            if self.__latest_version is not None:
+                return
+            self.__latest_version = version_to_number(version)
+            unchecked_modules = self.__unchecked_modules
+            self.__unchecked_modules = []
+        for module, module_version in unchecked_modules:
+            self.__check_module_version(module, module_version)
+            self.__notify_outdated(module_version, self.__latest_version)
+
+    def __check_module_version(self, module: Module,
+                               module_version: int) -> None:
+        """ Record whether the module is up to date, or check it once the
+        most recent skeleton version is known
+
+        :param module: Module to check
+        :type module: Module
+        :param module_version: Version number of the module
+        :type module_version: int
+        :return: None
+        """
+        with self.__version_lock:
+            if self.__latest_version is None:
+                self.__unchecked_modules.append((module, module_version))
+                return
+        module.is_up_to_date = (module_version == self.__latest_version)
+
+    def __notify_outdated(self, module_version: int,
+                          latest_version: int) -> None:
+        """ Notify the user once that the module firmware is outdated
+
+        :param module_version: Version number of the module
+        :type module_version: int
+        :param latest_version: Most recent version number
+        :type latest_version: int
+        :return: None
+        """
+        if not self.firmware_update_message_flag and \
+                module_version < latest_version:
+
+            print("Your MODI module(s) is not up-to-date.")
+            print("You can update your MODI modules by calling "
+                  "'update_module_firmware()'")
+            self.firmware_update_message_flag = True
+
     def __is_all_connected(self) -> bool:
         """ Determine whether all modules are connected
 
@@ -408,15 +515,14 @@ class ExeTask:
             return
 
         # Decode message of module id and module property for update property
-        for module in self._modules:
-            if module.id == message["s"]:
-                message_decoded = bytearray(base64.b64decode(message["b"]))
-                property_type = module.PropertyType(property_number)
-                module.update_property(
-                    property_type,
-                    round(struct.unpack("f", bytes(
-                        message_decoded[:4]))[0], 2),
-                )
+        module = self.__get_module_by_id(message["s"])
+        if module:
+            message_decoded = message["b"]
+            property_type = module.PropertyType(property_number)
+            module.update_property(
+                property_type,
+                round(struct.unpack("f", message_decoded[:4])[0], 2),
+            )
 
     def __set_pnp(self, module_id: int, module_pnp_state: IntEnum) -> None:
         """ Generate module pnp on/off command
@@ -461,7 +567,7 @@ class ExeTask:
         return (module_info << sizeof_module_uuid) | module_uuid
 
     def __set_module_state(self, destination_id: int, module_state: IntEnum,
-                           pnp_state: IntEnum) -> str:
+                           pnp_state: IntEnum) -> bytes:
         """ Generate message for set module state and pnp state
 
         :param destination_id: Id to target destination
@@ -470,24 +576,15 @@ class ExeTask:
         :type module_state: int
         :param pnp_state: Pnp state value
         :type pnp_state: IntEnum
-        :return: json serialized message
-        :rtype: str
+        :return: binary message
+        :rtype: bytes
         """
 
-        message = dict()
-
-        message["c"] = 0x09
-        message["s"] = 0
-        message["d"] = destination_id
-
         state_bytes = bytearray(2)
         state_bytes[0] = module_state
         state_bytes[1] = pnp_state
 
-        message["b"] = base64.b64encode(bytes(state_bytes)).decode("utf-8")
-        message["l"] = 2
-
-        return json.dumps(message, separators=(",", ":"))
+        return pack_message(0x09, 0, destination_id, state_bytes)
 
     def __init_modules(self) -> None:
         """ Initialize module on first run
@@ -529,50 +626,34 @@ class ExeTask:
         time.sleep(0.5)
 
     def __request_uuid(self, source_id: int,
-                       is_network_module: bool = False) -> str:
+                       is_network_module: bool = False) -> bytes:
         """ Generate broadcasting message for request uuid
 
         :param source_id: Id of the source
         :type source_id: int
         :param is_network_module: true if network module
         :type is_network_module: bool
-        :return: json serialized message
-        :rtype: str
+        :return: binary message
+        :rtype: bytes
         """
 
         BROADCAST_ID = 0xFFF
 
-        message = dict()
-        message["c"] = 0x28 if is_network_module else 0x08
-        message["s"] = source_id
-        message["d"] = BROADCAST_ID
-
         id_bytes = bytearray(8)
         id_bytes[0] = 0xFF
         id_bytes[1] = 0x0F
 
-        message["b"] = base64.b64encode(bytes(id_bytes)).decode("utf-8")
-        message["l"] = 8
-
-        return json.dumps(message, separators=(",", ":"))
+        return pack_message(0x28 if is_network_module else 0x08,
+                            source_id, BROADCAST_ID, id_bytes)
 
     def request_topology(self, cmd: int = 0x07,
                          module_id: int = 0xFFF) -> None:
         """Request module topology
 
-        :return: json serialized topology request message
-        :rtype: str
+        :return: None
         """
-        message = dict()
-        message["c"] = cmd
-        message["s"] = 0
-        message["d"] = module_id
-
         direction_data = bytearray(8)
-        message["b"] = base64.b64encode(bytes(direction_data)).decode("utf-8")
-        message["l"] = 8
-
-        self._send_q.put(json.dumps(message, separators=(",", ":")))
+        self._send_q.put(pack_message(cmd, 0, module_id, direction_data))
 
     def update_firmware(self) -> None:
         """ Remove firmware of MODI modules
@@ -8,19 +8,23 @@ import traceback
 from serial.serialutil import SerialException
 
 from modi.task.conn_task import ConnTask
+from modi.util.frame_parser import FrameParser
+from modi.util.msgutil import json_to_message, message_to_json
 
 
 class SerTask(ConnTask):
 
-    def __init__(self, ser_recv_q, ser_send_q, verbose, port=None):
+    def __init__(self, ser_recv_q, ser_send_q, verbose, port=None,
+                 recv_mode="poll"):
         print("Run Ser Task.")
         super().__init__(ser_recv_q, ser_send_q)
         self._ser_recv_q = ser_recv_q
         self._ser_send_q = ser_send_q
         self.__verbose = verbose
         self.__ser = None
-        self.__json_buffer = ""
+        self.__frame_parser = FrameParser()
         self.__port = port
+        self.__recv_mode = recv_mode
         if self.__verbose:
             print('PyMODI log...\n==================================')
 
@@ -94,15 +98,40 @@ class SerTask(ConnTask):
         :return: None
         """
 
+        if self.__recv_mode == "block":
+            serial_data = self.__read_blocking()
+        else:
+            serial_data = self.__read_polling()
+
+        if serial_data:
+            # Parse json messages out of the serial data and send them
+            self.__parse_serial(serial_data)
+
+    def __read_polling(self) -> bytes:
+        """ Flush the serial buffer without waiting for incoming bytes
+
+        :return: Bytes currently waiting in the serial buffer
+        :rtype: bytes
+        """
         serial_buffer = self.__ser.in_waiting
-        if serial_buffer:
-            # Flush the serial buffer and concatenate it to json buffer
-            self.__json_buffer += self.__ser.read(
-                serial_buffer
-            ).decode("utf-8")
+        if not serial_buffer:
+            return bytes()
+        return self.__ser.read(serial_buffer)
+
+    def __read_blocking(self) -> bytes:
+        """ Block on the serial port until a byte arrives or the port timeout
+        expires, then flush the rest of the serial buffer
 
-            # Once json buffer is obtained, we parse and send json message
-            self.__parse_serial()
+        :return: Bytes received from the serial port
+        :rtype: bytes
+        """
+        serial_data = self.__ser.read(1)
+        if not serial_data:
+            return serial_data
+        serial_buffer = self.__ser.in_waiting
+        if serial_buffer:
+            serial_data += self.__ser.read(serial_buffer)
+        return serial_data
 
     def _send_data(self) -> None:
         """ Write serial message in serial write queue
@@ -110,10 +139,16 @@ class SerTask(ConnTask):
         :return: None
         """
         try:
-            message_to_send = self._ser_send_q.get_nowait().encode()
+            message_to_send = self._ser_send_q.get_nowait()
         except queue.Empty:
             pass
         else:
+            # Binary messages are serialized to json on the wire, json
+            # messages given by the user are written as they are
+            if isinstance(message_to_send, bytes):
+                message_to_send = message_to_json(message_to_send)
+            message_to_send = message_to_send.encode()
+            self._send_bucket.consume()
             self.__ser.write(message_to_send)
             if self.__verbose:
                 print(f'send: {message_to_send.decode("utf8")}')
@@ -121,6 +156,9 @@ class SerTask(ConnTask):
     def run_recv_data(self, delay: float) -> None:
         """Read data through serial port
 
+        In blocking receive mode, the read itself waits for incoming bytes,
+        so the delay is not applied.
+
         :param delay: time value to wait in seconds
         :type delay: float
         :return: None
@@ -132,11 +170,15 @@ class SerTask(ConnTask):
                 print("\nMODI connection is lost!!!")
                 traceback.print_exc()
                 os._exit(1)
-            time.sleep(delay)
+            if self.__recv_mode != "block":
+                time.sleep(delay)
 
     def run_send_data(self, delay: float) -> None:
         """Write data through serial port
 
+        Queued messages are written one after another, paced by the send
+        token bucket, and the delay is applied only when the queue is empty.
+
         :param delay: time value to wait in seconds
         :type delay: float
         :return: None
@@ -148,24 +190,26 @@ class SerTask(ConnTask):
                 print("\nMODI connection is lost!!!")
                 traceback.print_exc()
                 os._exit(1)
-            time.sleep(delay)
+            if self._ser_send_q.empty():
+                time.sleep(delay)
 
     #
     # Helper method
     #
-    def __parse_serial(self) -> None:
-        """Update the json buffer
+    def __parse_serial(self, serial_data: bytes) -> None:
+        """Parse json messages from the received bytes and send them in
+        binary form, as a single batch
 
+        :param serial_data: Bytes received from the serial port
+        :type serial_data: bytes
         :return: None
         """
-        # While there is a valid json in the json buffer
-        while "{" in self.__json_buffer and "}" in self.__json_buffer:
-            split_index = self.__json_buffer.find("}") + 1
-
-            # Parse json message and send it
-            json_msg = self.__json_buffer[:split_index]
-            self._ser_recv_q.put(json_msg)
+        messages = []
+        for json_msg in self.__frame_parser.feed(serial_data):
             if self.__verbose:
                 print(f'recv: {json_msg}')
-            # Update json buffer, remove the json message sent
-            self.__json_buffer = self.__json_buffer[split_index:]
+            try:
+                messages.append(json_to_message(json_msg))
+            except ValueError:
+                print('current json message:', json_msg)
+        self._ser_recv_q.put_many(messages)
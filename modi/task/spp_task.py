@@ -8,10 +8,19 @@ from serial import SerialException
 from serial.tools.list_ports_common import ListPortInfo
 
 from modi.task.conn_task import ConnTask
+from modi.util.frame_parser import FrameParser
+from modi.util.msgutil import json_to_message, message_to_json
 
 
 class SppTask(ConnTask):
 
+    # Bluetooth connections handle fewer messages than the serial port
+    SEND_RATE = 20
+    SEND_BURST = 4
+
+    # Maximum time to wait for the opened port to receive bytes in seconds
+    READY_TIMEOUT = 1
+
     def __init__(self, spp_recv_q, spp_send_q, module_uuid, verbose,
                  port=None):
         print("Run Spp Task.")
@@ -25,7 +34,7 @@ class SppTask(ConnTask):
             print('PyMODI log...\n==================================')
 
         self.__ser = None
-        self.__json_buffer = ""
+        self.__frame_parser = FrameParser()
 
     @property
     def get_serial(self) -> serial.Serial:
@@ -93,7 +102,17 @@ class SppTask(ConnTask):
                 "The MODI port {} is already in use".format(self.__ser.port)
             )
         self.__ser.open()
-        time.sleep(1)
+        self.__wait_ready()
+
+    def __wait_ready(self) -> None:
+        """ Wait until the network module sends bytes through the opened
+        port, for READY_TIMEOUT seconds at most
+
+        :return: None
+        """
+        deadline = time.perf_counter() + self.READY_TIMEOUT
+        while not self.__ser.in_waiting and time.perf_counter() < deadline:
+            time.sleep(0.01)
 
     def _close_conn(self) -> None:
         """ Close serial port
@@ -111,13 +130,8 @@ class SppTask(ConnTask):
 
         serial_buffer = self.__ser.in_waiting
         if serial_buffer:
-            # Flush the serial buffer and concatenate it to json buffer
-            self.__json_buffer += self.__ser.read(
-                serial_buffer
-            ).decode("utf-8")
-
-            # Once json buffer is obtained, we parse and send json message
-            self.__parse_serial()
+            # Flush the serial buffer, parse json messages and send them
+            self.__parse_serial(self.__ser.read(serial_buffer))
 
     def _send_data(self) -> None:
         """ Write serial message in serial write queue
@@ -126,10 +140,16 @@ class SppTask(ConnTask):
         """
 
         try:
-            message_to_send = self._spp_send_q.get_nowait().encode()
+            message_to_send = self._spp_send_q.get_nowait()
         except queue.Empty:
             pass
         else:
+            # Binary messages are serialized to json on the wire, json
+            # messages given by the user are written as they are
+            if isinstance(message_to_send, bytes):
+                message_to_send = message_to_json(message_to_send)
+            message_to_send = message_to_send.encode()
+            self._send_bucket.consume()
             self.__ser.write(message_to_send)
             if self.__verbose:
                 print(f'send: {message_to_send.decode("utf8")}')
@@ -148,31 +168,35 @@ class SppTask(ConnTask):
     def run_send_data(self, delay: float) -> None:
         """Write data through spp
 
+        Queued messages are written one after another, paced by the send
+        token bucket, and the delay is applied only when the queue is empty.
+
         :param delay: time value to wait in seconds
         :type delay: float
         :return: None
         """
         while True:
             self._send_data()
-            time.sleep(delay)
+            if self._spp_send_q.empty():
+                time.sleep(delay)
 
     #
     # Helper method
     #
-    def __parse_serial(self) -> None:
-        """Update the json buffer
+    def __parse_serial(self, serial_data: bytes) -> None:
+        """Parse json messages from the received bytes and send them in
+        binary form, as a single batch
 
+        :param serial_data: Bytes received from the serial port
+        :type serial_data: bytes
         :return: None
         """
-        # While there is a valid json in the json buffer
-        while "{" in self.__json_buffer and "}" in self.__json_buffer:
-            split_index = self.__json_buffer.find("}") + 1
-
-            # Parse json message and send it
-            json_msg = self.__json_buffer[:split_index]
-            self._spp_recv_q.put(json_msg)
+        messages = []
+        for json_msg in self.__frame_parser.feed(serial_data):
             if self.__verbose:
                 print(f'recv: {json_msg}')
-
-            # Update json buffer, remove the json message sent
-            self.__json_buffer = self.__json_buffer[split_index:]
+            try:
+                messages.append(json_to_message(json_msg))
+            except ValueError:
+                print('current json message:', json_msg)
+        self._spp_recv_q.put_many(messages)
@@ -1,18 +1,15 @@
 import io
 import sys
 import time
-import json
-import base64
-import zipfile
-import requests
 
 import threading as th
-import urllib.request as ur
 
 from urllib.error import URLError
 from enum import IntEnum
 
 from modi.module.module import Module
+from modi.util.msgutil import pack_message
+from modi.util.version_cache import skeleton_version, version_to_number
 
 
 class FirmwareUpdater:
@@ -193,6 +190,10 @@ class FirmwareUpdater:
             "skeleton/environment.bin"
         )
 
+        # Imported here, as they are only needed to update firmware
+        import zipfile
+        import requests
+
         try:
             # Init bytes data from the given binary file of the current module
             download_response = requests.get(root_path)
@@ -253,21 +254,11 @@ class FirmwareUpdater:
                 page_begin -= page_size
 
         # Include MODI firmware version when writing end flash
-        version_path = (
-            "https://download.luxrobo.com/modi-skeleton-mobile/version.txt"
-        )
-        version_info = None
-        for line in ur.urlopen(version_path):
-            version_info = line.decode('utf-8').lstrip('v')
-        version_digits = [int(digit) for digit in version_info.split('.')]
-        """ Version number is formed by concatenating all three version bits
-            e.g. 2.2.4 -> 010 00010 00000100 -> 0100 0010 0000 0100
-        """
-        version = (
-            version_digits[0] << 13
-            | version_digits[1] << 8
-            | version_digits[2]
-        )
+        version_info = skeleton_version.wait()
+        if version_info is None:
+            raise URLError("Failed to fetch firmware version. "
+                           "Check your internet")
+        version = version_to_number(version_info)
 
         # Set end-flash data to be sent at the end of the firmware update
         end_flash_data = bytearray(8)
@@ -297,7 +288,7 @@ class FirmwareUpdater:
             self.update_event.set()
 
     def __set_module_state(self, destination_id: int, module_state: IntEnum,
-                           pnp_state: IntEnum) -> str:
+                           pnp_state: IntEnum) -> bytes:
         """ Generate message for set module state and pnp state
 
         :param destination_id: Id of the destination module
@@ -306,23 +297,14 @@ class FirmwareUpdater:
         :type module_state: IntEnum
         :param pnp_state: Pnp state of the module
         :type pnp_state: IntEnum
-        :return: Json serialized message
-        :rtype: str
+        :return: Binary message
+        :rtype: bytes
         """
-        message = dict()
-
-        message["c"] = 0x09
-        message["s"] = 0
-        message["d"] = destination_id
-
         state_bytes = bytearray(2)
         state_bytes[0] = module_state
         state_bytes[1] = pnp_state
 
-        message["b"] = base64.b64encode(bytes(state_bytes)).decode("utf-8")
-        message["l"] = 2
-
-        return json.dumps(message, separators=(",", ":"))
+        return pack_message(0x09, 0, destination_id, state_bytes)
 
     # TODO: Use retry decorator here
     def send_end_flash_data(self, module_type: str, module_id: int,
@@ -367,8 +349,9 @@ class FirmwareUpdater:
         # print(f"End flash is written for {module_type} ({module_id})")
 
     def get_firmware_command(self, module_id: int, rot_stype: int,
-                             rot_scmd: int, crc32: int, page_addr: int) -> str:
-        """Create a new firmware command in json format
+                             rot_scmd: int, crc32: int,
+                             page_addr: int) -> bytes:
+        """Create a new firmware command message
 
         :param module_id: Id of the module
         :type module_id: int
@@ -380,19 +363,15 @@ class FirmwareUpdater:
         :type crc32: int
         :param page_addr: Page address
         :type page_addr: int
-        :return: Json serialized message
-        :rtype: str
+        :return: Binary message
+        :rtype: bytes
         """
-        message = dict()
-        message["c"] = 0x0D
-
         """ SID is 12-bits length in MODI CAN.
             To fully utilize its capacity, we split 12-bits into 4 and 8 bits.
             First 4 bits include rot_scmd information.
             And the remaining bits represent rot_stype.
         """
-        message["s"] = (rot_scmd << 8) | rot_stype
-        message["d"] = module_id
+        source = (rot_scmd << 8) | rot_stype
 
         """ The firmware command data to be sent is 8-bytes length.
             Where the first 4 bytes consist of CRC-32 information.
@@ -404,15 +383,12 @@ class FirmwareUpdater:
             crc32 >>= 8
             crc32_and_page_addr_data[4 + i] = page_addr & 0xFF
             page_addr >>= 8
-        message["b"] = base64.b64encode(
-            bytes(crc32_and_page_addr_data)
-        ).decode("utf-8")
-        message["l"] = 8
 
-        return json.dumps(message, separators=(",", ":"))
+        return pack_message(0x0D, source, module_id,
+                            crc32_and_page_addr_data, 8)
 
     def get_firmware_data(self, module_id: int, seq_num: int,
-                          bin_data: bytes) -> str:
+                          bin_data: bytes) -> bytes:
         """ A data to be sent when updating firmware of a module
 
         :param module_id: Id of the module
@@ -421,19 +397,10 @@ class FirmwareUpdater:
         :type seq_num: int
         :param bin_data: Data to be sent
         :type bin_data: bytes
-        :return: Json serialized message
-        :rtype: str
+        :return: Binary message
+        :rtype: bytes
         """
-
-        message = dict()
-        message["c"] = 0x0B
-        message["s"] = seq_num
-        message["d"] = module_id
-
-        message["b"] = base64.b64encode(bytes(bin_data)).decode("utf-8")
-        message["l"] = 8
-
-        return json.dumps(message, separators=(",", ":"))
+        return pack_message(0x0B, seq_num, module_id, bin_data, 8)
 
     def calc_crc32(self, data: bytes, crc: int) -> int:
         """Checksum calculation
@@ -0,0 +1,88 @@
+from typing import List
+
+
+class FrameParser:
+    """Frame parser splits the byte stream of a serial connection into
+    json messages. Received bytes are accumulated in a bytearray, complete
+    frames of a burst are decoded and split at once and only the beginning
+    of an incomplete frame is kept for the next read.
+    """
+
+    # Longest frame expected from a network module, used to resynchronise
+    # when the closing brace of a frame is lost
+    MAX_FRAME_SIZE = 256
+
+    def __init__(self):
+        self.__buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[str]:
+        """Append received bytes and return the completed json messages
+
+        :param data: Bytes received from the connection
+        :type data: bytes
+        :return: Json serialized messages completed by the given bytes
+        :rtype: List[str]
+        """
+        buffer = self.__buffer
+        buffer += data
+
+        # Every frame ends with a closing brace, bytes after the last one
+        # belong to an incomplete frame
+        end = buffer.rfind(b"}")
+        if end < 0:
+            self.__resynchronise(0)
+            return []
+
+        try:
+            parts = buffer[:end].decode("utf-8").split("}")
+        except UnicodeDecodeError:
+            parts = self.__decode_parts(buffer[:end])
+        self.__resynchronise(end + 1)
+
+        messages = []
+        for part in parts:
+            # Bytes before the last opening brace are garbage or a broken
+            # frame, so each frame is resynchronised on its latest beginning
+            begin = part.rfind("{")
+            if begin >= 0:
+                messages.append(part[begin:] + "}")
+        return messages
+
+    def __resynchronise(self, offset: int) -> None:
+        """Drop consumed bytes, keeping only the beginning of the next frame
+
+        :param offset: Index of the first byte which is not consumed yet
+        :type offset: int
+        :return: None
+        """
+        buffer = self.__buffer
+        begin = buffer.rfind(b"{", offset)
+        if begin < 0 or len(buffer) - begin > self.MAX_FRAME_SIZE:
+            # No frame has begun or the frame never got closed
+            buffer.clear()
+        else:
+            del buffer[:begin]
+
+    @staticmethod
+    def __decode_parts(data: bytes) -> List[str]:
+        """Decode frames one by one, skipping the ones with invalid bytes
+
+        :param data: Bytes of complete frames without the last closing brace
+        :type data: bytes
+        :return: Decoded frames split by closing braces
+        :rtype: List[str]
+        """
+        parts = []
+        for part in data.split(b"}"):
+            try:
+                parts.append(part.decode("utf-8"))
+            except UnicodeDecodeError:
+                continue
+        return parts
+
+    def clear(self) -> None:
+        """Discard the bytes of an incomplete frame
+
+        :return: None
+        """
+        self.__buffer.clear()
@@ -1,13 +1,46 @@
-import time
+from modi.module.module import Module
+from modi.module.output_module.output_module import OutputModule, SetBatch
 
 
 class module_list(list):
+    """List of the connected modules of a type, sorted as described in
+    __getitem__. The list is kept sorted as modules connect and move, but is
+    only sorted again when the modules or their positions have changed, and
+    modules are found by id without going through the list.
+    The bundle keeps the list between accesses, so it is read-only: the
+    modules are copied with sublist to change them.
+    """
 
     def __init__(self, src, module_type, lazy=True):
         self.__src = src
         self.__module_type = module_type
         self.__lazy = lazy
-        super().__init__(self.sublist())
+        self.__key = None
+        self.__indices = dict()
+        super().__init__()
+        self.refresh()
+
+    @property
+    def src(self):
+        return self.__src
+
+    def refresh(self) -> None:
+        """ Update the list when modules have connected or moved since it
+        was last sorted
+
+        :return: None
+        """
+        key = (len(self.__src), Module.layout_version)
+        if key == self.__key:
+            return
+        modules = [module for module in self.__src
+                   if module.type == self.__module_type]
+        modules.sort()
+        super().__setitem__(slice(None), modules)
+        self.__indices = {
+            module.id: idx for idx, module in enumerate(modules)
+        }
+        self.__key = key
 
     def __getitem__(self, item):
         """ When accessing the module, the modules are sorted in an
@@ -19,25 +52,114 @@ class module_list(list):
         :param item: Index of the module
         :return: Module
         """
-        if self.__lazy:
-            while not len(self.sublist()) > item:
-                time.sleep(0.1)
-        return self.sublist()[item]
+        if self.__lazy and isinstance(item, int):
+            return self.wait_for(item)
+        self.refresh()
+        return super().__getitem__(item)
+
+    def wait_for(self, item: int, timeout: float = None):
+        """ Returns the module at an index, waiting for it to connect
+        Example:
+        >>> led = bundle.leds.wait_for(0, timeout=5)
+
+        :param item: Index of the module
+        :type item: int
+        :param timeout: Maximum time to wait in seconds
+        :type timeout: float, optional
+        :raises TimeoutError: If the module does not connect in time
+        :return: Module
+        """
+        def is_connected():
+            self.refresh()
+            return len(self) > item
+
+        if not is_connected():
+            with Module.registration:
+                if not Module.registration.wait_for(is_connected, timeout):
+                    raise TimeoutError(f"{self.__module_type} module "
+                                       f"{item} is not connected")
+        return super().__getitem__(item)
 
     def get(self, module_id):
-        for module in self.sublist():
-            if module.id == module_id:
-                return module
-        raise Exception("Module with given id does not exits!!")
+        self.refresh()
+        idx = self.__indices.get(module_id)
+        if idx is None:
+            raise Exception("Module with given id does not exits!!")
+        return super().__getitem__(idx)
 
     def sublist(self):
-        modules = [module for module in self.__src
-                   if module.type == self.__module_type]
-        modules.sort()
-        return modules
+        self.refresh()
+        return list(self)
+
+    def set(self, **properties) -> None:
+        """ Set properties of every module in the list, sending the messages
+        of all the modules at once
+        Example:
+        >>> bundle.leds.set(rgb=(0, 0, 0))
+        >>> bundle.motors.set(speed=(0, 0))
+
+        :param properties: Values of the properties, by setter name
+        :raises AttributeError: If a name is not a setter of the modules
+        :return: None
+        """
+        # Asyncio bundles list views of the modules
+        modules = [getattr(module, "module", module)
+                   for module in self.sublist()]
+        if not modules:
+            return
+        for module_type in {type(module) for module in modules}:
+            for name in properties:
+                self.__check_setter(module_type, name)
+
+        # When a value is invalid, nothing is sent, so the values commanded
+        # before are restored
+        commanded = [dict(module._commanded) for module in modules]
+        batch = SetBatch()
+        try:
+            for module in modules:
+                module._batch = batch
+                try:
+                    for name, value in properties.items():
+                        setattr(module, name, value)
+                finally:
+                    module._batch = None
+        except Exception:
+            for module, values in zip(modules, commanded):
+                module._commanded = values
+            raise
+
+        send_q = modules[0]._msg_send_q
+        put_latest_many = getattr(send_q, "put_latest_many", None)
+        if put_latest_many:
+            put_latest_many(batch.values)
+        else:
+            modules[0]._put_many([message for _, messages in batch.values
+                                  for message in messages])
+
+    @staticmethod
+    def __check_setter(module_type: type, name: str) -> None:
+        """ Check that a name is a property setter of an output module
+
+        :param module_type: Class of the modules
+        :type module_type: type
+        :param name: Name of the property
+        :type name: str
+        :raises AttributeError: If the modules have no such setter
+        :return: None
+        """
+        setter = getattr(module_type, name, None)
+        if not issubclass(module_type, OutputModule) or hasattr(Module, name) \
+                or not isinstance(setter, property) or setter.fset is None:
+            raise AttributeError(f"{module_type.__name__} modules have no "
+                                 f"property '{name}' to set")
 
     def find(self, module_id):
-        for idx, module in enumerate(self.sublist()):
-            if module_id == module.id:
-                return idx
-        return -1
+        self.refresh()
+        return self.__indices.get(module_id, -1)
+
+    def __read_only(self, *args, **kwargs):
+        raise TypeError("module_list is read-only, use sublist() to get a "
+                        "list of the modules to change")
+
+    append = extend = insert = pop = remove = clear = sort = reverse = \
+        __setitem__ = __delitem__ = __iadd__ = __imul__ = __read_only
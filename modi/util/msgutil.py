@@ -2,19 +2,109 @@ import json
 import struct
 
 from base64 import b64encode, b64decode
-from typing import Tuple
+from typing import Dict, Tuple, Union
+
+# Messages are passed between processes in a compact binary form holding
+# command, source, destination, data length and eight data bytes. They are
+# converted to json only when written to or read from the serial port.
+MESSAGE_STRUCT = struct.Struct("<BhhB8s")
+DESTINATION_STRUCT = struct.Struct("<h")
+DESTINATION_OFFSET = 3
 
 
 def parse_message(command: int, source: int, destination: int,
                   byte_data: Tuple = (None, None, None, None,
-                                      None, None, None, None)):
-    message = dict()
-    message['c'] = command
-    message['s'] = source
-    message['d'] = destination
-    message['b'] = __encode_bytes(byte_data)
-    message['l'] = len(byte_data)
-    return json.dumps(message, separators=(",", ":"))
+                                      None, None, None, None)) -> bytes:
+    return pack_message(command, source, destination,
+                        __encode_bytes(byte_data), len(byte_data))
+
+
+def pack_message(command: int, source: int, destination: int,
+                 data: bytes, length: int = None) -> bytes:
+    """Pack a message into its binary form
+
+    :param command: Command code of the message
+    :type command: int
+    :param source: Source id
+    :type source: int
+    :param destination: Destination id
+    :type destination: int
+    :param data: Data bytes of the message, up to 8 bytes
+    :type data: bytes
+    :param length: Data length, defaults to the length of data
+    :type length: int, optional
+    :return: Binary message
+    :rtype: bytes
+    """
+    if length is None:
+        length = len(data)
+    return MESSAGE_STRUCT.pack(command, source, destination, length,
+                               bytes(data))
+
+
+def set_destination(message: bytes, destination: int) -> bytes:
+    """Copy a binary message to another destination
+
+    :param message: Binary message
+    :type message: bytes
+    :param destination: Destination id of the copy
+    :type destination: int
+    :return: Binary message addressed to the destination
+    :rtype: bytes
+    """
+    message = bytearray(message)
+    DESTINATION_STRUCT.pack_into(message, DESTINATION_OFFSET, destination)
+    return bytes(message)
+
+
+def unpack_message(message: Union[bytes, str]) -> Dict:
+    """Unpack a binary message into a dictionary of its fields, where the
+    data field "b" holds the raw (zero padded) data bytes
+
+    :param message: Binary message, or json serialized message
+    :type message: Union[bytes, str]
+    :return: Dictionary format message
+    :rtype: Dict
+    """
+    if isinstance(message, str):
+        message = json_to_message(message)
+    command, source, destination, length, data = \
+        MESSAGE_STRUCT.unpack(message)
+    return {"c": command, "s": source, "d": destination, "b": data,
+            "l": length}
+
+
+def message_to_json(message: bytes) -> str:
+    """Serialize a binary message into the json format of the serial wire
+
+    :param message: Binary message
+    :type message: bytes
+    :return: Json serialized message
+    :rtype: str
+    """
+    command, source, destination, length, data = \
+        MESSAGE_STRUCT.unpack(message)
+    return json.dumps({
+        "c": command, "s": source, "d": destination,
+        "b": b64encode(data[:length]).decode("utf8"), "l": length,
+    }, separators=(",", ":"))
+
+
+def json_to_message(json_msg: str) -> bytes:
+    """Convert a json serialized message of the serial wire to binary form
+
+    :param json_msg: Json serialized message
+    :type json_msg: str
+    :raises ValueError: If the message is not a valid MODI message
+    :return: Binary message
+    :rtype: bytes
+    """
+    try:
+        message = json.loads(json_msg)
+        return pack_message(message["c"], message["s"], message["d"],
+                            b64decode(message["b"]), message["l"])
+    except (KeyError, TypeError, struct.error) as e:
+        raise ValueError(f"Invalid MODI message: {json_msg}") from e
 
 
 def __encode_bytes(byte_data: Tuple):
@@ -44,11 +134,11 @@ def __encode_bytes(byte_data: Tuple):
         elif byte_data[idx] < 256:
             data[idx] = int(byte_data[idx])
             idx += 1
-    return b64encode(bytes(data)).decode('utf8')
+    return bytes(data)
 
 
-def decode_message(message: str):
-    message = json.loads(message)
+def decode_message(message: Union[bytes, str]):
+    message = unpack_message(message)
     command = message['c']
     source = message['s']
     destination = message['d']
@@ -57,8 +147,11 @@ def decode_message(message: str):
     return command, source, destination, data, length
 
 
-def unpack_data(data: str, structure: Tuple = (1, 1, 1, 1, 1, 1, 1, 1)):
-    data = bytearray(b64decode(data.encode('utf8')))
+def unpack_data(data: Union[bytes, str],
+                structure: Tuple = (1, 1, 1, 1, 1, 1, 1, 1)):
+    if isinstance(data, str):
+        data = b64decode(data.encode('utf8'))
+    data = bytearray(data)
     idx = 0
     result = []
     for size in structure:
@@ -90,5 +183,5 @@ def parse_data(values, data_type: str) -> Tuple:
     return tuple(data)
 
 
-def decode_data(data: str) -> float:
+def decode_data(data: Union[bytes, str]) -> float:
     return round(struct.unpack("f", bytes(unpack_data(data)[:4]))[0], 2)
@@ -1,5 +1,10 @@
+import queue
+
+from collections import deque
 from multiprocessing import Queue
-import json
+from typing import Iterable, List, Union
+
+from modi.util.ring_buffer import RingBuffer
 
 
 class CommunicationQueue:
@@ -7,44 +12,140 @@ class CommunicationQueue:
     When communicating with modules, there are certain messages that need
     to be processed before others. This queue selects those messages and
     return earlier than other messages.
+    Messages are classified without being parsed, the consumer receives
+    the same binary message that has been put.
+    Messages put together by put_many cross the process boundary as a
+    single batch. The consumer moves every message that has arrived into
+    its priority lanes at once.
+    The "queue" backend carries messages over a multiprocessing queue. The
+    "shared_memory" backend carries them over a ring buffer in shared
+    memory, which takes binary messages only and converts json serialized
+    messages to binary messages. The "thread" backend carries them over a
+    queue of the current process, when the connection runs in a thread.
     """
-    def __init__(self):
-        self.__priority = Queue()
-        self.__ordinary = Queue()
 
-    def put(self, message: str) -> None:
-        if self.__check_priority(message):
-            self.__priority.put(message)
-        else:
-            self.__ordinary.put(message)
+    PRIORITY_COMMANDS = frozenset((0x03, 0x04, 0x1F, 0x05, 0x09, 0x07))
 
-    def get(self) -> str:
-        if not self.__priority.empty():
-            return self.__priority.get()
-        else:
-            return self.__ordinary.get()
+    # Every json message serialized by PyMODI begins with its command
+    JSON_COMMAND_PREFIX = '{"c":'
+
+    BACKENDS = ("queue", "shared_memory", "thread")
 
-    def get_nowait(self) -> str:
-        if not self.__priority.empty():
-            return self.__priority.get_nowait()
+    def __init__(self, backend: str = "queue"):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unsupported queue backend: {backend}")
+        if backend == "shared_memory":
+            self.__queue = RingBuffer()
+        elif backend == "thread":
+            self.__queue = queue.Queue()
         else:
-            return self.__ordinary.get_nowait()
+            self.__queue = Queue()
+
+        # Lanes of the consumer, filled by the messages received
+        self.__priority = deque()
+        self.__ordinary = deque()
+
+    def put(self, message: Union[bytes, str]) -> None:
+        self.__queue.put(message)
+
+    def put_many(self, messages: Iterable[Union[bytes, str]]) -> None:
+        """Put messages as a single batch
+
+        :param messages: Messages to put
+        :type messages: Iterable[Union[bytes, str]]
+        :return: None
+        """
+        messages = list(messages)
+        if messages:
+            self.__queue.put(messages)
+
+    def get(self, block: bool = True,
+            timeout: float = None) -> Union[bytes, str]:
+        """Get a message, returning messages with priority first
+
+        :param block: If True, wait until a message is available
+        :type block: bool
+        :param timeout: Maximum time to wait in seconds
+        :type timeout: float, optional
+        :raises queue.Empty: If no message is available
+        :return: Message
+        :rtype: Union[bytes, str]
+        """
+        if not self.__priority and not self.__ordinary:
+            self.__receive(block, timeout)
+        if self.__priority:
+            return self.__priority.popleft()
+        return self.__ordinary.popleft()
+
+    def get_nowait(self) -> Union[bytes, str]:
+        return self.get(block=False)
+
+    def get_many(self, block: bool = True,
+                 timeout: float = None) -> List[Union[bytes, str]]:
+        """Get every available message, messages with priority first
+
+        :param block: If True, wait until a message is available
+        :type block: bool
+        :param timeout: Maximum time to wait in seconds
+        :type timeout: float, optional
+        :return: Messages, empty if no message is available
+        :rtype: List[Union[bytes, str]]
+        """
+        try:
+            self.__receive(block, timeout)
+        except queue.Empty:
+            pass
+        messages = []
+        for lane in (self.__priority, self.__ordinary):
+            while lane:
+                messages.append(lane.popleft())
+        return messages
 
     def empty(self):
-        return self.__ordinary.empty() and self.__priority.empty()
+        return not self.__priority and not self.__ordinary \
+            and self.__queue.empty()
+
+    def __receive(self, block: bool = False, timeout: float = None) -> None:
+        """Move every message that has arrived into the lanes
+
+        :param block: If True, wait until a message arrives
+        :type block: bool
+        :param timeout: Maximum time to wait in seconds
+        :type timeout: float, optional
+        :raises queue.Empty: If no message has arrived
+        :return: None
+        """
+        item = self.__queue.get(block, timeout)
+        while True:
+            for message in (item if isinstance(item, list) else (item,)):
+                if self.__check_priority(message):
+                    self.__priority.append(message)
+                else:
+                    self.__ordinary.append(message)
+            try:
+                item = self.__queue.get_nowait()
+            except queue.Empty:
+                break
 
     @staticmethod
-    def __check_priority(json_message: str) -> bool:
+    def __check_priority(message: Union[bytes, str]) -> bool:
         """Checks whether the message has priority
 
-        :param json_message: Json serialized message
-        :type json_message: str
+        :param message: Binary message, or json serialized message
+        :type message: Union[bytes, str]
         :return: True is the message has priority
         :rtype: bool
         """
-        try:
-            message = json.loads(json_message)
-        except json.JSONDecodeError:
+        if isinstance(message, bytes):
+            # The command is the first byte of a binary message
+            return message[0] in CommunicationQueue.PRIORITY_COMMANDS
+
+        # Scan the command of a json message at its fixed offset
+        prefix = CommunicationQueue.JSON_COMMAND_PREFIX
+        if not message.startswith(prefix):
+            return False
+        end = message.find(",", len(prefix))
+        command = message[len(prefix):end].strip()
+        if end < 0 or not command.isdigit():
             return False
-        command = message['c']
-        return command in (0x03, 0x04, 0x1F, 0x05, 0x09, 0x07)
+        return int(command) in CommunicationQueue.PRIORITY_COMMANDS
@@ -0,0 +1,188 @@
+import os
+import queue
+import time
+import weakref
+
+import threading as th
+import multiprocessing as mp
+
+from typing import List, Union
+
+from modi.util.msgutil import MESSAGE_STRUCT, json_to_message
+
+
+class RingBuffer:
+    """Ring buffer is a single producer, single consumer channel of binary
+    messages in shared memory. Each message occupies a fixed size slot, so
+    the producer and the consumer only exchange the indices of the ring.
+    The producer owns the head index and the consumer owns the tail index.
+    The indices are read and written holding a lock shared between the
+    processes, once per batch of messages. The lock orders the accesses to
+    the shared memory, so that the slots written before the head index is
+    published are seen written by the consumer on every cpu, including the
+    weakly ordered ones of ARM boards. A semaphore, which never counts more
+    than one, wakes the consumer up when messages are written.
+    Threads of the same process that put or get messages are serialized by
+    a lock of that process.
+    """
+
+    FRAME_SIZE = MESSAGE_STRUCT.size
+
+    # Head and tail indices, stored as unsigned 64 bit integers
+    HEADER_SIZE = 16
+
+    # Interval to wait for the consumer when the ring is full
+    FULL_WAIT = 0.0005
+
+    def __init__(self, capacity: int = 4096):
+        try:
+            from multiprocessing import shared_memory
+        except ImportError:
+            raise RuntimeError("Shared memory requires Python 3.8 or later")
+
+        self.__capacity = capacity
+        self.__shm = shared_memory.SharedMemory(
+            create=True, size=self.HEADER_SIZE + capacity * self.FRAME_SIZE
+        )
+        self.__shm.buf[:self.HEADER_SIZE] = bytes(self.HEADER_SIZE)
+        self.__index_lock = mp.Lock()
+        self.__wakeup = mp.BoundedSemaphore(1)
+        self.__wakeup.acquire()
+
+        # The creating process removes the shared memory
+        self.__attach(unlink=True)
+
+    def __getstate__(self):
+        return self.__capacity, self.__shm, self.__index_lock, self.__wakeup
+
+    def __setstate__(self, state):
+        self.__capacity, self.__shm, self.__index_lock, self.__wakeup = state
+        if os.name == "posix":
+            # The shared memory is released by the creating process, not by
+            # the resource tracker of the attaching process
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(self.__shm._name, "shared_memory")
+        self.__attach(unlink=False)
+
+    def __attach(self, unlink: bool) -> None:
+        """Map the indices and the slots of the shared memory
+
+        :param unlink: If True, remove the shared memory when released
+        :type unlink: bool
+        :return: None
+        """
+        buf = self.__shm.buf
+        self.__indices = buf[:self.HEADER_SIZE].cast("Q")
+        self.__slots = buf[self.HEADER_SIZE:]
+        self.__put_lock = th.Lock()
+        self.__get_lock = th.Lock()
+        weakref.finalize(self, RingBuffer.__release, self.__shm,
+                         (self.__indices, self.__slots), unlink)
+
+    @staticmethod
+    def __release(shm, views, unlink) -> None:
+        for view in views:
+            view.release()
+        shm.close()
+        if unlink:
+            shm.unlink()
+
+    def put(self, item: Union[bytes, str, List[Union[bytes, str]]]) -> None:
+        """Write a message, or a batch of messages, to the ring.
+        Json serialized messages are converted to binary messages.
+
+        :param item: Message or list of messages
+        :type item: Union[bytes, str, List[Union[bytes, str]]]
+        :raises ValueError: If a message can not be converted to binary
+        :return: None
+        """
+        messages = item if isinstance(item, list) else (item,)
+        frames = [self.__to_frame(message) for message in messages]
+        capacity, size = self.__capacity, self.FRAME_SIZE
+        with self.__put_lock:
+            with self.__index_lock:
+                head, tail = self.__indices[0], self.__indices[1]
+            for frame in frames:
+                # Wait for the consumer to free a slot
+                while head - tail >= capacity:
+                    with self.__index_lock:
+                        self.__indices[0] = head
+                        tail = self.__indices[1]
+                    if head - tail < capacity:
+                        break
+                    self.__notify()
+                    time.sleep(self.FULL_WAIT)
+                offset = head % capacity * size
+                self.__slots[offset:offset + size] = frame
+                head += 1
+            # The slots are written before the head index is published
+            with self.__index_lock:
+                self.__indices[0] = head
+        self.__notify()
+
+    def get(self, block: bool = True,
+            timeout: float = None) -> List[bytes]:
+        """Read every message written to the ring
+
+        :param block: If True, wait until a message is written
+        :type block: bool
+        :param timeout: Maximum time to wait in seconds
+        :type timeout: float, optional
+        :raises queue.Empty: If no message is written
+        :return: Binary messages
+        :rtype: List[bytes]
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        capacity, size = self.__capacity, self.FRAME_SIZE
+        with self.__get_lock:
+            with self.__index_lock:
+                head, tail = self.__indices[0], self.__indices[1]
+            while head == tail:
+                if not block:
+                    raise queue.Empty
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise queue.Empty
+                self.__wakeup.acquire(timeout=remaining)
+                with self.__index_lock:
+                    head = self.__indices[0]
+
+            frames = []
+            for index in range(tail, head):
+                offset = index % capacity * size
+                frames.append(bytes(self.__slots[offset:offset + size]))
+            # The slots are read before they are freed to the producer
+            with self.__index_lock:
+                self.__indices[1] = head
+        return frames
+
+    def get_nowait(self) -> List[bytes]:
+        return self.get(block=False)
+
+    def empty(self) -> bool:
+        with self.__index_lock:
+            return self.__indices[0] == self.__indices[1]
+
+    def __notify(self) -> None:
+        try:
+            self.__wakeup.release()
+        except ValueError:
+            # The consumer has not consumed the previous wakeup yet
+            pass
+
+    def __to_frame(self, message: Union[bytes, str]) -> bytes:
+        """Convert a message to a frame of the ring
+
+        :param message: Binary message, or json serialized message
+        :type message: Union[bytes, str]
+        :raises ValueError: If the message can not be converted to binary
+        :return: Binary message
+        :rtype: bytes
+        """
+        if isinstance(message, str):
+            message = json_to_message(message)
+        if len(message) != self.FRAME_SIZE:
+            raise ValueError(f"Invalid binary message: {message}")
+        return message
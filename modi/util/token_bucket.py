@@ -0,0 +1,52 @@
+import time
+
+
+class TokenBucket:
+    """Token bucket paces the messages written to a connection. Tokens are
+    added at the given rate up to the burst size, and writing a message
+    takes a token, waiting for one when the bucket is empty. Short bursts
+    are written at once while the average rate never exceeds the rate the
+    modules can handle.
+
+    :param rate: Number of tokens added per second
+    :param burst: Maximum number of tokens kept in the bucket
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"Invalid token bucket: {rate}/s, {burst}")
+        self.__rate = rate
+        self.__burst = burst
+        self.__tokens = float(burst)
+        self.__last_time = time.perf_counter()
+
+    @property
+    def rate(self) -> float:
+        return self.__rate
+
+    @property
+    def burst(self) -> int:
+        return self.__burst
+
+    def consume(self, nb_tokens: int = 1) -> float:
+        """Take tokens from the bucket, waiting until they are added
+
+        :param nb_tokens: Number of tokens to take
+        :type nb_tokens: int
+        :return: Time waited in seconds
+        :rtype: float
+        """
+        curr_time = time.perf_counter()
+        self.__tokens = min(
+            self.__burst,
+            self.__tokens + (curr_time - self.__last_time) * self.__rate
+        )
+        self.__last_time = curr_time
+        self.__tokens -= nb_tokens
+        if self.__tokens >= 0:
+            return 0
+
+        # The tokens owed are added while waiting
+        wait_time = -self.__tokens / self.__rate
+        time.sleep(wait_time)
+        return wait_time
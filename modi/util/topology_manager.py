@@ -1,6 +1,9 @@
-from typing import Dict, List, Tuple
+import time
+import threading as th
+
+from typing import Dict, Tuple
+
 from modi.util.misc import module_list
-from modi.task.conn_task import ConnTask
 
 
 class TopologyMap:
@@ -8,11 +11,11 @@ class TopologyMap:
         self._nb_modules = nb_modules
         self._tp_data = tp_data
         self._modules = modules
-        # 2D array that will contain the topology information of the modules.
-        # It stores the module id
-        self._tp_map = [[0 for _ in range(2 * self._nb_modules)]
-                        for _ in range(2 * self._nb_modules)]
+        # Sparse map of the modules, which stores the module id by (x, y)
+        self._tp_map = dict()
         self.__module_position = dict()
+        # Bounding box of the map, as (min x, min y, max x, max y)
+        self.__bounds = None
 
     @staticmethod
     def __get_module_orientation(mod_data: Dict[str, int], prev_id: int,
@@ -57,40 +60,63 @@ class TopologyMap:
             up_vector = (up_vector[1], -up_vector[0])
         return up_vector
 
-    def __update_map(self, module_id: int, x: int, y: int, prev_id: int,
-                     toward: Tuple[int, int], visited: List[int]):
-        """Recursively updates the map
+    def __update_map(self, module_id: int, x: int, y: int) -> None:
+        """Updates the map, traversing the modules depth first from a module
+
+        :param module_id: id of the module to start from
+        :param x: x coordinate of the module on the map
+        :param y: y coordinate of the module on the map
+        :return: None
+        """
+        visited = set()
+        # Modules to traverse, with their coordinates, the id of the module
+        # they are traversed from and the direction they are traversed to
+        stack = [(module_id, x, y, -1, (1, 0))]
+        while stack:
+            module_id, x, y, prev_id, toward = stack.pop()
+            # Neighbours which have not sent their topology are left out
+            if module_id in visited or module_id not in self._tp_data:
+                continue
+            module_data = self._tp_data[module_id]
+            self._tp_map[(x, y)] = module_id
+            self.__module_position[module_id] = (x, y)
+            self.__extend_bounds(x, y)
+            visited.add(module_id)
+            up_vector = self.__get_module_orientation(module_data, prev_id,
+                                                      toward)
+            # Pushed in reverse, so that the top neighbour is traversed first
+            for d in ['r', 'l', 'b', 't']:
+                if module_data.get(d) is not None:
+                    toward = self.__get_rotated_direction(d, up_vector)
+                    stack.append((module_data.get(d), x + toward[0],
+                                  y + toward[1], module_id, toward))
+
+    def __extend_bounds(self, x: int, y: int) -> None:
+        """Extends the bounding box of the map to a coordinate
 
-        :param module_id: id of the current module
         :param x: x coordinate on the map
         :param y: y coordinate on the map
-        :param prev_id: id of the previously traversed module
-        :param toward: direction from which the module traversed
-        :param visited: list of visited modules
         :return: None
         """
-        if module_id in visited:
+        if self.__bounds is None:
+            self.__bounds = (x, y, x, y)
             return
-        module_data = self._tp_data[module_id]
-        self._tp_map[y][x] = module_id
-        self.__module_position[module_id] = (x, y)
-        visited.append(module_id)
-        up_vector = self.__get_module_orientation(module_data, prev_id, toward)
-        for d in ['t', 'b', 'l', 'r']:
-            if module_data.get(d) is not None:
-                toward = self.__get_rotated_direction(d, up_vector)
-                self.__update_map(module_data.get(d), x + toward[0],
-                                  y + toward[1], module_id, toward, visited)
+        min_x, min_y, max_x, max_y = self.__bounds
+        self.__bounds = (min(min_x, x), min(min_y, y),
+                         max(max_x, x), max(max_y, y))
 
     def construct_map(self) -> None:
-        """Construct the topology map
+        """Construct the topology map, with the network module at (0, 0)
 
         :return: None
         """
-        first_id = self.network_id
-        visited = []
-        self.__update_map(first_id, self._nb_modules, self._nb_modules,
-                          prev_id=-1, toward=(1, 0), visited=visited)
+        self.__update_map(self.network_id, 0, 0)
+
+    @property
+    def module_position(self) -> Dict[int, Tuple[int, int]]:
+        """Position of each module on the map, by module id
+        """
+        return self.__module_position
 
     def print_map(self, print_id: bool = False) -> None:
         """ Prints out the topology map
@@ -99,66 +125,49 @@ class TopologyMap:
         :type print_id: bool
         :return: None
         """
-        # Trims the matrix to get rid of empty spaces, containing zeros only
-        x, y, w, h = -1, -1, 1, 1
-
-        """
-        x, y indicates the coordinate from which the topology map contains
-         non-zero element
-        w, h indicates the width and height of non-zero elements in the map
-        Since most of the elements in the map are zeros, x, y, w, h represents
-        the window in which module ids are the elements of the map.
-        """
-
-        # Iterates through the rows until it finds the first non-zero row.
-        # Saves the index to y, and increases h until it finds next all-zero
-        # row
-        for i in range(len(self._tp_map)):
-            if sum(self._tp_map[i]) > 0 and y < 0:
-                y = i
-            elif sum(self._tp_map[i]) > 0 and y >= 0:
-                h += 1
-
-        # Iterates through the columns until it finds the first non-zero column
-        # Saves the index to x, and increases w until it finds next all-zero
-        # column.
-        for i in range(len(self._tp_map[0])):
-            col = list(map(lambda m: m[i], self._tp_map))
-            if sum(col) > 0 and x < 0:
-                x = i
-            elif sum(col) > 0 and x >= 0:
-                w += 1
+        if self.__bounds is None:
+            return
+        min_x, min_y, max_x, max_y = self.__bounds
+        w = max_x - min_x + 1
 
         """
         Prints out the map by a format
         padding is the length of the placeholder for the module names.
         if we want to print id as well, padding should be longer to 17.
-        The method prints out the window determined by x, y, w, h.
+        Only the modules are visited, the empty places between them in a row
+        are filled with spaces.
         """
         padding = 10
         if print_id:
             padding = 17
+        rows = dict()
+        for (x, y), module_id in sorted(self._tp_map.items()):
+            rows.setdefault(y, []).append((x, module_id))
+        module_lists = dict()
+
         title = "<<MODI Topology Map>>"
         print(" " * ((padding * w - len(title)) // 2) + title)
         print("=" * padding * w)
-        for i in range(y + h - 1, y - 1, -1):
+        for y in range(max_y, min_y - 1, -1):
             line = ""
-            row = self._tp_map[i]
-            for j in range(x, x + w):
-                curr_elem = row[j]
-                if not curr_elem:
-                    line += " " * padding
+            next_x = min_x
+            for x, module_id in rows.get(y, ()):
+                line += " " * padding * (x - next_x)
+                next_x = x + 1
+                name = TopologyManager.get_type_from_uuid(
+                    self._tp_data[module_id]['uuid'])
+                modules = module_lists.get(name)
+                if modules is None:
+                    modules = module_list(self._modules, name.lower())
+                    module_lists[name] = modules
+                idx = modules.find(module_id)
+                if idx < 0:
+                    idx = ''
+                if print_id:
+                    line += f"{name + str(idx) + f' ({module_id})':^17}"
                 else:
-                    name = TopologyManager.get_type_from_uuid(
-                        self._tp_data[curr_elem]['uuid'])
-                    idx = module_list(self._modules,
-                                      name.lower()).find(curr_elem)
-                    if idx < 0:
-                        idx = ''
-                    if print_id:
-                        line += f"{name + str(idx) + f' ({curr_elem})':^17}"
-                    else:
-                        line += f"{name + str(idx):^10}"
+                    line += f"{name + str(idx):^10}"
+            line += " " * padding * (max_x + 1 - next_x)
             print(line)
 
     @property
@@ -179,11 +188,98 @@ class TopologyMap:
 
 
 class TopologyManager:
-
-    def __init__(self, topology_data, modules):
+    """Topology of the connected modules, updated by each topology message.
+    The neighbours which have not sent their topology yet and the modules
+    whose uuid is unknown are tracked as the messages arrive, so that
+    whether the topology is complete is answered without traversing it.
+
+    :param topology_data: dict() of module id : topology of the module
+    :param modules: list() of module instance
+    :param is_network_connected: Whether a network module is connected
+        through a serial port, looked up once when the topology is first
+        checked if not given
+    """
+
+    DIRECTIONS = ('r', 't', 'l', 'b')
+    # Minimum time between two requests of a missing topology in seconds
+    REQUEST_INTERVAL = 0.1
+
+    def __init__(self, topology_data, modules,
+                 is_network_connected: bool = None):
         self._tp_data = topology_data
         self._nb_modules = len(self._tp_data)
         self._modules = modules
+        self.__is_network_connected = is_network_connected
+
+        self.__lock = th.Lock()
+        # Ids of the neighbours whose topology is unknown
+        self.__unknown_ids = set()
+        # Ids of the modules whose uuid is unknown, such as network modules
+        self.__no_uuid_ids = set()
+        # Whether the topology changed since the positions were updated
+        self.__is_changed = True
+        # Time the missing topology was last requested, from time.monotonic
+        self.__request_time = None
+        for module_id in list(self._tp_data):
+            self.__track(module_id)
+
+    def update_topology(self, module_id: int,
+                        topology: Dict[str, int]) -> None:
+        """Merge the topology sent by a module. Neighbours and uuid already
+        known are kept.
+
+        :param module_id: Id of the module
+        :type module_id: int
+        :param topology: Uuid and ids of the neighbours of the module
+        :type topology: Dict[str, int]
+        :return: None
+        """
+        with self.__lock:
+            module_data = self._tp_data.get(module_id)
+            if not module_data:
+                self._tp_data[module_id] = topology
+            else:
+                for key in module_data:
+                    if not module_data[key]:
+                        module_data[key] = topology[key]
+            self.__track(module_id)
+            self.__is_changed = True
+
+    def update_uuid(self, module_id: int, uuid: int) -> None:
+        """Set the uuid of a module whose topology arrived before it was
+        registered
+
+        :param module_id: Id of the module
+        :type module_id: int
+        :param uuid: Uuid of the module
+        :type uuid: int
+        :return: None
+        """
+        with self.__lock:
+            module_data = self._tp_data.get(module_id)
+            if module_data and not module_data['uuid']:
+                module_data['uuid'] = uuid
+                self.__track(module_id)
+                self.__is_changed = True
+
+    def __track(self, module_id: int) -> None:
+        """Update the unknown neighbours and uuids with the topology of a
+        module, holding the lock
+
+        :param module_id: Id of the module
+        :type module_id: int
+        :return: None
+        """
+        module_data = self._tp_data[module_id]
+        self.__unknown_ids.discard(module_id)
+        for direction in self.DIRECTIONS:
+            neighbour_id = module_data.get(direction)
+            if neighbour_id is not None and neighbour_id not in self._tp_data:
+                self.__unknown_ids.add(neighbour_id)
+        if module_data['uuid']:
+            self.__no_uuid_ids.discard(module_id)
+        else:
+            self.__no_uuid_ids.add(module_id)
 
     def __update_module_position(self):
         self._nb_modules = len(self._tp_data)
@@ -192,31 +288,76 @@ class TopologyManager:
         tp_map.update_module_data(self._modules)
 
     def is_uuid_initialized(self):
-        count = 0
-        for module in self._tp_data:
-            if not self._tp_data[module]['uuid']:
-                count += 1
-        return count <= 1
+        return len(self.__no_uuid_ids) <= 1
 
     def is_topology_complete(self, exe_thrd):
-        if len(self._tp_data) < 1:
+        """Returns whether the topology of every module is known, updating
+        the positions of the modules once it is. The topology of a missing
+        neighbour is requested otherwise.
+
+        The requests are sent once per REQUEST_INTERVAL at most, however
+        often it is called.
+
+        :param exe_thrd: Executor requesting the missing topology
+        :return: True if the topology is complete
+        :rtype: bool
+        """
+        with self.__lock:
+            if not self._tp_data:
+                return False
+            missing_id = next(iter(self.__unknown_ids), None)
+            is_changed = self.__is_changed
+        is_network_connected = self.__is_network_connected
+        if is_network_connected is None:
+            # Listing the serial ports is slow, so it is done only once
+            from modi.task.conn_task import ConnTask
+            is_network_connected = ConnTask.is_network_module_connected()
+            self.__is_network_connected = is_network_connected
+        if missing_id is not None:
+            if self.__can_request():
+                exe_thrd.request_topology(module_id=missing_id)
+                if not self.__is_module(missing_id) and is_network_connected:
+                    exe_thrd.request_topology(0x2A, missing_id)
+            if self.__is_module(missing_id) or is_network_connected:
+                return False
+
+        nb_modules = len(self._tp_data) - 1 if is_network_connected \
+            else len(self._tp_data)
+        if len(self._modules) != nb_modules or not self.is_uuid_initialized():
             return False
-        try:
-            self.__update_module_position()
-        except KeyError as e:
-            exe_thrd.request_topology(module_id=int(str(e)))
-            if int(str(e)) not in [module.id for module in self._modules]:
-                if ConnTask.is_network_module_connected():
-                    exe_thrd.request_topology(0x2A, int(str(e)))
-                    return False
-            else:
+        if is_changed and missing_id is None:
+            with self.__lock:
+                self.__is_changed = False
+                try:
+                    self.__update_module_position()
+                    return True
+                except KeyError as e:
+                    # A module is not connected to the network module yet
+                    self.__is_changed = True
+                    unplaced_id = e.args[0]
+            # Requested without the lock, which __can_request takes
+            if self.__can_request():
+                exe_thrd.request_topology(module_id=unplaced_id)
+            return False
+        return True
+
+    def __can_request(self) -> bool:
+        """Returns whether the missing topology can be requested again,
+        recording the time of the request if so
+
+        :return: True if REQUEST_INTERVAL passed since the last request
+        :rtype: bool
+        """
+        now = time.monotonic()
+        with self.__lock:
+            if self.__request_time is not None and \
+                    now - self.__request_time < self.REQUEST_INTERVAL:
                 return False
-        if ConnTask.is_network_module_connected():
-            return len(self._modules) == len(self._tp_data) - 1 \
-                and self.is_uuid_initialized()
-        else:
-            return len(self._modules) == len(self._tp_data) \
-                and self.is_uuid_initialized()
+            self.__request_time = now
+            return True
+
+    def __is_module(self, module_id: int) -> bool:
+        return any(module.id == module_id for module in self._modules)
 
     def print_topology_map(self, print_id: bool = False) -> None:
         """ Print the topology map
@@ -224,11 +365,41 @@ class TopologyManager:
         :param print_id: If True, the result includes module ids
         :return: None
         """
-        self._nb_modules = len(self._tp_data)
-        tp_map = TopologyMap(self._tp_data, self._nb_modules, self._modules)
-        tp_map.construct_map()
+        with self.__lock:
+            self._nb_modules = len(self._tp_data)
+            tp_map = TopologyMap(self._tp_data, self._nb_modules,
+                                 self._modules)
+            tp_map.construct_map()
         tp_map.print_map(print_id)
 
+    def get_topology(self) -> Dict[int, Dict]:
+        """Returns the topology of the modules without printing it. Each
+        module id maps to a dict of
+        "type": type of the module, such as "Gyro" or "Network",
+        "position": (x, y) position relative to the network module, None if
+        the module is not connected to it,
+        "neighbours": ids of the modules on its right, top, left and bottom
+        sides, by 'r', 't', 'l' and 'b', None for an empty side.
+
+        :return: Topology of the modules by module id
+        :rtype: Dict[int, Dict]
+        """
+        with self.__lock:
+            if not self._tp_data:
+                return dict()
+            tp_map = TopologyMap(self._tp_data, len(self._tp_data),
+                                 self._modules)
+            tp_map.construct_map()
+            return {
+                module_id: {
+                    'type': self.get_type_from_uuid(module_data['uuid']),
+                    'position': tp_map.module_position.get(module_id),
+                    'neighbours': {direction: module_data.get(direction)
+                                   for direction in self.DIRECTIONS},
+                }
+                for module_id, module_data in self._tp_data.items()
+            }
+
     @staticmethod
     def get_type_from_uuid(uuid: int) -> str:
         """Returns type based on uuid
@@ -0,0 +1,263 @@
+import os
+import sys
+import json
+import time
+
+import threading as th
+
+from typing import Callable, Optional, Tuple
+
+
+def is_offline() -> bool:
+    """Returns whether PyMODI must not access the network, which is set by
+    the MODI_OFFLINE environment variable
+
+    :return: True if offline
+    :rtype: bool
+    """
+    return os.environ.get("MODI_OFFLINE", "").lower() in ("1", "true", "yes")
+
+
+def user_cache_dir() -> str:
+    """Returns the cache directory of PyMODI, which can be set by the
+    MODI_CACHE_DIR environment variable
+
+    :return: Path of the cache directory
+    :rtype: str
+    """
+    cache_dir = os.environ.get("MODI_CACHE_DIR")
+    if cache_dir:
+        return cache_dir
+    if os.name == "nt":
+        base_dir = os.environ.get("LOCALAPPDATA") or \
+            os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    elif sys.platform == "darwin":
+        base_dir = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+    else:
+        base_dir = os.environ.get("XDG_CACHE_HOME") or \
+            os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base_dir, "pymodi")
+
+
+class VersionCache:
+    """Version cache keeps the latest version published at a url. The
+    version is fetched at most once per process, in a background thread,
+    and saved to a cache file which is used instead while it is younger than
+    the time to live. An older cache file is used when the fetch fails, and
+    in offline mode, where nothing is fetched.
+
+    :param url: Url of the published version
+    :param name: Name of the cache file
+    :param parse: Function extracting the version from the fetched content
+    :param ttl: Time to live of the cache file in seconds
+    :param cache_dir: Cache directory, the user cache directory by default
+    :param offline: Offline mode, given by MODI_OFFLINE by default
+    """
+
+    # Timeout of the request in seconds
+    TIMEOUT = 3
+
+    def __init__(self, url: str, name: str, parse: Callable[[bytes], str],
+                 ttl: float = 24 * 60 * 60, cache_dir: str = None,
+                 offline: bool = None):
+        self.__url = url
+        self.__name = name
+        self.__parse = parse
+        self.__ttl = ttl
+        self.__cache_dir = cache_dir
+        self.__offline = offline
+
+        self.__lock = th.Lock()
+        self.__version = None
+        self.__stale_version = None
+        self.__is_loaded = False
+        self.__fetch_thread = None
+        self.__callbacks = []
+
+    @property
+    def cache_path(self) -> str:
+        cache_dir = self.__cache_dir or user_cache_dir()
+        return os.path.join(cache_dir, f"{self.__name}.json")
+
+    def get(self, callback: Callable[[str], None] = None) -> Optional[str]:
+        """Returns the version without waiting for the network. When the
+        version is not known yet, it is fetched in the background and the
+        callback is called with it once it is fetched.
+
+        :param callback: Function called with the fetched version
+        :type callback: Callable[[str], None], optional
+        :return: The version, None if it is not known yet
+        :rtype: Optional[str]
+        """
+        with self.__lock:
+            if self.__version is not None:
+                return self.__version
+            if not self.__is_loaded:
+                self.__is_loaded = True
+                version, is_fresh = self.__load()
+                offline = is_offline() if self.__offline is None \
+                    else self.__offline
+                if is_fresh or offline:
+                    self.__version = version
+                    return version
+                self.__stale_version = version
+                self.__fetch_thread = th.Thread(target=self.__fetch)
+                self.__fetch_thread.daemon = True
+                self.__fetch_thread.start()
+            if callback and self.__fetch_thread:
+                self.__callbacks.append(callback)
+            return None
+
+    def wait(self, timeout: float = None) -> Optional[str]:
+        """Returns the version, waiting for the background fetch to end
+
+        :param timeout: Maximum time to wait in seconds
+        :type timeout: float, optional
+        :return: The version, None if it could not be fetched
+        :rtype: Optional[str]
+        """
+        version = self.get()
+        fetch_thread = self.__fetch_thread
+        if version is None and fetch_thread:
+            fetch_thread.join(timeout)
+        return self.__version
+
+    def __fetch(self) -> None:
+        """Fetch the version and save it to the cache file
+
+        :return: None
+        """
+        # Imported here, so that importing PyMODI does not import it
+        import urllib.request as ur
+
+        try:
+            with ur.urlopen(self.__url, timeout=self.TIMEOUT) as response:
+                version = self.__parse(response.read())
+        except (OSError, ValueError):
+            version = self.__stale_version
+        else:
+            self.__save(version)
+        with self.__lock:
+            self.__version = version
+            callbacks, self.__callbacks = self.__callbacks, []
+            self.__fetch_thread = None
+        if version is not None:
+            for callback in callbacks:
+                callback(version)
+
+    def __load(self) -> Tuple[Optional[str], bool]:
+        """Load the version from the cache file
+
+        :return: The cached version and whether it is younger than the ttl
+        :rtype: Tuple[Optional[str], bool]
+        """
+        try:
+            with open(self.cache_path) as cache_file:
+                cache = json.load(cache_file)
+            return cache["version"], time.time() - cache["time"] < self.__ttl
+        except (OSError, ValueError, KeyError, TypeError):
+            return None, False
+
+    def __save(self, version: str) -> None:
+        """Save the version to the cache file, replacing it atomically
+
+        :param version: Version to save
+        :type version: str
+        :return: None
+        """
+        cache_path = self.cache_path
+        temp_path = f"{cache_path}.{os.getpid()}"
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(temp_path, "w") as cache_file:
+                json.dump({"version": version, "time": time.time()},
+                          cache_file)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            pass
+
+
+def parse_skeleton_version(content: bytes) -> str:
+    """Extract the version from the last line of the skeleton version.txt
+
+    :param content: Content of version.txt
+    :type content: bytes
+    :return: Version string such as "2.2.4"
+    :rtype: str
+    """
+    lines = content.decode('utf-8').split()
+    version = lines[-1].lstrip('v') if lines else ""
+    if not all(digit.isdigit() for digit in version.split('.')) or \
+            version.count('.') != 2:
+        raise ValueError(f"Invalid skeleton version: {version}")
+    return version
+
+
+def version_to_number(version: str) -> int:
+    """Version number is formed by concatenating all three version bits
+    e.g. v2.2.4 -> 010 00010 00000100 -> 0100 0010 0000 0100
+
+    :param version: Version string such as "2.2.4"
+    :type version: str
+    :return: Version number
+    :rtype: int
+    """
+    version_digits = [int(digit) for digit in version.split('.')]
+    return (
+        version_digits[0] << 13
+        | version_digits[1] << 8
+        | version_digits[2]
+    )
+
+
+# Most recent skeleton version, fetched at most once per process
+skeleton_version = VersionCache(
+    "https://download.luxrobo.com/modi-skeleton-mobile/version.txt",
+    "skeleton_version", parse_skeleton_version
+)
+
+
+def parse_pypi_version(content: bytes) -> str:
+    """Extract the latest release from the PyPI metadata of PyMODI
+
+    :param content: Json metadata of the PyMODI project
+    :type content: bytes
+    :return: Version string such as "1.0.0"
+    :rtype: str
+    """
+    try:
+        return json.loads(content.decode('utf-8'))["info"]["version"]
+    except (KeyError, TypeError):
+        raise ValueError("Invalid PyPI metadata")
+
+
+# Latest PyMODI release, fetched at most once per process
+pypi_version = VersionCache(
+    "https://pypi.org/pypi/pymodi/json", "pypi_version", parse_pypi_version
+)
+
+
+def check_latest_version(version: str) -> None:
+    """Notify the user when a newer PyMODI is released. The release is read
+    from the cache file or fetched in the background, so the check never
+    waits for the network. It is skipped in child processes and when the
+    MODI_VERSION_CHECK environment variable is set to 0.
+
+    :param version: Version of the running PyMODI
+    :type version: str
+    :return: None
+    """
+    if os.environ.get("MODI_VERSION_CHECK", "").lower() in \
+            ("0", "false", "no"):
+        return
+    import multiprocessing as mp
+    if mp.current_process().name != "MainProcess":
+        return
+
+    def notify(latest_version: str) -> None:
+        if latest_version != version:
+            print(f"Newer PyMODI (v{latest_version}) is available!")
+
+    latest_version = pypi_version.get(notify)
+    if latest_version is not None:
+        notify(latest_version)
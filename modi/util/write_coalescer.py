@@ -0,0 +1,132 @@
+import time
+
+import threading as th
+
+from typing import Hashable, Iterable, Tuple, Union
+
+
+class WriteCoalescer:
+    """Write coalescer sits between the modules and the send queue. Values
+    written to a property of a module wait in a pending table keyed by the
+    module id and the property, where a later value replaces the one still
+    pending, and a value equal to the one just written is skipped. A flusher
+    thread puts the pending values to the send queue as a single batch, then
+    waits for the send task to write them, so the send queue never holds
+    more than one value of a property.
+    Other messages, such as property requests, are put to the send queue
+    right away.
+
+    :param send_q: Send queue of the connection task
+    :param rate: Messages written per second by the send task
+    """
+
+    # Time in seconds during which an unchanged value is not written again,
+    # in case the module has been reset since
+    UNCHANGED_PERIOD = 1
+
+    def __init__(self, send_q, rate: float = 1000):
+        self.__send_q = send_q
+        self.__rate = rate
+
+        self.__cond = th.Condition(th.Lock())
+        self.__pending = dict()
+        self.__written = dict()
+        self.__flusher = None
+
+    def put(self, message: Union[bytes, str]) -> None:
+        self.__send_q.put(message)
+
+    def put_many(self, messages: Iterable[Union[bytes, str]]) -> None:
+        self.__send_q.put_many(messages)
+
+    def put_latest(self, key: Hashable,
+                   messages: Iterable[Union[bytes, str]]) -> None:
+        """Put the messages writing the latest value of a property. Messages
+        without key are never replaced nor skipped, but are written in order
+        with the pending values.
+
+        :param key: Key of the property, such as (module id, property type)
+        :type key: Hashable
+        :param messages: Messages writing the value
+        :type messages: Iterable[Union[bytes, str]]
+        :return: None
+        """
+        self.put_latest_many([(key, messages)])
+
+    def put_latest_many(
+        self, values: Iterable[Tuple[Hashable, Iterable[Union[bytes, str]]]]
+    ) -> None:
+        """Put the latest values of several properties at once
+
+        :param values: Keys and messages of the values
+        :type values: Iterable[Tuple[Hashable, Iterable[Union[bytes, str]]]]
+        :return: None
+        """
+        with self.__cond:
+            for key, messages in values:
+                self.__put_latest(key, tuple(messages))
+            if self.__flusher is None:
+                self.__flusher = th.Thread(target=self.__flush_pending)
+                self.__flusher.daemon = True
+                self.__flusher.start()
+            self.__cond.notify()
+
+    def __put_latest(self, key: Hashable,
+                     messages: Tuple[Union[bytes, str], ...]) -> None:
+        """Add a value to the pending values, holding the lock
+
+        :param key: Key of the property
+        :type key: Hashable
+        :param messages: Messages writing the value
+        :type messages: Tuple[Union[bytes, str], ...]
+        :return: None
+        """
+        if key is None:
+            self.__pending[object()] = (messages, False)
+            return
+
+        # A replaced value moves behind the values pending before it
+        self.__pending.pop(key, None)
+        written = self.__written.get(key)
+        if written and written[0] == messages and \
+                time.time() - written[1] < self.UNCHANGED_PERIOD:
+            return
+        self.__pending[key] = (messages, True)
+
+    def flush(self) -> None:
+        """Put every pending value to the send queue right away
+
+        :return: None
+        """
+        with self.__cond:
+            self.__put_pending()
+
+    def __put_pending(self) -> int:
+        """Put the pending values to the send queue, holding the lock
+
+        :return: Number of messages put
+        :rtype: int
+        """
+        pending, self.__pending = self.__pending, dict()
+        write_time = time.time()
+        messages = []
+        for key, (key_messages, is_coalesced) in pending.items():
+            messages.extend(key_messages)
+            if is_coalesced:
+                self.__written[key] = (key_messages, write_time)
+        self.__send_q.put_many(messages)
+        return len(messages)
+
+    def __flush_pending(self) -> None:
+        """Put the pending values to the send queue as they are written
+
+        :return: None
+        """
+        while True:
+            with self.__cond:
+                self.__cond.wait_for(lambda: self.__pending)
+                nb_messages = self.__put_pending()
+
+            # Values written meanwhile replace each other until the send
+            # task is done with this batch
+            time.sleep(nb_messages / self.__rate)
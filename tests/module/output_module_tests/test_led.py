@@ -27,11 +27,11 @@ class TestLed(unittest.TestCase):
         sent_messages = []
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(Led.request_property(
+        self.assertFalse(Led.request_property(
             -1, Led.PropertyType.RED) in sent_messages)
-        self.assertTrue(Led.request_property(
+        self.assertFalse(Led.request_property(
             -1, Led.PropertyType.GREEN) in sent_messages)
-        self.assertTrue(Led.request_property(
+        self.assertFalse(Led.request_property(
             -1, Led.PropertyType.BLUE) in sent_messages)
         self.assertTrue(set_message in sent_messages)
 
@@ -44,11 +44,11 @@ class TestLed(unittest.TestCase):
         sent_messages = []
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(Led.request_property(
+        self.assertFalse(Led.request_property(
             -1, Led.PropertyType.RED) in sent_messages)
-        self.assertTrue(Led.request_property(
+        self.assertFalse(Led.request_property(
             -1, Led.PropertyType.GREEN) in sent_messages)
-        self.assertTrue(Led.request_property(
+        self.assertFalse(Led.request_property(
             -1, Led.PropertyType.BLUE) in sent_messages)
         self.assertTrue(set_message in sent_messages)
 
@@ -61,11 +61,11 @@ class TestLed(unittest.TestCase):
         sent_messages = []
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(Led.request_property(
+        self.assertFalse(Led.request_property(
             -1, Led.PropertyType.RED) in sent_messages)
-        self.assertTrue(Led.request_property(
+        self.assertFalse(Led.request_property(
             -1, Led.PropertyType.GREEN) in sent_messages)
-        self.assertTrue(Led.request_property(
+        self.assertFalse(Led.request_property(
             -1, Led.PropertyType.BLUE) in sent_messages)
         self.assertTrue(set_message in sent_messages)
 
@@ -78,14 +78,25 @@ class TestLed(unittest.TestCase):
         self.led.red = 20
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(Led.request_property(
+        self.assertFalse(Led.request_property(
             -1, Led.PropertyType.RED) in sent_messages)
-        self.assertTrue(Led.request_property(
+        self.assertFalse(Led.request_property(
             -1, Led.PropertyType.GREEN) in sent_messages)
-        self.assertTrue(Led.request_property(
+        self.assertFalse(Led.request_property(
             -1, Led.PropertyType.BLUE) in sent_messages)
         self.assertTrue(set_message in sent_messages)
 
+    def test_set_red_commanded(self):
+        """Test set_red method keeps the commanded green and blue."""
+        self.led.rgb = (10, 100, 200)
+        self.led.red = 20
+        set_message = parse_message(0x04, 16, -1, parse_data(
+            (20, 100, 200), 'int'))
+        sent_messages = []
+        while not self.send_q.empty():
+            sent_messages.append(self.send_q.get_nowait())
+        self.assertEqual(sent_messages[-1], set_message)
+
     def test_get_red(self):
         """Test get_red method with none input."""
         _ = self.led.red
@@ -102,11 +113,11 @@ class TestLed(unittest.TestCase):
         self.led.green = 20
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(Led.request_property(
+        self.assertFalse(Led.request_property(
             -1, Led.PropertyType.RED) in sent_messages)
-        self.assertTrue(Led.request_property(
+        self.assertFalse(Led.request_property(
             -1, Led.PropertyType.GREEN) in sent_messages)
-        self.assertTrue(Led.request_property(
+        self.assertFalse(Led.request_property(
             -1, Led.PropertyType.BLUE) in sent_messages)
         self.assertTrue(set_message in sent_messages)
 
@@ -126,11 +137,11 @@ class TestLed(unittest.TestCase):
         self.led.blue = 20
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(Led.request_property(
+        self.assertFalse(Led.request_property(
             -1, Led.PropertyType.RED) in sent_messages)
-        self.assertTrue(Led.request_property(
+        self.assertFalse(Led.request_property(
             -1, Led.PropertyType.GREEN) in sent_messages)
-        self.assertTrue(Led.request_property(
+        self.assertFalse(Led.request_property(
             -1, Led.PropertyType.BLUE) in sent_messages)
         self.assertTrue(set_message in sent_messages)
 
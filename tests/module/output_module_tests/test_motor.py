@@ -35,10 +35,10 @@ class TestMotor(unittest.TestCase):
         sent_messages = []
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(
+        self.assertFalse(
             Motor.request_property(
                 -1, Motor.PropertyType.FIRST_TORQUE) in sent_messages)
-        self.assertTrue(
+        self.assertFalse(
             Motor.request_property(
                 -1, Motor.PropertyType.SECOND_TORQUE) in sent_messages)
         self.assertTrue(
@@ -57,7 +57,7 @@ class TestMotor(unittest.TestCase):
         sent_messages = []
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(
+        self.assertFalse(
             Motor.request_property(
                 -1, Motor.PropertyType.FIRST_TORQUE) in sent_messages)
         self.assertTrue(
@@ -72,7 +72,7 @@ class TestMotor(unittest.TestCase):
         sent_messages = []
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(
+        self.assertFalse(
             Motor.request_property(
                 -1, Motor.PropertyType.SECOND_TORQUE) in sent_messages)
         self.assertTrue(
@@ -124,10 +124,10 @@ class TestMotor(unittest.TestCase):
         sent_messages = []
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(
+        self.assertFalse(
             Motor.request_property(
                 -1, Motor.PropertyType.FIRST_SPEED) in sent_messages)
-        self.assertTrue(
+        self.assertFalse(
             Motor.request_property(
                 -1, Motor.PropertyType.SECOND_SPEED) in sent_messages)
         self.assertTrue(
@@ -146,7 +146,7 @@ class TestMotor(unittest.TestCase):
         sent_messages = []
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(
+        self.assertFalse(
             Motor.request_property(
                 -1, Motor.PropertyType.FIRST_SPEED) in sent_messages)
         self.assertTrue(
@@ -161,7 +161,7 @@ class TestMotor(unittest.TestCase):
         sent_messages = []
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(
+        self.assertFalse(
             Motor.request_property(
                 -1, Motor.PropertyType.SECOND_SPEED) in sent_messages)
         self.assertTrue(
@@ -213,10 +213,10 @@ class TestMotor(unittest.TestCase):
         sent_messages = []
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(
+        self.assertFalse(
             Motor.request_property(
                 -1, Motor.PropertyType.FIRST_DEGREE) in sent_messages)
-        self.assertTrue(
+        self.assertFalse(
             Motor.request_property(
                 -1, Motor.PropertyType.SECOND_DEGREE) in sent_messages)
         self.assertTrue(
@@ -235,7 +235,7 @@ class TestMotor(unittest.TestCase):
         sent_messages = []
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(
+        self.assertFalse(
             Motor.request_property(
                 -1, Motor.PropertyType.FIRST_DEGREE) in sent_messages)
         self.assertTrue(
@@ -250,7 +250,7 @@ class TestMotor(unittest.TestCase):
         sent_messages = []
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(
+        self.assertFalse(
             Motor.request_property(
                 -1, Motor.PropertyType.SECOND_DEGREE) in sent_messages)
         self.assertTrue(
@@ -27,10 +27,10 @@ class TestSpeaker(unittest.TestCase):
         sent_messages = []
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(
+        self.assertFalse(
             Speaker.request_property(
                 -1, Speaker.PropertyType.FREQUENCY) in sent_messages)
-        self.assertTrue(
+        self.assertFalse(
             Speaker.request_property(
                 -1, Speaker.PropertyType.VOLUME) in sent_messages)
         self.assertTrue(
@@ -59,10 +59,10 @@ class TestSpeaker(unittest.TestCase):
         sent_messages = []
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(
+        self.assertFalse(
             Speaker.request_property(
                 -1, Speaker.PropertyType.FREQUENCY) in sent_messages)
-        self.assertTrue(
+        self.assertFalse(
             Speaker.request_property(
                 -1, Speaker.PropertyType.VOLUME) in sent_messages)
         self.assertTrue(
@@ -70,6 +70,20 @@ class TestSpeaker(unittest.TestCase):
                 0x04, 16, -1, parse_data(
                     expected_values, 'float')) in sent_messages)
 
+    def test_set_volume_commanded(self):
+        """Test set_volume method keeps the commanded frequency."""
+        self.speaker.tune = (self.speaker.Scale.F_RA_6.value, 30)
+        self.speaker.volume = 50
+        sent_messages = []
+        while not self.send_q.empty():
+            sent_messages.append(self.send_q.get_nowait())
+        self.assertEqual(sent_messages, [
+            parse_message(0x04, 16, -1, parse_data(
+                (self.speaker.Scale.F_RA_6.value, 30), 'float')),
+            parse_message(0x04, 16, -1, parse_data(
+                (self.speaker.Scale.F_RA_6.value, 50), 'float')),
+        ])
+
     def test_get_frequency(self):
         """Test get_frequency method with none input."""
         _ = self.speaker.frequency
@@ -85,10 +99,10 @@ class TestSpeaker(unittest.TestCase):
         sent_messages = []
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(
+        self.assertFalse(
             Speaker.request_property(
                 -1, Speaker.PropertyType.FREQUENCY) in sent_messages)
-        self.assertTrue(
+        self.assertFalse(
             Speaker.request_property(
                 -1, Speaker.PropertyType.VOLUME) in sent_messages)
         self.assertTrue(
@@ -110,10 +124,10 @@ class TestSpeaker(unittest.TestCase):
         sent_messages = []
         while not self.send_q.empty():
             sent_messages.append(self.send_q.get_nowait())
-        self.assertTrue(
+        self.assertFalse(
             Speaker.request_property(
                 -1, Speaker.PropertyType.FREQUENCY) in sent_messages)
-        self.assertTrue(
+        self.assertFalse(
             Speaker.request_property(
                 -1, Speaker.PropertyType.VOLUME) in sent_messages)
         self.assertTrue(
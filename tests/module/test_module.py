@@ -0,0 +1,214 @@
+import io
+import unittest
+
+import threading as th
+
+from contextlib import redirect_stderr, redirect_stdout
+
+from queue import Queue
+from modi.module.input_module.gyro import Gyro
+
+
+class TestModule(unittest.TestCase):
+    """Tests for 'Module' class."""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.send_q = Queue()
+        mock_args = (-1, -1, self.send_q)
+        self.module = Gyro(*mock_args)
+
+    def tearDown(self):
+        """Tear down test fixtures, if any."""
+        del self.module
+
+    def test_request_property(self):
+        """Test request_property method."""
+        request = Gyro.request_property(-1, Gyro.PropertyType.ROLL, 300)
+        self.assertEqual(request[-8:-4],
+                         bytes((Gyro.PropertyType.ROLL, 0, 44, 1)))
+        self.assertRaises(
+            ValueError, Gyro.request_property, -1, 3, 0x10000
+        )
+
+    def test_subscribe(self):
+        """Test subscribe method."""
+        values = []
+        self.module.subscribe(Gyro.PropertyType.ROLL, 20, values.append)
+        self.assertEqual(
+            self.send_q.get(),
+            Gyro.request_property(-1, Gyro.PropertyType.ROLL, 20)
+        )
+        self.module.update_property(Gyro.PropertyType.ROLL, 1.5)
+        self.assertEqual(values, [1.5])
+
+        # Subscribed properties are read without requests
+        self.assertEqual(self.module.roll, 1.5)
+        self.assertTrue(self.send_q.empty())
+
+    def test_subscribe_failing_callback(self):
+        """Test a callback which raises does not stop the updates."""
+        values = []
+
+        def fail(value):
+            raise ValueError(value)
+
+        self.module.subscribe(Gyro.PropertyType.ROLL, 20, fail)
+        self.module.subscribe(Gyro.PropertyType.ROLL, 20, values.append)
+        with redirect_stderr(io.StringIO()) as output, \
+                redirect_stdout(io.StringIO()):
+            self.module.update_property(Gyro.PropertyType.ROLL, 1.5)
+            self.module.update_property(Gyro.PropertyType.ROLL, 2.5)
+        self.assertIn("ValueError", output.getvalue())
+        self.assertEqual(values, [1.5, 2.5])
+        self.assertEqual(self.module.roll, 2.5)
+
+    def test_subscribe_stale(self):
+        """Test a subscribed property is requested again once stale."""
+        self.module.subscribe(Gyro.PropertyType.ROLL, 20)
+        self.send_q.get()
+        self.module.update_property(Gyro.PropertyType.ROLL, 1.5)
+        prop = self.module._properties[Gyro.PropertyType.ROLL]
+        prop.last_update_time -= 1
+        prop.last_request_time -= 1
+        _ = self.module.roll
+        self.assertEqual(
+            self.send_q.get_nowait(),
+            Gyro.request_property(-1, Gyro.PropertyType.ROLL, 20)
+        )
+
+        # It is not requested again until a few more periods have passed
+        _ = self.module.roll
+        self.assertTrue(self.send_q.empty())
+
+    def test_resubscribe(self):
+        """Test resubscribe method."""
+        self.module.subscribe(Gyro.PropertyType.ROLL, 20)
+        self.module.read(Gyro.PropertyType.PITCH)
+        while not self.send_q.empty():
+            self.send_q.get()
+        self.module.resubscribe()
+        self.assertEqual(
+            self.send_q.get_nowait(),
+            Gyro.request_property(-1, Gyro.PropertyType.ROLL, 20)
+        )
+        self.assertTrue(self.send_q.empty())
+
+    def test_unsubscribe(self):
+        """Test unsubscribe method."""
+        values = []
+        self.module.subscribe(Gyro.PropertyType.ROLL, 20, values.append)
+        self.module.unsubscribe(Gyro.PropertyType.ROLL, values.append)
+        self.module.update_property(Gyro.PropertyType.ROLL, 1.5)
+        self.assertEqual(values, [])
+
+        # Unsubscribed properties are requested again when they are stale
+        self.module.unsubscribe(Gyro.PropertyType.ROLL)
+        self.module._properties[Gyro.PropertyType.ROLL].last_update_time = 0
+        while not self.send_q.empty():
+            self.send_q.get()
+        _ = self.module.roll
+        self.assertEqual(
+            self.send_q.get(),
+            Gyro.request_property(-1, Gyro.PropertyType.ROLL, 20)
+        )
+
+    def test_read_many(self):
+        """Test read_many method."""
+        property_types = (Gyro.PropertyType.ROLL, Gyro.PropertyType.PITCH)
+        self.assertEqual(self.module.read_many(property_types), (0, 0))
+        for property_type in property_types:
+            self.assertEqual(
+                self.send_q.get_nowait(),
+                Gyro.request_property(-1, property_type)
+            )
+        self.assertTrue(self.send_q.empty())
+
+        # Updated properties are read without requests
+        self.module.update_property(Gyro.PropertyType.ROLL, 1.5)
+        self.module.update_property(Gyro.PropertyType.PITCH, 2.5)
+        self.assertEqual(self.module.read_many(property_types), (1.5, 2.5))
+        self.assertTrue(self.send_q.empty())
+
+    def test_read_many_timeout(self):
+        """Test read_many method waiting for the requested properties."""
+        property_types = (Gyro.PropertyType.ROLL, Gyro.PropertyType.PITCH)
+        self.assertRaises(
+            TimeoutError, self.module.read_many, property_types, 0.01
+        )
+
+        def reply():
+            for property_type in property_types:
+                self.send_q.get()
+                self.module.update_property(property_type, 1.5)
+
+        self.module._properties.clear()
+        while not self.send_q.empty():
+            self.send_q.get()
+        replier = th.Thread(target=reply)
+        replier.start()
+        self.assertEqual(
+            self.module.read_many(property_types, timeout=1), (1.5, 1.5)
+        )
+        replier.join()
+
+    def test_snapshot(self):
+        """Test snapshot method."""
+        self.module.subscribe(Gyro.PropertyType.YAW)
+        self.module.update_property(Gyro.PropertyType.YAW, 1.5)
+        snapshot = self.module.snapshot()
+        self.assertEqual(snapshot.yaw, 1.5)
+        self.assertEqual(len(snapshot), len(Gyro.PropertyType))
+
+    def test_read(self):
+        """Test read method."""
+        self.assertEqual(self.module.read(Gyro.PropertyType.ROLL), (0, 0))
+        self.module.update_property(Gyro.PropertyType.ROLL, 1.5)
+        value, update_time = self.module.read(Gyro.PropertyType.ROLL, 1)
+        self.assertEqual(value, 1.5)
+        self.assertGreater(update_time, 0)
+
+    def test_read_max_age(self):
+        """Test read method waiting for a young value."""
+        self.module.read(Gyro.PropertyType.ROLL)
+        self.module.update_property(Gyro.PropertyType.ROLL, 1.5)
+        self.module._properties[Gyro.PropertyType.ROLL].last_update_time -= 1
+        self.assertRaises(
+            TimeoutError, self.module.read, Gyro.PropertyType.ROLL, 0.5, 0.01
+        )
+
+        updater = th.Timer(
+            0.01, self.module.update_property,
+            (Gyro.PropertyType.ROLL, 2.5)
+        )
+        updater.start()
+        self.assertEqual(
+            self.module.read(Gyro.PropertyType.ROLL, 0.5, 1)[0], 2.5
+        )
+        updater.join()
+
+    def test_wait_for_update(self):
+        """Test wait_for_update method."""
+        self.module.read(Gyro.PropertyType.ROLL)
+        self.module.update_property(Gyro.PropertyType.ROLL, 1.5)
+        self.assertRaises(
+            TimeoutError, self.module.wait_for_update,
+            Gyro.PropertyType.ROLL, 0.01
+        )
+
+        # The same value is still an update
+        updater = th.Timer(
+            0.01, self.module.update_property,
+            (Gyro.PropertyType.ROLL, 1.5)
+        )
+        updater.start()
+        value, update_time = self.module.wait_for_update(
+            Gyro.PropertyType.ROLL, 1
+        )
+        self.assertEqual(value, 1.5)
+        self.assertGreater(update_time, 0)
+        updater.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import asyncio
+import unittest
+
+from unittest import mock
+
+from modi.task.async_ser_task import AsyncSerTask
+from modi.util.msgutil import parse_message
+
+
+class TestAsyncSerTask(unittest.TestCase):
+    """Tests for 'AsyncSerTask' class"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.loop = asyncio.new_event_loop()
+        self.handled = []
+        self.async_ser_task = AsyncSerTask(self.loop, self.handled.extend)
+        self.mock_serial = mock.Mock(in_waiting=0)
+        self.async_ser_task.set_serial(self.mock_serial)
+
+    def tearDown(self):
+        """Tear down test fixtures, if any."""
+        self.loop.close()
+        del self.async_ser_task
+
+    def test_recv_data(self):
+        """Test handling every message of a read at once"""
+        self.mock_serial.read.return_value = (
+            b'{"c":0,"s":1,"d":2,"b":"AAAAAAAAAAA=","l":8}'
+            b'{"c":31,"s":1,"d":2,"b":"AAAAAAAAAAA=","l":8}{"c":'
+        )
+        self.async_ser_task._recv_data()
+        self.mock_serial.read.assert_called_once_with(1)
+        self.assertEqual(self.handled, [parse_message(0x00, 1, 2),
+                                        parse_message(0x1F, 1, 2)])
+
+    def test_put_many(self):
+        """Test writing messages with a single write"""
+        self.async_ser_task.put_many([parse_message(0x04, 16, 3, (1, 2)),
+                                      '{"c":0}'])
+        self.mock_serial.write.assert_called_once_with(
+            b'{"c":4,"s":16,"d":3,"b":"AQI=","l":2}{"c":0}'
+        )
+
+    @mock.patch("modi.task.async_ser_task.serial.Serial")
+    def test_open_conn(self, mock_serial):
+        """Test the port is opened with a write timeout"""
+        async_ser_task = AsyncSerTask(self.loop, self.handled.extend,
+                                      port="TestDevice")
+        with mock.patch.object(AsyncSerTask, "_AsyncSerTask__find_port",
+                               return_value="TestDevice"), \
+                mock.patch.object(self.loop, "add_reader"):
+            async_ser_task.open_conn()
+        mock_serial.assert_called_once_with(
+            "TestDevice", baudrate=921600, timeout=0,
+            write_timeout=AsyncSerTask.WRITE_TIMEOUT, exclusive=True
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
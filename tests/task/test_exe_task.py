@@ -1,8 +1,13 @@
 import unittest
 
+import threading as th
+
 from queue import Queue
+from unittest import mock
 from modi.task.exe_task import ExeTask
+from modi.module.input_module.gyro import Gyro
 from modi.util.msgutil import parse_message
+from modi.util.queues import CommunicationQueue
 
 
 class TestExeTask(unittest.TestCase):
@@ -11,7 +16,7 @@ class TestExeTask(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures, if any."""
         self.send_q = Queue()
-        self.recv_q = Queue()
+        self.recv_q = CommunicationQueue()
         self.topology_data = dict()
         self.mock_kwargs = {"recv_q": self.recv_q,
                             "send_q": self.send_q,
@@ -33,12 +38,96 @@ class TestExeTask(unittest.TestCase):
                                           0xff, 0xff,
                                           0xff, 0xff,
                                           3712, None))
+        self.assertFalse(self.exe_task.topology_updated.is_set())
         self.recv_q.put(topology_message)
         self.exe_task.run(0.1)
+        self.assertTrue(self.exe_task.topology_updated.is_set())
         self.assertEqual(len(self.topology_data), 1)
         self.assertTrue(-1 in self.topology_data)
         self.assertTrue(self.topology_data[-1]['b'] == 3712)
 
+    def test_run_batch(self):
+        topology_messages = [
+            parse_message(0x07, source, 0, (0xff, 0xff, 0xff, 0xff,
+                                            0xff, 0xff, 0xff, 0xff))
+            for source in (-1, -2, -3)
+        ]
+        self.recv_q.put_many(topology_messages)
+        self.exe_task.run(1)
+        self.assertEqual(set(self.topology_data), {-1, -2, -3})
+
+    def test_run_timeout(self):
+        self.exe_task.run(0.01)
+        self.assertEqual(self.topology_data, dict())
+
+    def test_update_property(self):
+        gyros = [Gyro(module_id, module_id, self.send_q)
+                 for module_id in range(1, 101)]
+        for gyro in gyros:
+            gyro._fetch_property(Gyro.PropertyType.ROLL)
+        self.exe_task._modules.extend(gyros)
+        self.recv_q.put(parse_message(0x1F, 42, Gyro.PropertyType.ROLL,
+                                      (0, 0, 0x20, 0x41)))
+        self.exe_task.run(1)
+        self.assertEqual(gyros[41]._properties[Gyro.PropertyType.ROLL].value,
+                         10.0)
+        self.assertEqual(gyros[40]._properties[Gyro.PropertyType.ROLL].value,
+                         0)
+
+    def test_update_health(self):
+        gyro = Gyro(1, 100, self.send_q)
+        self.exe_task._modules.append(gyro)
+        self.exe_task._module_ids = {1: {"timestamp": 0, "uuid": 100}}
+        self.recv_q.put(parse_message(0x00, 2, 0, (0, 0, 0, 100)))
+        self.exe_task.run(1)
+        self.assertFalse(gyro.is_connected)
+        self.assertEqual(self.exe_task._module_ids[2]["battery"], 100)
+
+    def test_update_modules_version(self):
+        self.exe_task._module_ids = dict()
+        self.exe_task._init_event = th.Event()
+        skeleton_version = mock.Mock()
+        skeleton_version.get.return_value = None
+        with mock.patch.object(ExeTask, "skeleton_version", skeleton_version):
+            # Gyro module of version 1.2.3
+            self.recv_q.put(parse_message(
+                0x05, 3, 0, (1, 0, 0, 0, 0x10, 0x20, 0x03, 0x22)
+            ))
+            self.exe_task.run(1)
+        gyro = self.exe_task._modules[0]
+        self.assertIsInstance(gyro, Gyro)
+        self.assertIsNone(gyro.is_up_to_date)
+
+        # The module is checked once the version is fetched
+        update_latest_version = skeleton_version.get.call_args[0][0]
+        update_latest_version("1.2.4")
+        self.assertFalse(gyro.is_up_to_date)
+        self.assertTrue(self.exe_task.firmware_update_message_flag)
+
+    def test_update_modules_reconnect(self):
+        self.exe_task._module_ids = dict()
+        gyro = Gyro(3, 0x201000000001, self.send_q)
+        gyro.subscribe(Gyro.PropertyType.ROLL, 20)
+        gyro.set_connection_state(connection_state=False)
+        self.exe_task._modules.append(gyro)
+        while not self.send_q.empty():
+            self.send_q.get()
+
+        # The gyro sends its information again once reconnected
+        skeleton_version = mock.Mock()
+        skeleton_version.get.return_value = None
+        with mock.patch.object(ExeTask, "skeleton_version", skeleton_version):
+            self.recv_q.put(parse_message(
+                0x05, 3, 0, (1, 0, 0, 0, 0x10, 0x20, 0x03, 0x22)
+            ))
+            self.exe_task.run(1)
+        self.assertTrue(gyro.is_connected)
+        messages = []
+        while not self.send_q.empty():
+            messages.append(self.send_q.get())
+        self.assertIn(Gyro.request_property(3, Gyro.PropertyType.ROLL, 20),
+                      messages)
+
 
 if __name__ == "__main__":
     unittest.main()
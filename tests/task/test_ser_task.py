@@ -6,6 +6,8 @@ from queue import Queue
 from serial.tools.list_ports_common import ListPortInfo
 from serial.serialutil import SerialException
 from modi.task.ser_task import SerTask
+from modi.util.queues import CommunicationQueue
+from modi.util.msgutil import parse_message
 
 
 class TestSerTask(unittest.TestCase):
@@ -19,7 +21,8 @@ class TestSerTask(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures, if any."""
-        self.mock_kwargs = {"ser_recv_q": Queue(), "ser_send_q": Queue(),
+        self.mock_kwargs = {"ser_recv_q": CommunicationQueue(),
+                            "ser_send_q": Queue(),
                             "verbose": False}
         self.ser_task = SerTask(**self.mock_kwargs)
 
@@ -53,6 +56,19 @@ class TestSerTask(unittest.TestCase):
         self.ser_task._recv_data()
         self.ser_task.get_serial.read.assert_called_once_with(1)
 
+    def test_recv_data_blocking(self):
+        """Test _read_data method in blocking receive mode"""
+        ser_task = SerTask(**self.mock_kwargs, recv_mode="block")
+        mock_serial = self.MockSerial()
+        mock_serial.read = mock.Mock(side_effect=[
+            b'{', b'"c":31,"s":1,"d":2,"b":"AAAAAAAAAAA=","l":8}'
+        ])
+        ser_task.set_serial(mock_serial)
+        ser_task._recv_data()
+        mock_serial.read.assert_has_calls([mock.call(1), mock.call(1)])
+        self.assertEqual(ser_task._ser_recv_q.get(timeout=1),
+                         parse_message(0x1F, 1, 2))
+
     def test_send_data(self):
         """Test _write_data method"""
         self.ser_task.set_serial(self.MockSerial())
@@ -60,6 +76,15 @@ class TestSerTask(unittest.TestCase):
         self.ser_task._send_data()
         self.ser_task.get_serial.write.assert_called_once_with("foo".encode())
 
+    def test_send_binary_data(self):
+        """Test _write_data method with a binary message"""
+        self.ser_task.set_serial(self.MockSerial())
+        self.ser_task._ser_send_q.put(parse_message(0x04, 16, 3, (1, 2)))
+        self.ser_task._send_data()
+        self.ser_task.get_serial.write.assert_called_once_with(
+            b'{"c":4,"s":16,"d":3,"b":"AQI=","l":2}'
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -6,6 +6,7 @@ from queue import Queue
 from serial.tools.list_ports_common import ListPortInfo
 from serial.serialutil import SerialException
 from modi.task.spp_task import SppTask
+from modi.util.queues import CommunicationQueue
 
 
 class TestSppTask(unittest.TestCase):
@@ -19,7 +20,8 @@ class TestSppTask(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures, if any."""
-        self.mock_kwargs = {'spp_recv_q': Queue(), 'spp_send_q': Queue(),
+        self.mock_kwargs = {'spp_recv_q': CommunicationQueue(),
+                            'spp_send_q': Queue(),
                             'module_uuid': None, 'verbose': False}
         self.spp_task = SppTask(**self.mock_kwargs)
 
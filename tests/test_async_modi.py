@@ -0,0 +1,199 @@
+import struct
+import asyncio
+import unittest
+
+from unittest import mock
+
+from modi.async_modi import AsyncMODI
+from modi.task.async_ser_task import AsyncSerTask
+from modi.module.input_module.gyro import Gyro
+from modi.module.output_module.led import Led
+from modi.util.msgutil import parse_data, parse_message, message_to_json
+
+
+class TestAsyncMODI(unittest.TestCase):
+    """Tests for 'AsyncMODI' class"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.loop = asyncio.new_event_loop()
+        self.mock_serial = mock.Mock(out_waiting=0)
+
+        def open_conn(conn_task):
+            conn_task.set_serial(self.mock_serial)
+
+        self.bundle = AsyncMODI()
+        with mock.patch.object(AsyncSerTask, "open_conn", open_conn):
+            self.loop.run_until_complete(self.bundle.open())
+        self.bundle._modules.append(Gyro(5, -1, self.bundle._conn_task))
+        self.bundle._modules.append(Led(6, -1, self.bundle._conn_task))
+
+    def tearDown(self):
+        """Tear down test fixtures, if any."""
+        self.loop.close()
+        del self.bundle
+
+    def written(self, message):
+        return mock.call(message_to_json(message).encode()) \
+            in self.mock_serial.write.call_args_list
+
+    def update_gyro(self, property_type, value):
+        self.bundle._handle_messages([parse_message(
+            0x1F, 5, property_type, tuple(struct.pack("f", value))
+        )])
+
+    def update_roll(self, roll):
+        self.update_gyro(Gyro.PropertyType.ROLL, roll)
+
+    def test_read(self):
+        """Test awaiting the first update of a property"""
+        gyro = self.bundle.gyros[0]
+
+        async def read_roll():
+            read = asyncio.ensure_future(gyro.read(Gyro.PropertyType.ROLL))
+            await asyncio.sleep(0)
+            self.assertFalse(read.done())
+            self.update_roll(12.5)
+            return await read
+
+        roll, update_time = self.loop.run_until_complete(read_roll())
+        self.assertEqual(roll, 12.5)
+        self.assertGreater(update_time, 0)
+        self.assertTrue(self.written(
+            Gyro.request_property(5, Gyro.PropertyType.ROLL)
+        ))
+
+    def test_read_max_age(self):
+        """Test awaiting a value younger than the maximum age"""
+        gyro = self.bundle.gyros[0]
+        prop = gyro._fetch_property(Gyro.PropertyType.ROLL)
+        self.update_roll(1.5)
+        prop.last_update_time -= 1
+        self.assertEqual(
+            self.loop.run_until_complete(gyro.read(Gyro.PropertyType.ROLL))[0],
+            1.5
+        )
+
+        async def read_young_roll():
+            read = asyncio.ensure_future(
+                gyro.read(Gyro.PropertyType.ROLL, 0.5)
+            )
+            await asyncio.sleep(0)
+            self.assertFalse(read.done())
+            self.update_roll(12.5)
+            return await read
+
+        self.assertEqual(self.loop.run_until_complete(read_young_roll())[0],
+                         12.5)
+
+    def test_updates(self):
+        """Test iterating over the updates of a property"""
+        gyro = self.bundle.gyros[0]
+
+        async def iterate_roll():
+            rolls = []
+            async for roll in gyro.updates(Gyro.PropertyType.ROLL):
+                rolls.append(roll)
+                if len(rolls) == 3:
+                    return rolls
+
+        iteration = self.loop.create_task(iterate_roll())
+        self.loop.run_until_complete(asyncio.sleep(0))
+        for roll in (1, 2, 3):
+            self.update_roll(roll)
+        self.assertEqual(self.loop.run_until_complete(iteration), [1, 2, 3])
+
+    def test_read_many(self):
+        """Test awaiting the first update of several properties"""
+        gyro = self.bundle.gyros[0]
+
+        async def read_many():
+            read = asyncio.ensure_future(gyro.read(Gyro.PropertyType.PITCH))
+            await asyncio.sleep(0)
+            self.update_gyro(Gyro.PropertyType.PITCH, 2.5)
+            await read
+            read = asyncio.ensure_future(gyro.read_many(
+                (Gyro.PropertyType.ROLL, Gyro.PropertyType.PITCH)
+            ))
+            await asyncio.sleep(0)
+            self.assertFalse(read.done())
+            self.update_roll(12.5)
+            return await read
+
+        self.assertEqual(self.loop.run_until_complete(read_many()),
+                         (12.5, 2.5))
+
+    def test_wait_for_update(self):
+        """Test awaiting the next update of a property"""
+        gyro = self.bundle.gyros[0]
+        self.update_roll(1.5)
+
+        async def wait_roll():
+            wait = asyncio.ensure_future(
+                gyro.wait_for_update(Gyro.PropertyType.ROLL)
+            )
+            await asyncio.sleep(0)
+            self.assertFalse(wait.done())
+            self.update_roll(12.5)
+            return await wait
+
+        value, update_time = self.loop.run_until_complete(wait_roll())
+        self.assertEqual(value, 12.5)
+        self.assertGreater(update_time, 0)
+        self.assertRaises(
+            asyncio.TimeoutError, self.loop.run_until_complete,
+            gyro.wait_for_update(Gyro.PropertyType.ROLL, 0.01)
+        )
+
+    @mock.patch("modi.task.conn_task.ConnTask.is_network_module_connected",
+                return_value=True)
+    def test_open_topology(self, _):
+        """Test opening a bundle sorts the modules by their position"""
+        def open_conn(conn_task):
+            conn_task.set_serial(self.mock_serial)
+
+        def module_info(module_id):
+            return parse_message(0x05, module_id, 0, (
+                module_id, 0, 0, 0, 0x10, 0x20, 0x03, 0x22
+            ))
+
+        def topology(module_id, right=0xFFFF, left=0xFFFF):
+            return parse_message(0x07, module_id, 0, (
+                right & 0xFF, right >> 8, 0xFF, 0xFF,
+                left & 0xFF, left >> 8, 0xFF, 0xFF,
+            ))
+
+        # The gyro connected first is the farthest from the network module
+        bundle = AsyncMODI(2)
+
+        async def open_bundle():
+            with mock.patch.object(AsyncSerTask, "open_conn", open_conn):
+                opening = asyncio.ensure_future(bundle.open(1))
+                await asyncio.sleep(0)
+            bundle._handle_messages([module_info(5), module_info(6)])
+            await asyncio.sleep(0)
+            self.assertFalse(opening.done())
+            bundle._handle_messages([
+                topology(1, right=6), topology(6, 5, 1), topology(5, left=6)
+            ])
+            await opening
+
+        self.loop.run_until_complete(open_bundle())
+        self.assertEqual([gyro.id for gyro in bundle.gyros], [6, 5])
+        self.assertEqual(bundle.gyros[1].position, (2, 0))
+
+    def test_wait_for_module(self):
+        """Test waiting for a module is refused"""
+        self.assertRaises(TypeError, self.bundle.gyros.wait_for, 1, 1)
+
+    def test_set_property(self):
+        """Test awaiting set_property"""
+        led = self.bundle.leds[0]
+        self.loop.run_until_complete(led.set_property("rgb", (1, 2, 3)))
+        self.assertTrue(self.written(parse_message(
+            0x04, Led.CommandType.SET_RGB, 6, parse_data((1, 2, 3), 'int')
+        )))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+import threading as th
+
+from unittest import mock
+
+from modi._conn_thrd import ConnThrd
+from modi.util.queues import CommunicationQueue
+
+
+class TestConnThrd(unittest.TestCase):
+    """Tests for 'ConnThrd' class"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.recv_q = CommunicationQueue("thread")
+        self.send_q = CommunicationQueue("thread")
+        self.init_flag = th.Event()
+
+    @mock.patch("modi.task.conn_task.ConnTask.is_on_pi", return_value=False)
+    @mock.patch("modi.task.ser_task.SerTask")
+    def test_run(self, mock_ser_task, _):
+        """Test running the connection task in the current process"""
+        conn_thrd = ConnThrd(self.recv_q, self.send_q, "serial", "", False,
+                             self.init_flag, "TestDevice", "block")
+        mock_ser_task.assert_called_once_with(
+            self.recv_q, self.send_q, False, "TestDevice", "block"
+        )
+        conn_thrd.daemon = True
+        conn_thrd.start()
+        self.assertTrue(self.init_flag.wait(1))
+        conn_thrd.join(1)
+        task = mock_ser_task.return_value
+        task.open_conn.assert_called_once_with()
+        task.run_recv_data.assert_called_once_with(0.001)
+        task.run_send_data.assert_called_once_with(0.001)
+
+
+if __name__ == "__main__":
+    unittest.main()
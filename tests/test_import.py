@@ -0,0 +1,40 @@
+import os
+import sys
+import unittest
+import subprocess
+
+
+class TestImport(unittest.TestCase):
+    """Tests for the modules imported by 'import modi'"""
+
+    # Dependencies which are imported only when they are used
+    LAZY_MODULES = ("can", "requests", "asyncio", "serial.tools.list_ports",
+                    "modi.async_modi", "modi.task.can_task",
+                    "modi.task.conn_task")
+
+    def __import_modi(self, statement):
+        env = dict(os.environ, MODI_VERSION_CHECK="0", MODI_OFFLINE="1")
+        return subprocess.run(
+            [sys.executable, "-c", f"import sys; {statement}; "
+             f"print(','.join(sorted(sys.modules)))"],
+            stdout=subprocess.PIPE, env=env, check=True,
+            universal_newlines=True,
+        ).stdout.split()[-1].split(",")
+
+    def test_lazy_imports(self):
+        """Test importing modi does not import the lazy dependencies"""
+        imported_modules = self.__import_modi("import modi")
+        for module_name in self.LAZY_MODULES:
+            self.assertNotIn(module_name, imported_modules)
+
+    @unittest.skipIf(sys.version_info < (3, 7), "needs module __getattr__")
+    def test_async_modi(self):
+        """Test AsyncMODI is imported when it is used"""
+        imported_modules = self.__import_modi(
+            "import modi; modi.AsyncMODI"
+        )
+        self.assertIn("modi.async_modi", imported_modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
 import unittest
 
+import threading as th
+
 from unittest import mock
 
 from modi.modi import MODI
@@ -22,6 +24,33 @@ from modi.module.output_module.motor import Motor
 from modi.module.output_module.speaker import Speaker
 
 from modi.util.misc import module_list
+from modi.util.msgutil import parse_message, message_to_json
+from modi.util.queues import CommunicationQueue
+
+
+class MockSerTask:
+    """Serial task of a single gyro module answering the uuid request"""
+
+    def __init__(self, recv_q, send_q, verbose, port, recv_mode):
+        self.recv_q = recv_q
+        self.send_q = send_q
+
+    def open_conn(self):
+        pass
+
+    def run_recv_data(self, delay):
+        th.Event().wait()
+
+    def run_send_data(self, delay):
+        while True:
+            if self.send_q.get()[0] == 0x08:
+                self.recv_q.put(parse_message(
+                    0x05, 1, 0, (1, 0, 0, 0, 0x10, 0x20, 0x03, 0x22)
+                ))
+                self.recv_q.put(parse_message(
+                    0x07, 1, 0, (0xFF, 0xFF, 0xFF, 0xFF,
+                                 0xFF, 0xFF, 0xFF, 0xFF)
+                ))
 
 
 class TestModi(unittest.TestCase):
@@ -64,12 +93,53 @@ class TestModi(unittest.TestCase):
         # self.assertListEqual(self.modi._modules, list())
         self.assertDictEqual(self.modi._module_ids, dict())
 
+    def test_startup_timings(self):
+        """Test timings of the startup phases."""
+        self.assertDictEqual(self.modi.startup_timings, dict())
+
+    @mock.patch("modi.task.conn_task.ConnTask._list_modi_ports",
+                return_value=[])
+    @mock.patch("modi.task.conn_task.ConnTask.is_on_pi", return_value=False)
+    @mock.patch("modi.task.ser_task.SerTask", MockSerTask)
+    def test_startup(self, *_):
+        """Test starting up a bundle of a single module."""
+        bundle = MODI(1, process_mode="thread")
+        self.assertIsInstance(bundle.gyros[0], Gyro)
+        self.assertEqual(bundle.gyros[0].position, (0, 0))
+        self.assertListEqual(list(bundle.startup_timings),
+                             ["start", "connection", "modules", "topology"])
+
+    def test_recv(self):
+        """Test received messages are returned serialized in json."""
+        message = parse_message(0x1F, 5, 2, (1, 2))
+        self.modi._recv_q = CommunicationQueue("thread")
+        self.assertIsNone(self.modi.recv())
+        self.modi._recv_q.put(message)
+        self.assertEqual(self.modi.recv(), message_to_json(message))
+
+    def test_recv_raw(self):
+        """Test received messages are returned in binary."""
+        message = parse_message(0x1F, 5, 2, (1, 2))
+        self.modi._recv_q = CommunicationQueue("thread")
+        self.assertIsNone(self.modi.recv_raw())
+        self.modi._recv_q.put(message)
+        self.assertEqual(self.modi.recv_raw(), message)
+
     def test_get_modules(self):
         """Test modules getter method."""
         actual_modules = self.modi.modules
         self.assertIsInstance(actual_modules, tuple)
         self.assertTupleEqual(actual_modules, tuple(self.modi._modules))
 
+    def test_get_module_list(self):
+        """Test module lists are kept between accesses."""
+        leds = self.modi.leds
+        self.assertIs(self.modi.leds, leds)
+
+        self.modi._modules = self.modi._modules[:-3]
+        self.assertIsNot(self.modi.leds, leds)
+        self.assertEqual(self.modi.leds, [])
+
     def test_get_buttons(self):
         """Test buttons getter method."""
         actual_modules = self.modi.buttons
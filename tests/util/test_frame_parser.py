@@ -0,0 +1,47 @@
+import unittest
+
+from modi.util.frame_parser import FrameParser
+
+
+class TestFrameParser(unittest.TestCase):
+    """Tests for 'FrameParser' class"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.frame_parser = FrameParser()
+
+    def tearDown(self):
+        """Tear down test fixtures, if any."""
+        del self.frame_parser
+
+    def test_feed_burst(self):
+        """Test feed method with several frames in one chunk"""
+        frames = ['{"c":0,"l":8}', '{"c":31,"l":8}', '{"c":7,"l":8}']
+        self.assertEqual(
+            self.frame_parser.feed("".join(frames).encode()), frames
+        )
+
+    def test_feed_split_frame(self):
+        """Test feed method with a frame split across chunks"""
+        self.assertEqual(self.frame_parser.feed(b'{"c":0,'), [])
+        self.assertEqual(self.frame_parser.feed(b'"l":8}{"c"'),
+                         ['{"c":0,"l":8}'])
+        self.assertEqual(self.frame_parser.feed(b':7}'), ['{"c":7}'])
+
+    def test_feed_resynchronise(self):
+        """Test feed method skipping garbage and broken frames"""
+        self.assertEqual(
+            self.frame_parser.feed(b'\x00\xff}{"c":0{"c":7}garbage'),
+            ['{"c":7}']
+        )
+        self.assertEqual(self.frame_parser.feed(b'{"c":\xff}{"c":5}'),
+                         ['{"c":5}'])
+
+    def test_feed_unclosed_frame(self):
+        """Test feed method dropping a frame which never gets closed"""
+        self.frame_parser.feed(b'{' + bytes(FrameParser.MAX_FRAME_SIZE))
+        self.assertEqual(self.frame_parser.feed(b'{"c":0}'), ['{"c":0}'])
+
+
+if __name__ == "__main__":
+    unittest.main()
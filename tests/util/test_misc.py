@@ -0,0 +1,137 @@
+import time
+import unittest
+
+import threading as th
+
+from unittest import mock
+
+from modi.module.module import Module
+from modi.module.input_module.gyro import Gyro
+from modi.module.output_module.led import Led
+from modi.module.output_module.motor import Motor
+from modi.util.misc import module_list
+from modi.util.msgutil import parse_data, parse_message
+from modi.util.queues import CommunicationQueue
+from modi.util.write_coalescer import WriteCoalescer
+
+
+class TestModuleList(unittest.TestCase):
+    """Tests for 'module_list' class"""
+
+    def test_refresh(self):
+        """Test the list follows connected and moved modules"""
+        modules = [Led(1, 1, None), Motor(2, 2, None)]
+        modules[0].position = (2, 0)
+        leds = module_list(modules, "led")
+        self.assertEqual(leds, modules[:1])
+
+        modules.append(Led(3, 3, None))
+        modules[2].position = (1, 0)
+        leds.refresh()
+        self.assertEqual(leds, [modules[2], modules[0]])
+
+        modules[2].position = (3, 0)
+        self.assertIs(leds[0], modules[0])
+        self.assertEqual(leds.find(3), 1)
+        self.assertIs(leds.get(3), modules[2])
+        self.assertEqual(leds.find(2), -1)
+        self.assertRaises(Exception, leds.get, 2)
+
+    def test_read_only(self):
+        """Test the list cannot be changed in place"""
+        modules = [Led(1, 1, None), Led(2, 2, None)]
+        leds = module_list(modules, "led", False)
+        self.assertRaises(TypeError, leds.append, modules[0])
+        self.assertRaises(TypeError, leds.pop)
+        self.assertRaises(TypeError, leds.clear)
+        self.assertRaises(TypeError, leds.sort)
+        self.assertRaises(TypeError, leds.__setitem__, 0, modules[1])
+        self.assertRaises(TypeError, leds.__delitem__, 0)
+        with self.assertRaises(TypeError):
+            leds += modules
+        self.assertEqual(leds, modules)
+
+        sublist = leds.sublist()
+        sublist.pop()
+        self.assertEqual(leds, modules)
+
+    def test_wait_for(self):
+        """Test a lazy list wakes up when the module connects"""
+        modules = []
+        leds = module_list(modules, "led")
+        self.assertRaises(TimeoutError, leds.wait_for, 0, 0.01)
+
+        def connect():
+            with Module.registration:
+                modules.append(Led(1, 1, None))
+                Module.registration.notify_all()
+
+        connector = th.Timer(0.01, connect)
+        begin = time.perf_counter()
+        connector.start()
+        self.assertIs(leds[0], modules[0])
+        self.assertLess(time.perf_counter() - begin, 0.09)
+        connector.join()
+
+    def test_set(self):
+        """Test set method sends the messages of every module at once"""
+        send_q = mock.Mock(spec=CommunicationQueue)
+        leds = [Led(module_id, module_id, send_q) for module_id in (1, 2)]
+        module_list(leds, "led").set(rgb=(0, 0, 255))
+        send_q.put_many.assert_called_once_with([
+            parse_message(0x04, 16, module_id, parse_data((0, 0, 255), 'int'))
+            for module_id in (1, 2)
+        ])
+
+    @mock.patch("modi.util.write_coalescer.th.Thread")
+    def test_set_coalesced(self, _):
+        """Test set method puts the values of every module at once"""
+        send_q = CommunicationQueue("thread")
+        write_q = WriteCoalescer(send_q)
+        leds = [Led(module_id, module_id, write_q) for module_id in (1, 2)]
+        with mock.patch.object(write_q, "put_latest") as put_latest:
+            module_list(leds, "led").set(rgb=(0, 0, 255))
+            put_latest.assert_not_called()
+
+        write_q.flush()
+        self.assertEqual(len(send_q.get_many(block=False)), 2)
+        self.assertEqual(leds[1]._commanded[Led.PropertyType.BLUE], 255)
+
+    def test_set_invalid(self):
+        """Test set method sends nothing when a value is invalid"""
+        send_q = mock.Mock(spec=CommunicationQueue)
+        leds = [Led(module_id, module_id, send_q) for module_id in (1, 2)]
+        with self.assertRaises(ValueError):
+            module_list(leds, "led").set(rgb=(0, 0, 256))
+        send_q.put_many.assert_not_called()
+        send_q.put.assert_not_called()
+
+        # The values set before the invalid one are not kept as commanded
+        with self.assertRaises(ValueError):
+            module_list(leds, "led").set(red=10, green=256)
+        self.assertNotIn(Led.PropertyType.RED, leds[0]._commanded)
+        send_q.put_many.assert_not_called()
+
+    def test_set_unknown(self):
+        """Test set method refuses names which are not setters"""
+        send_q = mock.Mock(spec=CommunicationQueue)
+        leds = [Led(module_id, module_id, send_q) for module_id in (1, 2)]
+        with self.assertRaises(AttributeError):
+            module_list(leds, "led").set(rbg=(0, 0, 255))
+        with self.assertRaises(AttributeError):
+            module_list(leds, "led").set(position=(0, 0))
+        self.assertFalse(hasattr(leds[0], "rbg"))
+        send_q.put_many.assert_not_called()
+
+    def test_set_input_modules(self):
+        """Test set method refuses to set input modules"""
+        send_q = mock.Mock(spec=CommunicationQueue)
+        gyros = [Gyro(module_id, module_id, send_q) for module_id in (1, 2)]
+        with self.assertRaises(AttributeError):
+            module_list(gyros, "gyro").set(roll=1)
+        self.assertNotIn("roll", vars(gyros[0]))
+        send_q.put_many.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
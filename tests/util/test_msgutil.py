@@ -0,0 +1,36 @@
+import unittest
+
+from modi.util.msgutil import (
+    parse_message, pack_message, unpack_message, message_to_json,
+    json_to_message, decode_message
+)
+
+
+class TestMsgutil(unittest.TestCase):
+    """Tests for 'msgutil' module"""
+
+    def test_parse_message(self):
+        """Test parse_message function"""
+        message = parse_message(0x04, 16, 3, (10, 20, 30))
+        self.assertEqual(message, pack_message(0x04, 16, 3, b'\x0a\x14\x1e'))
+        self.assertEqual(unpack_message(message), {
+            "c": 0x04, "s": 16, "d": 3, "b": b'\x0a\x14\x1e' + bytes(5),
+            "l": 3
+        })
+
+    def test_json_conversion(self):
+        """Test conversion between binary and json messages"""
+        json_msg = '{"c":31,"s":3000,"d":2,"b":"AACAPwAA","l":6}'
+        message = json_to_message(json_msg)
+        self.assertEqual(message_to_json(message), json_msg)
+        self.assertEqual(decode_message(message)[:3], (31, 3000, 2))
+        self.assertEqual(unpack_message(json_msg), unpack_message(message))
+
+    def test_json_to_message_invalid(self):
+        """Test json_to_message function with invalid messages"""
+        self.assertRaises(ValueError, json_to_message, '{"c":0}')
+        self.assertRaises(ValueError, json_to_message, '{"c":0,')
+
+
+if __name__ == "__main__":
+    unittest.main()
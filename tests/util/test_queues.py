@@ -0,0 +1,86 @@
+import sys
+import time
+import unittest
+
+from modi.util.queues import CommunicationQueue
+from modi.util.msgutil import parse_message
+
+
+class TestCommunicationQueue(unittest.TestCase):
+    """Tests for 'CommunicationQueue' class"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.queue = CommunicationQueue()
+
+    def tearDown(self):
+        """Tear down test fixtures, if any."""
+        del self.queue
+
+    def get_all(self):
+        # Wait for the feeder threads of the queue to flush the messages
+        time.sleep(0.1)
+        messages = []
+        while not self.queue.empty():
+            messages.append(self.queue.get_nowait())
+        return messages
+
+    def test_priority_binary(self):
+        """Test priority of binary messages"""
+        health_message = parse_message(0x00, 1, 2)
+        property_message = parse_message(0x1F, 1, 2)
+        self.queue.put(health_message)
+        self.queue.put(property_message)
+        self.assertEqual(self.get_all(), [property_message, health_message])
+
+    def test_priority_json(self):
+        """Test priority of json serialized messages"""
+        messages = ['{"c":0,"s":1,"d":2,"b":"AA==","l":1}',
+                    'not a json message',
+                    '{"c": 7, "s": 1, "d": 2, "b": "AA==", "l": 1}',
+                    '{"c":4}']
+        for message in messages:
+            self.queue.put(message)
+        self.assertEqual(self.get_all(), [messages[2]] + messages[:2]
+                         + [messages[3]])
+
+    def test_put_many(self):
+        """Test putting and getting a batch of messages"""
+        messages = [parse_message(0x00, 1, 2), parse_message(0x1F, 1, 2),
+                    parse_message(0x00, 3, 2)]
+        self.queue.put_many(messages)
+        self.queue.put_many([])
+        self.assertEqual(self.queue.get_many(timeout=1),
+                         [messages[1], messages[0], messages[2]])
+        self.assertEqual(self.queue.get_many(block=False), [])
+
+    def test_get_blocking_priority(self):
+        """Test blocking get of a message with priority"""
+        property_message = parse_message(0x1F, 1, 2)
+        self.queue.put(property_message)
+        self.assertEqual(self.queue.get(timeout=1), property_message)
+
+    @unittest.skipIf(sys.version_info < (3, 8), "needs shared memory")
+    def test_shared_memory_backend(self):
+        """Test priority of messages carried in shared memory"""
+        comm_q = CommunicationQueue("shared_memory")
+        health_message = parse_message(0x00, 1, 2)
+        property_message = parse_message(0x1F, 1, 2)
+        comm_q.put(health_message)
+        comm_q.put_many([property_message])
+        self.assertEqual(comm_q.get_many(), [property_message, health_message])
+        self.assertRaises(ValueError, CommunicationQueue, "foo")
+
+    def test_thread_backend(self):
+        """Test priority of messages carried in the current process"""
+        comm_q = CommunicationQueue("thread")
+        health_message = parse_message(0x00, 1, 2)
+        property_message = parse_message(0x1F, 1, 2)
+        comm_q.put_many([health_message, property_message])
+        self.assertEqual(comm_q.get_nowait(), property_message)
+        self.assertEqual(comm_q.get_nowait(), health_message)
+        self.assertTrue(comm_q.empty())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import sys
+import queue
+import unittest
+
+import multiprocessing as mp
+
+from modi.util.ring_buffer import RingBuffer
+from modi.util.msgutil import parse_message, message_to_json
+
+
+def produce(ring_buffer, messages):
+    for message in messages:
+        ring_buffer.put(message)
+
+
+@unittest.skipIf(sys.version_info < (3, 8), "needs shared memory")
+class TestRingBuffer(unittest.TestCase):
+    """Tests for 'RingBuffer' class"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.ring_buffer = RingBuffer(capacity=4)
+        self.messages = [parse_message(0x1F, i, 2, (i, 0, 0, 0, 0, 0, 0, 0))
+                         for i in range(10)]
+
+    def tearDown(self):
+        """Tear down test fixtures, if any."""
+        del self.ring_buffer
+
+    def test_put_get(self):
+        """Test writing and reading messages around the ring"""
+        for i in range(0, 9, 3):
+            self.ring_buffer.put(self.messages[i:i + 3])
+            self.assertEqual(self.ring_buffer.get(block=False),
+                             self.messages[i:i + 3])
+        self.assertTrue(self.ring_buffer.empty())
+        self.assertRaises(queue.Empty, self.ring_buffer.get_nowait)
+        self.assertRaises(queue.Empty, self.ring_buffer.get, True, 0.01)
+
+    def test_put_json(self):
+        """Test json serialized messages are converted to binary"""
+        self.ring_buffer.put(message_to_json(self.messages[1]))
+        self.assertEqual(self.ring_buffer.get(timeout=1), [self.messages[1]])
+        self.assertRaises(ValueError, self.ring_buffer.put, "foo")
+        self.assertRaises(ValueError, self.ring_buffer.put, b"foo")
+
+    def test_put_across_process(self):
+        """Test a producer process filling the ring past its capacity"""
+        producer = mp.Process(target=produce,
+                              args=(self.ring_buffer, self.messages))
+        producer.start()
+        received = []
+        while len(received) < len(self.messages):
+            received += self.ring_buffer.get(timeout=5)
+        producer.join()
+        self.assertEqual(received, self.messages)
+
+
+if __name__ == "__main__":
+    unittest.main()
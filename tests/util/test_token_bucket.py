@@ -0,0 +1,39 @@
+import time
+import unittest
+
+from modi.util.token_bucket import TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Tests for 'TokenBucket' class"""
+
+    def test_burst(self):
+        """Test a burst is taken without waiting"""
+        token_bucket = TokenBucket(rate=10, burst=4)
+        for _ in range(4):
+            self.assertEqual(token_bucket.consume(), 0)
+
+    def test_rate(self):
+        """Test tokens are taken at the rate once the burst is taken"""
+        token_bucket = TokenBucket(rate=100, burst=1)
+        begin = time.perf_counter()
+        for _ in range(11):
+            token_bucket.consume()
+        self.assertGreaterEqual(time.perf_counter() - begin, 0.09)
+
+    def test_refill(self):
+        """Test the bucket is refilled up to the burst"""
+        token_bucket = TokenBucket(rate=1000, burst=2)
+        token_bucket.consume(2)
+        time.sleep(0.01)
+        self.assertEqual(token_bucket.consume(2), 0)
+        self.assertGreater(token_bucket.consume(), 0)
+
+    def test_invalid(self):
+        """Test an invalid bucket is refused"""
+        self.assertRaises(ValueError, TokenBucket, 0)
+        self.assertRaises(ValueError, TokenBucket, 10, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import io
+import unittest
+
+import threading as th
+
+from contextlib import redirect_stdout
+from unittest import mock
+
+from modi.module.input_module.gyro import Gyro
+from modi.module.output_module.led import Led
+from modi.util.topology_manager import TopologyManager
+
+GYRO_UUID = 0x201000000001
+LED_UUID = 0x402000000002
+
+
+def topology(uuid, **neighbours):
+    module_data = {'uuid': uuid, 'r': None, 't': None, 'l': None, 'b': None}
+    module_data.update(neighbours)
+    return module_data
+
+
+@mock.patch("modi.task.conn_task.ConnTask.is_network_module_connected",
+            return_value=True)
+class TestTopologyManager(unittest.TestCase):
+    """Tests for 'TopologyManager' class"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.modules = [Gyro(2, GYRO_UUID, None), Led(3, LED_UUID, None)]
+        self.topology_data = dict()
+        self.exe_thrd = mock.Mock()
+        self.topology_manager = TopologyManager(self.topology_data,
+                                                self.modules)
+
+    def tearDown(self):
+        """Tear down test fixtures, if any."""
+        del self.topology_manager
+
+    def test_complete(self, _):
+        """Test the topology is complete once every module sent it"""
+        # Network module, with the gyro on its right and the led on its top
+        self.topology_manager.update_topology(1, topology(None, r=2, t=3))
+        self.assertFalse(
+            self.topology_manager.is_topology_complete(self.exe_thrd)
+        )
+        self.topology_manager.update_topology(2, topology(GYRO_UUID, l=1))
+        self.topology_manager.update_topology(3, topology(LED_UUID, b=1))
+        self.assertTrue(
+            self.topology_manager.is_topology_complete(self.exe_thrd)
+        )
+        self.assertEqual(self.modules[0].position, (1, 0))
+        self.assertEqual(self.modules[1].position, (0, 1))
+
+    def test_network_connected_once(self, mock_connected):
+        """Test the serial ports are listed at the first check only"""
+        self.topology_manager.update_topology(1, topology(None, r=2))
+        for _ in range(3):
+            self.topology_manager.is_topology_complete(self.exe_thrd)
+        mock_connected.assert_called_once_with()
+
+        topology_manager = TopologyManager(dict(), self.modules, False)
+        topology_manager.update_topology(2, topology(GYRO_UUID))
+        topology_manager.update_topology(3, topology(LED_UUID))
+        mock_connected.reset_mock()
+        self.assertFalse(topology_manager.is_topology_complete(self.exe_thrd))
+        mock_connected.assert_not_called()
+
+    def test_request_missing(self, _):
+        """Test the topology of a missing neighbour is requested"""
+        self.topology_manager.update_topology(1, topology(None, r=2))
+        self.assertFalse(
+            self.topology_manager.is_topology_complete(self.exe_thrd)
+        )
+        self.exe_thrd.request_topology.assert_called_once_with(module_id=2)
+
+    @mock.patch("modi.util.topology_manager.time")
+    def test_request_interval(self, mock_time, _):
+        """Test the missing topology is requested once per interval"""
+        mock_time.monotonic.side_effect = (0, 0.05, 0.1)
+        self.topology_manager.update_topology(1, topology(None, r=2))
+        for _ in range(3):
+            self.topology_manager.is_topology_complete(self.exe_thrd)
+        self.assertEqual(self.exe_thrd.request_topology.call_args_list,
+                         [mock.call(module_id=2), mock.call(module_id=2)])
+
+    def test_request_unplaced(self, _):
+        """Test a module not linked to the network module is requested"""
+        self.modules.pop()
+        self.topology_manager.update_topology(1, topology(None))
+        self.topology_manager.update_topology(2, topology(GYRO_UUID))
+        checker = th.Thread(
+            target=self.topology_manager.is_topology_complete,
+            args=(self.exe_thrd,), daemon=True
+        )
+        checker.start()
+        checker.join(1)
+        self.assertFalse(checker.is_alive())
+        self.exe_thrd.request_topology.assert_called_once_with(module_id=2)
+        self.assertFalse(
+            self.topology_manager.is_topology_complete(self.exe_thrd)
+        )
+
+    def test_update_merge(self, _):
+        """Test neighbours already known are kept"""
+        self.topology_manager.update_topology(2, topology(GYRO_UUID, l=1))
+        self.topology_manager.update_topology(2, topology(GYRO_UUID, r=4))
+        self.assertEqual(self.topology_data[2],
+                         topology(GYRO_UUID, r=4, l=1))
+
+    def test_update_uuid(self, _):
+        """Test the uuid of a module registered late is set"""
+        self.topology_manager.update_topology(2, topology(None, l=1))
+        self.topology_manager.update_topology(3, topology(None, l=1))
+        self.assertFalse(self.topology_manager.is_uuid_initialized())
+        self.topology_manager.update_uuid(2, GYRO_UUID)
+        self.assertEqual(self.topology_data[2]['uuid'], GYRO_UUID)
+        self.assertTrue(self.topology_manager.is_uuid_initialized())
+
+    def test_get_topology(self, _):
+        """Test the topology is exported with positions and neighbours"""
+        self.topology_manager.update_topology(1, topology(None, r=2, t=3))
+        self.topology_manager.update_topology(2, topology(GYRO_UUID, l=1))
+        self.topology_manager.update_topology(3, topology(LED_UUID, b=1))
+        modules = self.topology_manager.get_topology()
+        self.assertEqual(modules[1]['type'], 'Network')
+        self.assertEqual(modules[1]['position'], (0, 0))
+        self.assertEqual(modules[2]['type'], 'Gyro')
+        self.assertEqual(modules[2]['position'], (1, 0))
+        self.assertEqual(modules[3]['position'], (0, 1))
+        self.assertDictEqual(modules[3]['neighbours'],
+                             {'r': None, 't': None, 'l': None, 'b': 1})
+
+    def test_get_topology_incomplete(self, _):
+        """Test the topology is exported while neighbours are missing"""
+        self.topology_manager.update_topology(1, topology(None, r=2))
+        self.topology_manager.update_topology(3, topology(LED_UUID))
+        modules = self.topology_manager.get_topology()
+        self.assertEqual(sorted(modules), [1, 3])
+        self.assertEqual(modules[1]['position'], (0, 0))
+        self.assertEqual(modules[1]['neighbours']['r'], 2)
+        self.assertIsNone(modules[3]['position'])
+
+    def test_print_topology_map(self, _):
+        """Test the topology map is printed row by row from the top"""
+        self.topology_manager.update_topology(1, topology(None, r=2, t=3))
+        self.topology_manager.update_topology(2, topology(GYRO_UUID, l=1))
+        self.topology_manager.update_topology(3, topology(LED_UUID, b=1))
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.topology_manager.print_topology_map()
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[2], f"{'Led0':^10}{'':10}")
+        self.assertEqual(lines[3], f"{'Network':^10}{'Gyro0':^10}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import threading as th
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
+
+from modi.util.version_cache import (
+    VersionCache, check_latest_version, parse_pypi_version,
+    parse_skeleton_version, version_to_number
+)
+
+
+class VersionHandler(BaseHTTPRequestHandler):
+    """Stand-in for the server publishing the version"""
+
+    def do_GET(self):
+        self.server.nb_requests += 1
+        if self.server.version is None:
+            self.send_error(404)
+            return
+        content = self.server.version.encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestVersionCache(unittest.TestCase):
+    """Tests for 'VersionCache' class"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.server = HTTPServer(("127.0.0.1", 0), VersionHandler)
+        self.server.version = "v1.2.3"
+        self.server.nb_requests = 0
+        self.server_thread = th.Thread(target=self.server.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/version.txt"
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Tear down test fixtures, if any."""
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.cache_dir)
+
+    def version_cache(self, **kwargs):
+        return VersionCache(self.url, "version",
+                            lambda content: content.decode().lstrip("v"),
+                            cache_dir=self.cache_dir, **kwargs)
+
+    def test_fetch_once(self):
+        """Test fetching the version once in the background"""
+        version_cache = self.version_cache(offline=False)
+        fetched = []
+        self.assertIsNone(version_cache.get(fetched.append))
+        self.assertEqual(version_cache.wait(5), "1.2.3")
+        self.assertEqual(version_cache.get(), "1.2.3")
+        self.assertEqual(fetched, ["1.2.3"])
+        self.assertEqual(self.server.nb_requests, 1)
+        self.assertTrue(os.path.exists(version_cache.cache_path))
+
+    def test_cache_file(self):
+        """Test using the cache file while it is younger than the ttl"""
+        self.version_cache(offline=False).wait(5)
+        self.server.version = "v1.2.4"
+        self.assertEqual(self.version_cache(offline=False).get(), "1.2.3")
+        self.assertEqual(self.server.nb_requests, 1)
+        self.assertEqual(self.version_cache(ttl=0, offline=False).wait(5),
+                         "1.2.4")
+        self.assertEqual(self.server.nb_requests, 2)
+
+    def test_fetch_failure(self):
+        """Test using an expired cache file when the fetch fails"""
+        self.version_cache(offline=False).wait(5)
+        self.server.version = None
+        self.assertEqual(self.version_cache(ttl=0, offline=False).wait(5),
+                         "1.2.3")
+        self.assertEqual(self.server.nb_requests, 2)
+
+    def test_offline(self):
+        """Test not fetching the version in offline mode"""
+        self.assertIsNone(self.version_cache(offline=True).wait(5))
+        self.version_cache(offline=False).wait(5)
+        self.assertEqual(self.version_cache(ttl=0, offline=True).wait(5),
+                         "1.2.3")
+        self.assertEqual(self.server.nb_requests, 1)
+
+    def test_skeleton_version(self):
+        """Test parsing the skeleton version"""
+        version = parse_skeleton_version(b"v2.1.0\nv2.2.4\n")
+        self.assertEqual(version, "2.2.4")
+        self.assertEqual(version_to_number(version), 0b0100001000000100)
+        self.assertRaises(ValueError, parse_skeleton_version, b"")
+        self.assertRaises(ValueError, parse_skeleton_version, b"<html>")
+
+    @mock.patch("builtins.print")
+    @mock.patch("modi.util.version_cache.pypi_version")
+    def test_check_latest_version(self, pypi_version, mock_print):
+        """Test notifying a newer PyMODI release"""
+        pypi_version.get.return_value = "1.0.0"
+        with mock.patch.dict(os.environ, {"MODI_VERSION_CHECK": "1"}):
+            check_latest_version("1.0.0")
+            mock_print.assert_not_called()
+            check_latest_version("0.9.0")
+            mock_print.assert_called_once_with(
+                "Newer PyMODI (v1.0.0) is available!"
+            )
+        with mock.patch.dict(os.environ, {"MODI_VERSION_CHECK": "0"}):
+            check_latest_version("0.9.0")
+        self.assertEqual(pypi_version.get.call_count, 2)
+        self.assertEqual(
+            parse_pypi_version(b'{"info": {"version": "1.0.0"}}'), "1.0.0"
+        )
+        self.assertRaises(ValueError, parse_pypi_version, b'{"info": 1}')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+
+from unittest import mock
+
+from modi.module.output_module.led import Led
+from modi.module.output_module.motor import Motor
+from modi.module.output_module.display import Display
+from modi.util.queues import CommunicationQueue
+from modi.util.write_coalescer import WriteCoalescer
+
+
+class TestWriteCoalescer(unittest.TestCase):
+    """Tests for 'WriteCoalescer' class"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.send_q = CommunicationQueue("thread")
+        self.write_q = WriteCoalescer(self.send_q)
+
+    def tearDown(self):
+        """Tear down test fixtures, if any."""
+        del self.write_q
+
+    def __written(self):
+        self.write_q.flush()
+        return self.send_q.get_many(block=False)
+
+    @mock.patch("modi.util.write_coalescer.th.Thread")
+    def test_put_latest(self, _):
+        """Test put_latest method replaces the pending value"""
+        self.write_q.put_latest(("led", 1), [b"red"])
+        self.write_q.put_latest(("led", 2), [b"a", b"b"])
+        self.write_q.put_latest(("led", 1), [b"blue"])
+        self.assertEqual(self.__written(), [b"a", b"b", b"blue"])
+
+    @mock.patch("modi.util.write_coalescer.th.Thread")
+    def test_put_latest_unchanged(self, _):
+        """Test put_latest method skips the value just written"""
+        self.write_q.put_latest(("led", 1), [b"red"])
+        self.assertEqual(self.__written(), [b"red"])
+        self.write_q.put_latest(("led", 1), [b"red"])
+        self.assertEqual(self.__written(), [])
+
+        # A value set back before being written cancels the pending one
+        self.write_q.put_latest(("led", 1), [b"blue"])
+        self.write_q.put_latest(("led", 1), [b"red"])
+        self.assertEqual(self.__written(), [])
+
+    @mock.patch("modi.util.write_coalescer.th.Thread")
+    def test_put_latest_without_key(self, _):
+        """Test put_latest method keeps every message without key"""
+        for _ in range(2):
+            self.write_q.put_latest(None, [b"clear"])
+        self.assertEqual(self.__written(), [b"clear", b"clear"])
+
+    def test_flusher(self):
+        """Test pending values are written by the flusher thread"""
+        self.write_q.put_latest(("led", 1), [b"red"])
+        self.assertEqual(self.send_q.get(timeout=1), b"red")
+
+    @mock.patch("modi.util.write_coalescer.th.Thread")
+    def test_modules(self, _):
+        """Test output modules write through put_latest"""
+        led = Led(1, 1, self.write_q)
+        for blue in range(10):
+            led.rgb = (0, 0, blue)
+        motor = Motor(2, 2, self.write_q)
+        motor.speed = (10, 20)
+        motor.speed = (30, 40)
+        display = Display(3, 3, self.write_q)
+        display.clear()
+        display.clear()
+
+        self.assertTrue(self.send_q.empty())
+        written = self.__written()
+        self.assertEqual(len(written), 5)
+        self.assertEqual(written[0], led._OutputModule__parse_set_message(
+            1, Led.CommandType.SET_RGB, (0, 0, 9),
+            Led.PropertyDataType.INT
+        )[0])
+
+
+if __name__ == "__main__":
+    unittest.main()